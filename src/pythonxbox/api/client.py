@@ -5,6 +5,8 @@ Basic factory that stores :class:`XboxLiveLanguage`, User authorization data
 and available `Providers`
 """
 
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 import logging
 from typing import Any
 
@@ -97,6 +99,30 @@ class Session:
 
         return response
 
+    @asynccontextmanager
+    async def stream(
+        self,
+        method: str,
+        url: str,
+        include_auth: bool = True,
+        include_cv: bool = True,
+        **kwargs: Any,
+    ) -> AsyncIterator[Response]:
+        """Proxy streamed Request and add Auth/CV headers, body is not read."""
+        headers = kwargs.pop("headers", {})
+        if include_auth:
+            await self._auth_mgr.refresh_tokens()
+            headers["Authorization"] = (
+                self._auth_mgr.xsts_token.authorization_header_value
+            )
+        if include_cv:
+            headers["MS-CV"] = self._cv.increment()
+
+        async with self._auth_mgr.session.stream(
+            method, url, **kwargs, headers=headers
+        ) as response:
+            yield response
+
     async def get(self, url: str, **kwargs: Any) -> Response:
         return await self.request("GET", url, **kwargs)
 
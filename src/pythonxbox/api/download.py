@@ -0,0 +1,404 @@
+"""
+Media Downloader
+
+Stream gameclips and screenshots to disk with bounded concurrency, resuming
+interrupted downloads with ranged requests
+"""
+
+import asyncio
+import base64
+from collections.abc import AsyncGenerator, AsyncIterator, Awaitable, Callable, Iterable
+import contextlib
+from dataclasses import dataclass
+from datetime import UTC, datetime
+import hashlib
+from http import HTTPStatus
+import logging
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import httpx
+
+from pythonxbox.api.provider.gameclips.models import GameClip
+from pythonxbox.api.provider.mediahub.models import GameclipContent, ScreenshotContent
+from pythonxbox.api.provider.mediahub.query import MediahubField, eq
+from pythonxbox.api.provider.screenshots.models import Screenshot
+from pythonxbox.common.exceptions import DownloadException
+
+if TYPE_CHECKING:
+    from pythonxbox.api.client import XboxLiveClient
+
+log = logging.getLogger("xbox.download")
+
+# uriType / locatorType of the original file
+DOWNLOAD_URI_TYPE = 2
+DOWNLOAD_LOCATOR_TYPE = "Download"
+
+PART_SUFFIX = ".part"
+
+# Refetch the download URI, `None` if the media no longer exists
+RefreshUri = Callable[[], Awaitable["DownloadSource | None"]]
+
+
+@dataclass
+class DownloadSource:
+    uri: str
+    size: int | None = None
+    expiration: datetime | None = None
+
+    def is_expired(self) -> bool:
+        return self.expiration is not None and self.expiration <= datetime.now(UTC)
+
+
+@dataclass
+class DownloadJob:
+    source: DownloadSource
+    path: Path
+    refresh: RefreshUri | None = None
+    sha256: str | None = None
+
+
+@dataclass
+class DownloadResult:
+    job: DownloadJob
+    size: int = 0
+    sha256: str | None = None
+    resumed: bool = False
+    error: BaseException | None = None
+
+
+class MediaDownloader:
+    """
+    Download manager for gameclips and screenshots
+
+    Files are streamed in chunks to `<path>.part` and renamed once complete,
+    so memory use is constant. An existing part file is resumed with a
+    ranged request. Downloads are verified against the size from the
+    metadata, the `Content-MD5` header if the storage returns one, and an
+    expected SHA-256 if given. Expired download URIs are refetched through
+    the metadata services.
+    """
+
+    def __init__(
+        self,
+        client: "XboxLiveClient",
+        *,
+        concurrency: int = 4,
+        chunk_size: int = 1024 * 1024,
+        max_retries: int = 3,
+    ) -> None:
+        """
+        Initialize downloader
+
+        Args:
+            client: Instance of XboxLiveClient
+            concurrency: Number of files downloaded in parallel
+            chunk_size: Bytes written per chunk
+            max_retries: Retries per file on connection errors or expired URIs
+        """
+        self.client = client
+        self.concurrency = concurrency
+        self.chunk_size = chunk_size
+        self.max_retries = max_retries
+
+    def gameclip_job(self, clip: GameClip, directory: str | os.PathLike) -> DownloadJob:
+        """
+        Create download job for a gameclip of the gameclips metadata service
+
+        Args:
+            clip: Gameclip
+            directory: Target directory, file is named after the clip id
+
+        Returns: :class:`DownloadJob`
+        """
+
+        async def refresh() -> DownloadSource | None:
+            gameclips = self.client.gameclips
+            queries = [
+                gameclips.iter_recent_clips_by_xuid,
+                gameclips.iter_saved_clips_by_xuid,
+            ]
+            if clip.saved_by_user:
+                # Search the list the clip most likely still shows up in first
+                queries.reverse()
+            for query in queries:
+                clips = query(
+                    clip.xuid, title_id=str(clip.title_id), page_size=100, prefetch=0
+                )
+                if item := await _find(clips, "game_clip_id", clip.game_clip_id):
+                    return _gameclip_source(item)
+            return None
+
+        return DownloadJob(
+            _gameclip_source(clip),
+            Path(directory, f"{clip.game_clip_id}.mp4"),
+            refresh,
+        )
+
+    def screenshot_job(
+        self, screenshot: Screenshot, directory: str | os.PathLike
+    ) -> DownloadJob:
+        """
+        Create download job for a screenshot of the screenshots metadata service
+
+        Args:
+            screenshot: Screenshot
+            directory: Target directory, file is named after the screenshot id
+
+        Returns: :class:`DownloadJob`
+        """
+
+        async def refresh() -> DownloadSource | None:
+            provider = self.client.screenshots
+            queries = [
+                provider.iter_recent_screenshots_by_xuid,
+                provider.iter_saved_screenshots_by_xuid,
+            ]
+            if screenshot.saved_by_user:
+                queries.reverse()
+            for query in queries:
+                screenshots = query(
+                    screenshot.xuid,
+                    title_id=str(screenshot.title_id),
+                    page_size=100,
+                    prefetch=0,
+                )
+                item = await _find(
+                    screenshots, "screenshot_id", screenshot.screenshot_id
+                )
+                if item:
+                    return _screenshot_source(item)
+            return None
+
+        return DownloadJob(
+            _screenshot_source(screenshot),
+            Path(directory, f"{screenshot.screenshot_id}.png"),
+            refresh,
+        )
+
+    def content_job(
+        self,
+        content: GameclipContent | ScreenshotContent,
+        directory: str | os.PathLike,
+    ) -> DownloadJob:
+        """
+        Create download job for own mediahub content
+
+        Args:
+            content: Gameclip or screenshot content
+            directory: Target directory, file is named after the content id
+
+        Returns: :class:`DownloadJob`
+        """
+        is_clip = isinstance(content, GameclipContent)
+
+        async def refresh() -> DownloadSource | None:
+            mediahub = self.client.mediahub
+            fetch = (
+                mediahub.fetch_own_clips if is_clip else mediahub.fetch_own_screenshots
+            )
+            resp = await fetch(
+                count=1, query=eq(MediahubField.CONTENT_ID, content.content_id)
+            )
+            return _content_source(resp.values[0]) if resp.values else None
+
+        return DownloadJob(
+            _content_source(content),
+            Path(directory, f"{content.content_id}.{'mp4' if is_clip else 'png'}"),
+            refresh,
+        )
+
+    async def download_all(
+        self, jobs: Iterable[DownloadJob]
+    ) -> AsyncIterator[DownloadResult]:
+        """
+        Download many files, at most `concurrency` at a time
+
+        Failed downloads do not stop the others, their result carries the
+        error.
+
+        Args:
+            jobs: Download jobs
+
+        Yields: :class:`DownloadResult` in order of completion
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def run(job: DownloadJob) -> DownloadResult:
+            async with semaphore:
+                try:
+                    return await self.download(job)
+                except Exception as e:
+                    log.debug("Downloading %s failed: %s", job.path, e)
+                    return DownloadResult(job, error=e)
+
+        tasks = [asyncio.ensure_future(run(job)) for job in jobs]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def download(self, job: DownloadJob) -> DownloadResult:
+        """
+        Download a single file, resuming a previous partial download
+
+        Args:
+            job: Download job
+
+        Returns: :class:`DownloadResult`
+        """
+        source = job.source
+        retries = 0
+        while True:
+            if source.is_expired() and job.refresh is not None:
+                source = await self._refresh(job)
+            try:
+                return await self._download(job, source)
+            except httpx.HTTPStatusError as e:
+                status = e.response.status_code
+                if retries >= self.max_retries:
+                    raise
+                if status == HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE:
+                    # Part file does not match the remote file, start over
+                    _part_path(job).unlink(missing_ok=True)
+                elif (
+                    status in {HTTPStatus.FORBIDDEN, HTTPStatus.NOT_FOUND}
+                    and job.refresh is not None
+                ):
+                    # Signed URI expired or was revoked
+                    source = await self._refresh(job)
+                else:
+                    raise
+            except httpx.TransportError as e:
+                if retries >= self.max_retries:
+                    raise
+                log.debug("Download of %s interrupted: %s", job.path, e)
+            retries += 1
+
+    async def _refresh(self, job: DownloadJob) -> DownloadSource:
+        if job.refresh is None:
+            raise DownloadException("Download URI expired", job.source.uri)
+        source = await job.refresh()
+        if source is None:
+            raise DownloadException("Media no longer available", job.source.uri)
+        job.source = source
+        return source
+
+    async def _download(
+        self, job: DownloadJob, source: DownloadSource
+    ) -> DownloadResult:
+        part_path = _part_path(job)
+        offset = part_path.stat().st_size if part_path.exists() else 0
+        if source.size is not None and offset > source.size:
+            offset = 0
+
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+        async with self.client.session.stream(
+            "GET", source.uri, include_auth=False, include_cv=False, headers=headers
+        ) as response:
+            if (
+                response.status_code == HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE
+                and offset == source.size
+            ):
+                # Previous run was interrupted after writing the last byte
+                resumed, content_md5 = True, None
+            else:
+                response.raise_for_status()
+                resumed = response.status_code == HTTPStatus.PARTIAL_CONTENT
+                content_md5 = None if resumed else response.headers.get("Content-MD5")
+                await self._write(response, part_path, append=resumed)
+
+        size, sha256, md5 = await asyncio.to_thread(_hash_file, part_path)
+        try:
+            if source.size is not None and size != source.size:
+                raise DownloadException(
+                    f"Size mismatch, expected {source.size} bytes, got {size}",
+                    source.uri,
+                )
+            if content_md5 and base64.b64decode(content_md5) != md5:
+                raise DownloadException("Content-MD5 mismatch", source.uri)
+            if job.sha256 and job.sha256.lower() != sha256:
+                raise DownloadException("SHA-256 mismatch", source.uri)
+        except DownloadException:
+            # Corrupt data can not be resumed
+            with contextlib.suppress(FileNotFoundError):
+                part_path.unlink()
+            raise
+
+        part_path.replace(job.path)
+        return DownloadResult(job, size, sha256, resumed)
+
+    async def _write(
+        self, response: httpx.Response, part_path: Path, append: bool
+    ) -> None:
+        part_path.parent.mkdir(parents=True, exist_ok=True)
+        with part_path.open("ab" if append else "wb") as f:
+            async for chunk in response.aiter_bytes(self.chunk_size):
+                await asyncio.to_thread(f.write, chunk)
+
+
+async def _find(items: AsyncGenerator[Any], attr: str, value: str) -> Any:
+    async with contextlib.aclosing(items):
+        async for item in items:
+            if getattr(item, attr) == value:
+                return item
+    return None
+
+
+def _part_path(job: DownloadJob) -> Path:
+    return job.path.with_name(job.path.name + PART_SUFFIX)
+
+
+def _hash_file(path: Path, chunk_size: int = 1024 * 1024) -> tuple[int, str, bytes]:
+    sha256 = hashlib.sha256()
+    md5 = hashlib.md5(usedforsecurity=False)
+    size = 0
+    with path.open("rb") as f:
+        while chunk := f.read(chunk_size):
+            sha256.update(chunk)
+            md5.update(chunk)
+            size += len(chunk)
+    return size, sha256.hexdigest(), md5.digest()
+
+
+def _parse_expiration(value: str | datetime | None) -> datetime | None:
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    if value is not None and value.tzinfo is None:
+        # Service timestamps without offset are UTC
+        value = value.replace(tzinfo=UTC)
+    return value
+
+
+def _gameclip_source(clip: GameClip) -> DownloadSource:
+    uris = [u for u in clip.game_clip_uris if u.uri_type == DOWNLOAD_URI_TYPE]
+    uri = (uris or clip.game_clip_uris)[0]
+    return DownloadSource(uri.uri, uri.file_size, _parse_expiration(uri.expiration))
+
+
+def _screenshot_source(screenshot: Screenshot) -> DownloadSource:
+    uris = [u for u in screenshot.screenshot_uris if u.uri_type == DOWNLOAD_URI_TYPE]
+    uri = (uris or screenshot.screenshot_uris)[0]
+    return DownloadSource(uri.uri, uri.file_size, _parse_expiration(uri.expiration))
+
+
+def _content_source(content: GameclipContent | ScreenshotContent) -> DownloadSource:
+    locator = next(
+        (
+            loc
+            for loc in content.content_locators
+            if loc.locator_type == DOWNLOAD_LOCATOR_TYPE
+        ),
+        None,
+    )
+    if locator is None:
+        raise DownloadException(f"No download locator for {content.content_id}")
+    return DownloadSource(
+        locator.uri, locator.file_size, _parse_expiration(locator.expiration)
+    )
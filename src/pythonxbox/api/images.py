@@ -0,0 +1,313 @@
+"""
+Image Fetcher
+
+Fetch thumbnails, title images and display pics over the client's connection
+pool, with a content-addressed on-disk LRU cache
+"""
+
+import asyncio
+from collections import OrderedDict
+from collections.abc import Iterable
+import contextlib
+import hashlib
+import logging
+import os
+from pathlib import Path
+import threading
+from typing import TYPE_CHECKING
+from urllib.parse import urlsplit, urlunsplit
+
+from pythonxbox.api.provider.catalog.models import Image as CatalogImage
+
+if TYPE_CHECKING:
+    from pythonxbox.api.client import XboxLiveClient
+
+log = logging.getLogger("xbox.images")
+
+# Image services scaling images with `w` / `h` query parameters
+RESIZABLE_HOSTS = {
+    "images-eds.xboxlive.com",
+    "images-eds-ssl.xboxlive.com",
+    "store-images.s-microsoft.com",
+}
+
+INDEX_FILE = "index.log"
+
+
+def resized_url(url: str, width: int | None = None, height: int | None = None) -> str:
+    """
+    Get the URL of a scaled variant of an image
+
+    Scheme-less URLs, as returned by the catalog, are completed with https.
+    URLs of other hosts than `RESIZABLE_HOSTS` are returned unscaled.
+
+    Args:
+        url: Image URL
+        width: Width in pixels
+        height: Height in pixels
+
+    Returns: Image URL
+    """
+    if url.startswith("//"):
+        url = "https:" + url
+    parts = urlsplit(url)
+    if parts.hostname not in RESIZABLE_HOSTS or not (width or height):
+        return url
+    # Keep the original encoding of the other parameters
+    query = [
+        param
+        for param in parts.query.split("&")
+        if param and param.partition("=")[0] not in {"w", "h"}
+    ]
+    if width:
+        query.append(f"w={width}")
+    if height:
+        query.append(f"h={height}")
+    return urlunsplit(parts._replace(query="&".join(query)))
+
+
+class ImageCache:
+    """
+    Content-addressed, size-bounded image cache on disk
+
+    Images are stored once per content hash, cache keys (URLs or source image
+    hashes) map to content hashes in an append-only index. The least recently
+    used images are removed when `max_bytes` is exceeded.
+    """
+
+    def __init__(
+        self, directory: str | os.PathLike, max_bytes: int = 512 * 1024 * 1024
+    ) -> None:
+        """
+        Initialize image cache
+
+        Args:
+            directory: Cache directory
+            max_bytes: Maximum total size of the cached images
+        """
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._keys: dict[str, str] = {}
+        # digest -> size, least recently used first
+        self._blobs: OrderedDict[str, int] = OrderedDict()
+        self._size = 0
+        # Called from worker threads by :class:`ImageFetcher`
+        self._lock = threading.Lock()
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self._blobs)
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def _blob_path(self, digest: str) -> Path:
+        return self.directory / digest[:2] / digest
+
+    def get(self, key: str) -> bytes | None:
+        """
+        Get a cached image, marking it as recently used
+
+        Args:
+            key: Cache key
+
+        Returns: Image data, `None` if not cached
+        """
+        with self._lock:
+            return self._get(key)
+
+    def _get(self, key: str) -> bytes | None:
+        digest = self._keys.get(key)
+        if digest is None or digest not in self._blobs:
+            return None
+        try:
+            data = self._blob_path(digest).read_bytes()
+        except FileNotFoundError:
+            self._drop(digest)
+            return None
+        self._blobs.move_to_end(digest)
+        with contextlib.suppress(OSError):
+            os.utime(self._blob_path(digest))
+        return data
+
+    def put(self, key: str, data: bytes) -> str:
+        """
+        Store an image
+
+        Args:
+            key: Cache key
+            data: Image data
+
+        Returns: Content hash of the image
+        """
+        with self._lock:
+            return self._put(key, data)
+
+    def _put(self, key: str, data: bytes) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        if digest not in self._blobs:
+            path = self._blob_path(digest)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_bytes(data)
+            tmp_path.replace(path)
+            self._blobs[digest] = len(data)
+            self._size += len(data)
+        self._blobs.move_to_end(digest)
+        if self._keys.get(key) != digest:
+            self._keys[key] = digest
+            with (self.directory / INDEX_FILE).open("a") as f:
+                f.write(f"{key}\t{digest}\n")
+        self._evict()
+        return digest
+
+    def _evict(self) -> None:
+        while self._size > self.max_bytes and len(self._blobs) > 1:
+            digest = next(iter(self._blobs))
+            with contextlib.suppress(FileNotFoundError):
+                self._blob_path(digest).unlink()
+            self._drop(digest)
+
+    def _drop(self, digest: str) -> None:
+        self._size -= self._blobs.pop(digest, 0)
+
+    def _load(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        blobs = [
+            (path.stat().st_mtime, path.name, path.stat().st_size)
+            for path in self.directory.glob("??/*")
+            if path.suffix != ".tmp"
+        ]
+        for _, digest, size in sorted(blobs):
+            self._blobs[digest] = size
+            self._size += size
+
+        index_path = self.directory / INDEX_FILE
+        if not index_path.exists():
+            return
+        with index_path.open() as f:
+            for line in f:
+                key, _, digest = line.rstrip("\n").rpartition("\t")
+                if key:
+                    self._keys[key] = digest
+        # Compact the index, dropping keys of evicted images
+        self._keys = {k: d for k, d in self._keys.items() if d in self._blobs}
+        tmp_path = index_path.with_suffix(".tmp")
+        with tmp_path.open("w") as f:
+            f.writelines(f"{k}\t{d}\n" for k, d in self._keys.items())
+        tmp_path.replace(index_path)
+
+
+class ImageFetcher:
+    """
+    Fetch images with bounded concurrency
+
+    Concurrent requests for the same image share one download. Images of
+    the catalog are cached by their `UnscaledImageSHA256Hash`, so identical
+    images behind different URLs are only downloaded once.
+    """
+
+    def __init__(
+        self,
+        client: "XboxLiveClient",
+        cache: ImageCache | None = None,
+        concurrency: int = 8,
+    ) -> None:
+        """
+        Initialize image fetcher
+
+        Args:
+            client: Instance of XboxLiveClient
+            cache: On-disk cache, images are not cached if omitted
+            concurrency: Number of images downloaded in parallel
+        """
+        self.client = client
+        self.cache = cache
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._in_flight: dict[str, asyncio.Task[bytes]] = {}
+
+    async def fetch(
+        self,
+        url: str,
+        width: int | None = None,
+        height: int | None = None,
+        sha256: str | None = None,
+    ) -> bytes:
+        """
+        Fetch an image
+
+        Args:
+            url: Image URL
+            width: Requested width, if supported by the image service
+            height: Requested height, if supported by the image service
+            sha256: Hash of the unscaled source image, if known
+
+        Returns: Image data
+        """
+        url = resized_url(url, width, height)
+        if sha256:
+            key = f"sha256:{sha256.lower()}:{width or 0}x{height or 0}"
+        else:
+            key = f"url:{url}"
+
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(key, url))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        # One cancelled caller must not cancel the shared download
+        return await asyncio.shield(task)
+
+    async def fetch_catalog_image(
+        self, image: CatalogImage, width: int | None = None, height: int | None = None
+    ) -> bytes:
+        """
+        Fetch an image of a catalog product
+
+        Args:
+            image: Catalog image
+            width: Requested width
+            height: Requested height
+
+        Returns: Image data
+        """
+        return await self.fetch(
+            image.uri, width, height, sha256=image.unscaled_image_sha256_hash
+        )
+
+    async def fetch_many(
+        self,
+        urls: Iterable[str],
+        width: int | None = None,
+        height: int | None = None,
+    ) -> list[bytes | BaseException]:
+        """
+        Fetch many images
+
+        Args:
+            urls: Image URLs
+            width: Requested width
+            height: Requested height
+
+        Returns: Image data or error, in order of `urls`
+        """
+        return await asyncio.gather(
+            *(self.fetch(url, width, height) for url in urls), return_exceptions=True
+        )
+
+    async def _fetch(self, key: str, url: str) -> bytes:
+        if self.cache is not None:
+            data = await asyncio.to_thread(self.cache.get, key)
+            if data is not None:
+                return data
+
+        async with self._semaphore:
+            resp = await self.client.session.get(
+                url, include_auth=False, include_cv=False
+            )
+            resp.raise_for_status()
+
+        if self.cache is not None:
+            await asyncio.to_thread(self.cache.put, key, resp.content)
+        return resp.content
@@ -4,15 +4,21 @@ Achievements
 Get Xbox 360 and Xbox One Achievement data
 """
 
+from collections.abc import AsyncIterator
 from typing import ClassVar
 
 from pythonxbox.api.provider.achievements.models import (
+    Achievement,
+    Achievement360,
     Achievement360ProgressResponse,
     Achievement360Response,
     AchievementResponse,
     RecentProgressResponse,
+    Title,
+    Title360,
 )
 from pythonxbox.api.provider.ratelimitedprovider import RateLimitedProvider
+from pythonxbox.common.paging import iterate_continuation
 
 
 class AchievementsProvider(RateLimitedProvider):
@@ -164,3 +170,95 @@ class AchievementsProvider(RateLimitedProvider):
         )
         resp.raise_for_status()
         return RecentProgressResponse.model_validate_json(resp.text)
+
+    def iter_achievements_xbox360_all(
+        self, xuid: str, title_id: str, max_items: int | None = None, **kwargs
+    ) -> AsyncIterator[Achievement360]:
+        """
+        Iterate all achievements for specific X360 title Id, following pages
+
+        Args:
+            xuid (str): Xbox User Id
+            title_id (str): Xbox 360 Title Id
+            max_items (int): Stop after this many achievements
+
+        Returns:
+            Async iterator of :class:`Achievement360`
+        """
+        return iterate_continuation(
+            self.get_achievements_xbox360_all,
+            lambda resp: resp.achievements,
+            lambda resp: resp.paging_info.continuation_token,
+            max_items=max_items,
+            xuid=xuid,
+            title_id=title_id,
+            **kwargs,
+        )
+
+    def iter_achievements_xbox360_recent_progress_and_info(
+        self, xuid: str, max_items: int | None = None, **kwargs
+    ) -> AsyncIterator[Title360]:
+        """
+        Iterate X360 title history with achievement progress, following pages
+
+        Args:
+            xuid (str): Xbox User Id
+            max_items (int): Stop after this many titles
+
+        Returns:
+            Async iterator of :class:`Title360`
+        """
+        return iterate_continuation(
+            self.get_achievements_xbox360_recent_progress_and_info,
+            lambda resp: resp.titles,
+            lambda resp: resp.paging_info.continuation_token,
+            max_items=max_items,
+            xuid=xuid,
+            **kwargs,
+        )
+
+    def iter_achievements_xboxone_gameprogress(
+        self, xuid: str, title_id: str, max_items: int | None = None, **kwargs
+    ) -> AsyncIterator[Achievement]:
+        """
+        Iterate gameprogress for Xbox One title, following pages
+
+        Args:
+            xuid (str): Xbox User Id
+            title_id (str): Xbox One Title Id
+            max_items (int): Stop after this many achievements
+
+        Returns:
+            Async iterator of :class:`Achievement`
+        """
+        return iterate_continuation(
+            self.get_achievements_xboxone_gameprogress,
+            lambda resp: resp.achievements,
+            lambda resp: resp.paging_info.continuation_token,
+            max_items=max_items,
+            xuid=xuid,
+            title_id=title_id,
+            **kwargs,
+        )
+
+    def iter_achievements_xboxone_recent_progress_and_info(
+        self, xuid: str, max_items: int | None = None, **kwargs
+    ) -> AsyncIterator[Title]:
+        """
+        Iterate title history with achievement progress, following pages
+
+        Args:
+            xuid (str): Xbox User Id
+            max_items (int): Stop after this many titles
+
+        Returns:
+            Async iterator of :class:`Title`
+        """
+        return iterate_continuation(
+            self.get_achievements_xboxone_recent_progress_and_info,
+            lambda resp: resp.titles,
+            lambda resp: resp.paging_info.continuation_token,
+            max_items=max_items,
+            xuid=xuid,
+            **kwargs,
+        )
@@ -0,0 +1,247 @@
+"""
+Achievement Harvester
+
+Fetch the achievements of all titles in the title history of many users
+concurrently, streaming normalized records
+"""
+
+import asyncio
+from collections.abc import AsyncIterator
+from datetime import datetime
+import functools
+import json
+import logging
+import os
+from typing import TYPE_CHECKING, NamedTuple
+
+import httpx
+
+from pythonxbox.api.provider.achievements.models import Achievement, Achievement360
+from pythonxbox.api.provider.titlehub.models import Title, TitleFields
+from pythonxbox.common.concurrency import call_rate_limited
+from pythonxbox.common.paging import iterate_continuation
+
+if TYPE_CHECKING:
+    from pythonxbox.api.client import XboxLiveClient
+
+log = logging.getLogger("xbox.achievements.harvester")
+
+XBOX_360 = "Xbox360"
+XBOX_ONE = "XboxOne"
+
+
+class AchievementRecord(NamedTuple):
+    xuid: str
+    title_id: str
+    title_name: str
+    achievement_id: str
+    name: str
+    description: str
+    gamerscore: int
+    unlocked: bool
+    time_unlocked: datetime | None
+    is_secret: bool
+    platform: str
+
+    @classmethod
+    def from_achievement(
+        cls, xuid: str, title: Title, achievement: Achievement
+    ) -> "AchievementRecord":
+        unlocked = achievement.progress_state == "Achieved"
+        return cls(
+            xuid=xuid,
+            title_id=title.title_id,
+            title_name=title.name,
+            achievement_id=achievement.id,
+            name=achievement.name,
+            description=achievement.description,
+            gamerscore=sum(
+                int(reward.value)
+                for reward in achievement.rewards
+                if reward.type == "Gamerscore"
+            ),
+            unlocked=unlocked,
+            time_unlocked=achievement.progression.time_unlocked if unlocked else None,
+            is_secret=achievement.is_secret,
+            platform=XBOX_ONE,
+        )
+
+    @classmethod
+    def from_achievement360(
+        cls, xuid: str, title: Title, achievement: Achievement360
+    ) -> "AchievementRecord":
+        return cls(
+            xuid=xuid,
+            title_id=title.title_id,
+            title_name=title.name,
+            achievement_id=str(achievement.id),
+            name=achievement.name,
+            description=achievement.description,
+            gamerscore=achievement.gamerscore,
+            unlocked=achievement.unlocked,
+            time_unlocked=achievement.time_unlocked if achievement.unlocked else None,
+            is_secret=achievement.is_secret,
+            platform=XBOX_360,
+        )
+
+
+class _TitleDone(NamedTuple):
+    xuid: str
+    title_id: str
+    current_achievements: int
+
+
+class AchievementHarvester:
+    """
+    Harvest achievements across the title histories of many users
+
+    Titles are discovered via the title history and harvested concurrently,
+    respecting the achievements rate limits. A title is skipped when its
+    `current_achievements` did not change since it was last harvested. A title
+    counts as harvested once all of its records have been consumed.
+    """
+
+    def __init__(
+        self,
+        client: "XboxLiveClient",
+        *,
+        concurrency: int = 8,
+        max_titles: int = 1000,
+        state_path: str | os.PathLike | None = None,
+    ) -> None:
+        """
+        Initialize achievement harvester
+
+        Args:
+            client: Instance of XboxLiveClient
+            concurrency: Number of titles harvested in parallel
+            max_titles: Maximum number of titles discovered per user
+            state_path: File to persist harvested titles to
+        """
+        self.client = client
+        self.concurrency = concurrency
+        self.max_titles = max_titles
+        self.state_path = state_path
+
+        # xuid -> title id -> current achievements when last harvested
+        self.harvested: dict[str, dict[str, int]] = {}
+        self._loaded = False
+
+    async def harvest(self, *xuids: str) -> AsyncIterator[AchievementRecord]:
+        """
+        Harvest achievements of users
+
+        Args:
+            xuids: XUIDs of the users to harvest
+
+        Yields: :class:`AchievementRecord` of every achievement of changed titles
+        """
+        if not self._loaded:
+            self._load_state()
+
+        records: asyncio.Queue[
+            AchievementRecord | _TitleDone | BaseException | None
+        ] = asyncio.Queue(maxsize=self.concurrency * 100)
+        producer = asyncio.create_task(self._produce(xuids, records))
+        try:
+            while (item := await records.get()) is not None:
+                if isinstance(item, BaseException):
+                    raise item
+                if isinstance(item, _TitleDone):
+                    titles = self.harvested.setdefault(item.xuid, {})
+                    titles[item.title_id] = item.current_achievements
+                else:
+                    yield item
+        finally:
+            producer.cancel()
+            self._save_state()
+
+    def is_changed(self, xuid: str, title: Title) -> bool:
+        """
+        Check whether a title has to be harvested
+
+        Args:
+            xuid: XUID
+            title: Title of the user's title history
+
+        Returns: `True` if the title has achievements and changed since the
+            last harvest
+        """
+        achievement = title.achievement
+        if achievement is None or not (
+            achievement.current_achievements or achievement.total_gamerscore
+        ):
+            return False
+        harvested = self.harvested.get(xuid, {}).get(title.title_id)
+        return harvested != achievement.current_achievements
+
+    async def _produce(self, xuids: tuple[str, ...], records: asyncio.Queue) -> None:
+        semaphore = asyncio.Semaphore(self.concurrency)
+        try:
+            async with asyncio.TaskGroup() as tg:
+                for xuid in xuids:
+                    for title in await self._get_titles(xuid):
+                        if self.is_changed(xuid, title):
+                            tg.create_task(
+                                self._harvest_title(xuid, title, semaphore, records)
+                            )
+        except* Exception as eg:
+            await records.put(eg.exceptions[0])
+        else:
+            await records.put(None)
+
+    async def _get_titles(self, xuid: str) -> list[Title]:
+        resp = await call_rate_limited(
+            self.client.titlehub.get_title_history,
+            xuid,
+            fields=[TitleFields.ACHIEVEMENT, TitleFields.SERVICE_CONFIG_ID],
+            max_items=self.max_titles,
+        )
+        return resp.titles
+
+    async def _harvest_title(
+        self,
+        xuid: str,
+        title: Title,
+        semaphore: asyncio.Semaphore,
+        records: asyncio.Queue,
+    ) -> None:
+        achievements = self.client.achievements
+        if title.devices == [XBOX_360]:
+            fetch = achievements.get_achievements_xbox360_all
+            from_item = AchievementRecord.from_achievement360
+        else:
+            fetch = achievements.get_achievements_xboxone_gameprogress
+            from_item = AchievementRecord.from_achievement
+
+        async with semaphore:
+            try:
+                async for item in iterate_continuation(
+                    functools.partial(call_rate_limited, fetch),
+                    lambda resp: resp.achievements,
+                    lambda resp: resp.paging_info.continuation_token,
+                    xuid=xuid,
+                    title_id=title.title_id,
+                ):
+                    await records.put(from_item(xuid, title, item))
+            except httpx.HTTPStatusError as e:
+                # Achievements of this title are not available
+                log.debug("Skipping title %s of %s: %s", title.title_id, xuid, e)
+                return
+        current = title.achievement.current_achievements if title.achievement else 0
+        await records.put(_TitleDone(xuid, title.title_id, current))
+
+    def _load_state(self) -> None:
+        self._loaded = True
+        if not (self.state_path and os.path.exists(self.state_path)):
+            return
+        with open(self.state_path) as f:
+            self.harvested = json.load(f)
+
+    def _save_state(self) -> None:
+        if not self.state_path:
+            return
+        tmp_path = f"{os.fspath(self.state_path)}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.harvested, f)
+        os.replace(tmp_path, self.state_path)
@@ -0,0 +1,171 @@
+"""
+Achievement Index
+
+Per title achievement lookups served from a single gameprogress fetch
+"""
+
+import asyncio
+from dataclasses import dataclass
+import time
+from typing import TYPE_CHECKING
+
+from pythonxbox.api.provider.achievements.models import Achievement
+from pythonxbox.common.paging import iterate_continuation
+
+if TYPE_CHECKING:
+    from pythonxbox.api.client import XboxLiveClient
+
+
+@dataclass
+class _Entry:
+    title_id: str
+    achievements: dict[str, Achievement]
+    fetched_at: float
+
+
+class AchievementIndex:
+    """
+    Achievements indexed by (xuid, service config id) and achievement id
+
+    An index entry is filled from all pages of one gameprogress request and
+    refreshed on lookup once it is older than `ttl`. Concurrent refreshes of
+    the same title share one request. A lookup of a title that was never
+    loaded loads the whole title, resolving the title id of an unknown
+    service config id with a single `get_achievements_detail_item` request.
+    """
+
+    def __init__(self, client: "XboxLiveClient", ttl: float = 300) -> None:
+        """
+        Initialize achievement index
+
+        Args:
+            client: Instance of XboxLiveClient
+            ttl: Seconds until an entry is refreshed on lookup
+        """
+        self.client = client
+        self.ttl = ttl
+        self._entries: dict[tuple[str, str], _Entry] = {}
+        self._loading: dict[tuple[str, str], asyncio.Task[list[Achievement]]] = {}
+        # Title ids by service config id, shared by all users
+        self._title_ids: dict[str, str] = {}
+
+    async def load(self, xuid: str, title_id: str) -> list[Achievement]:
+        """
+        Fetch and index all achievements of a title
+
+        Args:
+            xuid: Xbox User Id
+            title_id: Xbox One Title Id
+
+        Returns: All achievements of the title
+        """
+        key = (xuid, title_id)
+        task = self._loading.get(key)
+        if task is None:
+            task = self._loading[key] = asyncio.create_task(self._load(xuid, title_id))
+            task.add_done_callback(lambda _: self._loading.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def get(
+        self,
+        xuid: str,
+        service_config_id: str,
+        achievement_id: str,
+        title_id: str | None = None,
+    ) -> Achievement:
+        """
+        Get an achievement, loading its title if missing or expired
+
+        Args:
+            xuid: Xbox User Id
+            service_config_id: Service Config Id
+            achievement_id: Achievement Id
+            title_id: Xbox One Title Id, saves resolving it for unknown titles
+
+        Returns: :class:`Achievement`
+        """
+        entry = self._entries.get((xuid, service_config_id))
+        if entry is None or self._is_expired(entry):
+            title_id = (
+                title_id
+                or (entry.title_id if entry else None)
+                or await self._resolve_title_id(xuid, service_config_id, achievement_id)
+            )
+            if title_id:
+                await self.load(xuid, title_id)
+                entry = self._entries.get((xuid, service_config_id))
+
+        achievement = entry.achievements.get(achievement_id) if entry else None
+        if achievement is not None:
+            return achievement
+        resp = await self.client.achievements.get_achievements_detail_item(
+            xuid, service_config_id, achievement_id
+        )
+        return resp.achievements[0]
+
+    def get_cached(
+        self, xuid: str, service_config_id: str, achievement_id: str
+    ) -> Achievement | None:
+        """
+        Get an indexed achievement without any request, regardless of its age
+
+        Args:
+            xuid: Xbox User Id
+            service_config_id: Service Config Id
+            achievement_id: Achievement Id
+
+        Returns: :class:`Achievement`, `None` if not indexed
+        """
+        entry = self._entries.get((xuid, service_config_id))
+        return entry.achievements.get(achievement_id) if entry else None
+
+    def invalidate(self, xuid: str, service_config_id: str | None = None) -> None:
+        """
+        Drop indexed achievements
+
+        Args:
+            xuid: Xbox User Id
+            service_config_id: Service Config Id, all titles of the user if omitted
+        """
+        for key in list(self._entries):
+            if key[0] == xuid and service_config_id in (None, key[1]):
+                del self._entries[key]
+
+    async def _resolve_title_id(
+        self, xuid: str, service_config_id: str, achievement_id: str
+    ) -> str | None:
+        if service_config_id not in self._title_ids:
+            resp = await self.client.achievements.get_achievements_detail_item(
+                xuid, service_config_id, achievement_id
+            )
+            titles = resp.achievements[0].title_associations
+            if not titles:
+                return None
+            self._title_ids[service_config_id] = str(titles[0].id)
+        return self._title_ids[service_config_id]
+
+    def _is_expired(self, entry: _Entry) -> bool:
+        return time.monotonic() - entry.fetched_at >= self.ttl
+
+    async def _load(self, xuid: str, title_id: str) -> list[Achievement]:
+        achievements = [
+            achievement
+            async for achievement in iterate_continuation(
+                self.client.achievements.get_achievements_xboxone_gameprogress,
+                lambda resp: resp.achievements,
+                lambda resp: resp.paging_info.continuation_token,
+                xuid=xuid,
+                title_id=title_id,
+            )
+        ]
+        fetched_at = time.monotonic()
+        entries: dict[str, _Entry] = {}
+        for achievement in achievements:
+            entry = entries.setdefault(
+                achievement.service_config_id, _Entry(title_id, {}, fetched_at)
+            )
+            entry.achievements[achievement.id] = achievement
+        for service_config_id, entry in entries.items():
+            self._entries[(xuid, service_config_id)] = entry
+            self._title_ids[service_config_id] = title_id
+        return achievements
@@ -0,0 +1,163 @@
+"""
+Achievement Unlock Watcher
+
+Detect achievement unlocks from the recent progress of users, only fetching
+the achievements of titles whose progress changed
+"""
+
+import asyncio
+from collections.abc import AsyncIterator, Iterable
+from dataclasses import dataclass
+from datetime import datetime
+import functools
+from typing import TYPE_CHECKING
+
+from pythonxbox.api.provider.achievements.models import Achievement, Title
+from pythonxbox.common.concurrency import call_rate_limited
+from pythonxbox.common.paging import iterate_continuation
+
+if TYPE_CHECKING:
+    from pythonxbox.api.client import XboxLiveClient
+
+
+@dataclass
+class AchievementUnlockEvent:
+    xuid: str
+    title_id: int
+    title_name: str
+    achievement: Achievement
+    time_unlocked: datetime
+
+
+class AchievementUnlockWatcher:
+    """
+    Watch users for achievement unlocks
+
+    The first poll of a user records its recent progress without emitting
+    events. Afterwards, achievements are only fetched for titles whose
+    earned achievements or last unlock changed, and every achievement
+    unlocked after the previously known last unlock is emitted.
+    """
+
+    def __init__(self, client: "XboxLiveClient", xuids: Iterable[str] = ()) -> None:
+        """
+        Initialize achievement unlock watcher
+
+        Args:
+            client: Instance of XboxLiveClient
+            xuids: XUIDs to watch
+        """
+        self.client = client
+        # xuid -> title id -> recent progress, None until first polled
+        self._progress: dict[str, dict[int, Title] | None] = dict.fromkeys(xuids)
+
+    def track(self, xuids: Iterable[str]) -> None:
+        """
+        Start watching users
+
+        Args:
+            xuids: XUIDs to watch
+        """
+        for xuid in xuids:
+            self._progress.setdefault(xuid, None)
+
+    def untrack(self, xuids: Iterable[str]) -> None:
+        """
+        Stop watching users
+
+        Args:
+            xuids: XUIDs to stop watching
+        """
+        for xuid in xuids:
+            self._progress.pop(xuid, None)
+
+    async def poll(self) -> list[AchievementUnlockEvent]:
+        """
+        Check all watched users for new unlocks
+
+        Returns: Unlock events, ordered by unlock time per user
+        """
+        events: list[AchievementUnlockEvent] = []
+        for xuid in list(self._progress):
+            events.extend(await self._poll_user(xuid))
+        return events
+
+    async def watch(
+        self, interval: float = 60
+    ) -> AsyncIterator[AchievementUnlockEvent]:
+        """
+        Poll continuously
+
+        Args:
+            interval: Seconds between polls
+
+        Yields: :class:`AchievementUnlockEvent` for every unlock
+        """
+        while True:
+            for event in await self.poll():
+                yield event
+            await asyncio.sleep(interval)
+
+    async def _poll_user(self, xuid: str) -> list[AchievementUnlockEvent]:
+        resp = await call_rate_limited(
+            self.client.achievements.get_achievements_xboxone_recent_progress_and_info,
+            xuid,
+        )
+        current = {title.title_id: title for title in resp.titles}
+        previous = self._progress.get(xuid)
+        if xuid not in self._progress:
+            return []  # untracked while polling
+        self._progress[xuid] = current
+        if previous is None:
+            return []
+
+        # New titles only count unlocks after the last known unlock of the user
+        watermark = max((t.last_unlock for t in previous.values()), default=None)
+        changed = [
+            (
+                title,
+                previous[title_id].last_unlock if title_id in previous else watermark,
+            )
+            for title_id, title in current.items()
+            if _progress_key(title) != _progress_key(previous.get(title_id))
+        ]
+        results = await asyncio.gather(
+            *(self._get_unlocks(xuid, title, since) for title, since in changed)
+        )
+        return sorted(
+            (event for events in results for event in events),
+            key=lambda event: event.time_unlocked,
+        )
+
+    async def _get_unlocks(
+        self, xuid: str, title: Title, since: datetime | None
+    ) -> list[AchievementUnlockEvent]:
+        events = []
+        async for achievement in iterate_continuation(
+            functools.partial(
+                call_rate_limited,
+                self.client.achievements.get_achievements_xboxone_gameprogress,
+            ),
+            lambda resp: resp.achievements,
+            lambda resp: resp.paging_info.continuation_token,
+            xuid=xuid,
+            title_id=str(title.title_id),
+            extra_params={"unlockedOnly": "true"},
+        ):
+            time_unlocked = achievement.progression.time_unlocked
+            if achievement.progress_state != "Achieved" or (
+                since is not None and time_unlocked <= since
+            ):
+                continue
+            events.append(
+                AchievementUnlockEvent(
+                    xuid, title.title_id, title.name, achievement, time_unlocked
+                )
+            )
+        return events
+
+
+def _progress_key(title: Title | None) -> tuple[int, datetime] | None:
+    if title is None:
+        return None
+    return title.earned_achievements, title.last_unlock
@@ -2,10 +2,12 @@
 Gameclips - Get gameclip info
 """
 
+from collections.abc import AsyncIterator
 from typing import ClassVar
 
 from pythonxbox.api.provider.baseprovider import BaseProvider
-from pythonxbox.api.provider.gameclips.models import GameclipsResponse
+from pythonxbox.api.provider.gameclips.models import GameClip, GameclipsResponse
+from pythonxbox.common.paging import iterate_offset
 
 
 class GameclipProvider(BaseProvider):
@@ -175,3 +177,133 @@ class GameclipProvider(BaseProvider):
         )
         resp.raise_for_status()
         return GameclipsResponse.model_validate_json(resp.text)
+
+    def iter_recent_own_clips(
+        self,
+        title_id: str | None = None,
+        page_size: int = 25,
+        prefetch: int = 1,
+        max_items: int | None = None,
+        **kwargs,
+    ) -> AsyncIterator[GameClip]:
+        """
+        Iterate own recent clips, optionally filter for title Id, following pages
+
+        Args:
+            title_id: Optional title id filter
+            page_size: Item count to load per page
+            prefetch: Number of pages requested ahead
+            max_items: Stop after this many clips
+
+        Returns:
+            Async iterator of :class:`GameClip`
+        """
+        return iterate_offset(
+            self.get_recent_own_clips,
+            lambda resp: resp.game_clips,
+            page_size=page_size,
+            prefetch=prefetch,
+            max_items=max_items,
+            is_last=lambda resp: not resp.paging_info.continuation_token,
+            title_id=title_id,
+            **kwargs,
+        )
+
+    def iter_recent_clips_by_xuid(
+        self,
+        xuid: str,
+        title_id: str | None = None,
+        page_size: int = 25,
+        prefetch: int = 1,
+        max_items: int | None = None,
+        **kwargs,
+    ) -> AsyncIterator[GameClip]:
+        """
+        Iterate recent clips by XUID, optionally filter for title Id, following pages
+
+        Args:
+            xuid: XUID of user to get clips from
+            title_id: Optional title id filter
+            page_size: Item count to load per page
+            prefetch: Number of pages requested ahead
+            max_items: Stop after this many clips
+
+        Returns:
+            Async iterator of :class:`GameClip`
+        """
+        return iterate_offset(
+            self.get_recent_clips_by_xuid,
+            lambda resp: resp.game_clips,
+            page_size=page_size,
+            prefetch=prefetch,
+            max_items=max_items,
+            is_last=lambda resp: not resp.paging_info.continuation_token,
+            xuid=xuid,
+            title_id=title_id,
+            **kwargs,
+        )
+
+    def iter_saved_own_clips(
+        self,
+        title_id: str | None = None,
+        page_size: int = 25,
+        prefetch: int = 1,
+        max_items: int | None = None,
+        **kwargs,
+    ) -> AsyncIterator[GameClip]:
+        """
+        Iterate own saved clips, optionally filter for title Id, following pages
+
+        Args:
+            title_id: Optional title id filter
+            page_size: Item count to load per page
+            prefetch: Number of pages requested ahead
+            max_items: Stop after this many clips
+
+        Returns:
+            Async iterator of :class:`GameClip`
+        """
+        return iterate_offset(
+            self.get_saved_own_clips,
+            lambda resp: resp.game_clips,
+            page_size=page_size,
+            prefetch=prefetch,
+            max_items=max_items,
+            is_last=lambda resp: not resp.paging_info.continuation_token,
+            title_id=title_id,
+            **kwargs,
+        )
+
+    def iter_saved_clips_by_xuid(
+        self,
+        xuid: str,
+        title_id: str | None = None,
+        page_size: int = 25,
+        prefetch: int = 1,
+        max_items: int | None = None,
+        **kwargs,
+    ) -> AsyncIterator[GameClip]:
+        """
+        Iterate saved clips by XUID, optionally filter for title Id, following pages
+
+        Args:
+            xuid: XUID of user to get clips from
+            title_id: Optional title id filter
+            page_size: Item count to load per page
+            prefetch: Number of pages requested ahead
+            max_items: Stop after this many clips
+
+        Returns:
+            Async iterator of :class:`GameClip`
+        """
+        return iterate_offset(
+            self.get_saved_clips_by_xuid,
+            lambda resp: resp.game_clips,
+            page_size=page_size,
+            prefetch=prefetch,
+            max_items=max_items,
+            is_last=lambda resp: not resp.paging_info.continuation_token,
+            xuid=xuid,
+            title_id=title_id,
+            **kwargs,
+        )
@@ -2,13 +2,18 @@
 Mediahub - Fetch screenshots and gameclips
 """
 
-from typing import ClassVar
+from collections.abc import AsyncIterator
+from typing import Any, ClassVar
 
 from pythonxbox.api.provider.baseprovider import BaseProvider
 from pythonxbox.api.provider.mediahub.models import (
+    GameclipContent,
     MediahubGameclips,
     MediahubScreenshots,
+    ScreenshotContent,
 )
+from pythonxbox.api.provider.mediahub.query import MediahubField, MediahubFilter, eq
+from pythonxbox.common.paging import iterate_offset
 
 
 class MediahubProvider(BaseProvider):
@@ -16,7 +21,12 @@ class MediahubProvider(BaseProvider):
     HEADERS: ClassVar = {"x-xbl-contract-version": "3"}
 
     async def fetch_own_clips(
-        self, skip: int = 0, count: int = 500, **kwargs
+        self,
+        skip: int = 0,
+        count: int = 500,
+        query: MediahubFilter | None = None,
+        order_by: str | None = None,
+        **kwargs,
     ) -> MediahubGameclips:
         """
         Fetch own clips
@@ -24,16 +34,15 @@ class MediahubProvider(BaseProvider):
         Args:
             skip: Number of items to skip
             count: Max entries to fetch
+            query: Filter applied by the service, see
+                :mod:`pythonxbox.api.provider.mediahub.query`
+            order_by: Ordering clause, e.g. `order_by(MediahubField.UPLOAD_DATE)`
 
         Returns:
             :class:`MediahubGameclips`: Gameclips
         """
         url = f"{self.MEDIAHUB_URL}/gameclips/search"
-        post_data = {
-            "max": count,
-            "query": f"OwnerXuid eq {self.client.xuid}",
-            "skip": skip,
-        }
+        post_data = self._search_data(skip, count, query, order_by)
         resp = await self.client.session.post(
             url, json=post_data, headers=self.HEADERS, **kwargs
         )
@@ -41,7 +50,12 @@ class MediahubProvider(BaseProvider):
         return MediahubGameclips.model_validate_json(resp.text)
 
     async def fetch_own_screenshots(
-        self, skip: int = 0, count: int = 500, **kwargs
+        self,
+        skip: int = 0,
+        count: int = 500,
+        query: MediahubFilter | None = None,
+        order_by: str | None = None,
+        **kwargs,
     ) -> MediahubScreenshots:
         """
         Fetch own screenshots
@@ -49,18 +63,104 @@ class MediahubProvider(BaseProvider):
         Args:
             skip: Number of items to skip
             count: Max entries to fetch
+            query: Filter applied by the service, see
+                :mod:`pythonxbox.api.provider.mediahub.query`
+            order_by: Ordering clause, e.g. `order_by(MediahubField.UPLOAD_DATE)`
 
         Returns:
             :class:`MediahubScreenshots`: Screenshots
         """
         url = f"{self.MEDIAHUB_URL}/screenshots/search"
-        post_data = {
-            "max": count,
-            "query": f"OwnerXuid eq {self.client.xuid}",
-            "skip": skip,
-        }
+        post_data = self._search_data(skip, count, query, order_by)
         resp = await self.client.session.post(
             url, json=post_data, headers=self.HEADERS, **kwargs
         )
         resp.raise_for_status()
         return MediahubScreenshots.model_validate_json(resp.text)
+
+    def _search_data(
+        self,
+        skip: int,
+        count: int,
+        query: MediahubFilter | None,
+        order_by: str | None,
+    ) -> dict[str, Any]:
+        owner = eq(MediahubField.OWNER_XUID, int(self.client.xuid))
+        post_data: dict[str, Any] = {
+            "max": count,
+            "query": str(owner & query if query else owner),
+            "skip": skip,
+        }
+        if order_by:
+            post_data["orderBy"] = order_by
+        return post_data
+
+    def iter_own_clips(
+        self,
+        page_size: int = 500,
+        prefetch: int = 1,
+        max_items: int | None = None,
+        query: MediahubFilter | None = None,
+        order_by: str | None = None,
+        **kwargs,
+    ) -> AsyncIterator[GameclipContent]:
+        """
+        Iterate own clips, following pages
+
+        Args:
+            page_size: Max entries to fetch per page
+            prefetch: Number of pages requested ahead
+            max_items: Stop after this many clips
+            query: Filter applied by the service
+            order_by: Ordering clause
+
+        Returns:
+            Async iterator of :class:`GameclipContent`
+        """
+        return iterate_offset(
+            self.fetch_own_clips,
+            lambda resp: resp.values,
+            page_size=page_size,
+            prefetch=prefetch,
+            max_items=max_items,
+            skip_param="skip",
+            size_param="count",
+            query=query,
+            order_by=order_by,
+            **kwargs,
+        )
+
+    def iter_own_screenshots(
+        self,
+        page_size: int = 500,
+        prefetch: int = 1,
+        max_items: int | None = None,
+        query: MediahubFilter | None = None,
+        order_by: str | None = None,
+        **kwargs,
+    ) -> AsyncIterator[ScreenshotContent]:
+        """
+        Iterate own screenshots, following pages
+
+        Args:
+            page_size: Max entries to fetch per page
+            prefetch: Number of pages requested ahead
+            max_items: Stop after this many screenshots
+            query: Filter applied by the service
+            order_by: Ordering clause
+
+        Returns:
+            Async iterator of :class:`ScreenshotContent`
+        """
+        return iterate_offset(
+            self.fetch_own_screenshots,
+            lambda resp: resp.values,
+            page_size=page_size,
+            prefetch=prefetch,
+            max_items=max_items,
+            skip_param="skip",
+            size_param="count",
+            query=query,
+            order_by=order_by,
+            **kwargs,
+        )
@@ -0,0 +1,169 @@
+"""
+Mediahub Queries
+
+Build server-side filters for the mediahub search endpoints
+"""
+
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from enum import Enum, StrEnum
+
+
+class MediahubField(StrEnum):
+    """Indexed properties of mediahub content"""
+
+    OWNER_XUID = "OwnerXuid"
+    CONTENT_ID = "ContentId"
+    TITLE_ID = "TitleId"
+    UPLOAD_TITLE_ID = "UploadTitleId"
+    UPLOAD_DATE = "UploadDate"
+    UPLOAD_DEVICE_TYPE = "UploadDeviceType"
+    CREATION_TYPE = "CreationType"
+    CONTENT_STATE = "ContentState"
+    DURATION_IN_SECONDS = "DurationInSeconds"
+
+
+Value = str | int | float | bool | datetime
+
+
+@dataclass(frozen=True)
+class MediahubFilter:
+    """
+    Filter expression of the mediahub search grammar
+
+    Combine filters with `&` (and), `|` (or) and `~` (not).
+    """
+
+    expression: str
+    operator: str | None = None
+
+    def __and__(self, other: "MediahubFilter") -> "MediahubFilter":
+        return self._combine("and", other)
+
+    def __or__(self, other: "MediahubFilter") -> "MediahubFilter":
+        return self._combine("or", other)
+
+    def __invert__(self) -> "MediahubFilter":
+        return MediahubFilter(f"not ({self.expression})", "not")
+
+    def __str__(self) -> str:
+        return self.expression
+
+    def _combine(self, operator: str, other: "MediahubFilter") -> "MediahubFilter":
+        operands = [
+            f.expression if f.operator in {None, operator, "not"} else f"({f})"
+            for f in (self, other)
+        ]
+        return MediahubFilter(f" {operator} ".join(operands), operator)
+
+
+def format_value(value: Value) -> str:
+    """
+    Format a literal of the search grammar
+
+    Args:
+        value: Literal, strings are quoted, datetimes formatted as UTC
+
+    Returns: Formatted literal
+    """
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(UTC).replace(tzinfo=None)
+        return value.isoformat(timespec="seconds") + "Z"
+    if isinstance(value, Enum):
+        value = value.value
+    if isinstance(value, str):
+        return "'{}'".format(value.replace("'", "''"))
+    return str(value)
+
+
+def compare(field: MediahubField | str, operator: str, value: Value) -> MediahubFilter:
+    """
+    Compare a property with a literal
+
+    Args:
+        field: Property name
+        operator: One of `eq`, `ne`, `gt`, `ge`, `lt` and `le`
+        value: Literal
+
+    Returns: :class:`MediahubFilter`
+    """
+    if operator not in {"eq", "ne", "gt", "ge", "lt", "le"}:
+        raise ValueError(f"Unsupported operator: {operator}")
+    return MediahubFilter(f"{field} {operator} {format_value(value)}")
+
+
+def eq(field: MediahubField | str, value: Value) -> MediahubFilter:
+    return compare(field, "eq", value)
+
+
+def ne(field: MediahubField | str, value: Value) -> MediahubFilter:
+    return compare(field, "ne", value)
+
+
+def any_of(field: MediahubField | str, values: list[Value]) -> MediahubFilter:
+    """
+    Match any of several values of a property
+
+    Args:
+        field: Property name
+        values: Literals
+
+    Returns: :class:`MediahubFilter`
+    """
+    if not values:
+        raise ValueError("At least one value is required")
+    result = eq(field, values[0])
+    for value in values[1:]:
+        result |= eq(field, value)
+    return result
+
+
+def between(
+    field: MediahubField | str, start: Value | None = None, end: Value | None = None
+) -> MediahubFilter:
+    """
+    Match a range of a property
+
+    Args:
+        field: Property name
+        start: Lower bound, inclusive
+        end: Upper bound, exclusive
+
+    Returns: :class:`MediahubFilter`
+    """
+    filters = []
+    if start is not None:
+        filters.append(compare(field, "ge", start))
+    if end is not None:
+        filters.append(compare(field, "lt", end))
+    if not filters:
+        raise ValueError("start or end is required")
+    return filters[0] if len(filters) == 1 else filters[0] & filters[1]
+
+
+def title_id(value: int | str) -> MediahubFilter:
+    """Match content of a title"""
+    return eq(MediahubField.TITLE_ID, int(value))
+
+
+def uploaded_between(
+    start: datetime | None = None, end: datetime | None = None
+) -> MediahubFilter:
+    """Match content uploaded within a time range"""
+    return between(MediahubField.UPLOAD_DATE, start, end)
+
+
+def order_by(field: MediahubField | str, descending: bool = True) -> str:
+    """
+    Build an ordering clause
+
+    Args:
+        field: Property name
+        descending: Sort newest / largest first
+
+    Returns: Ordering clause
+    """
+    return f"{field} {'desc' if descending else 'asc'}"
@@ -0,0 +1,184 @@
+"""
+Media Library Sync
+
+Mirror clip and screenshot metadata locally, only listing new items on
+routine syncs
+"""
+
+from collections.abc import AsyncIterator, Callable
+from contextlib import aclosing
+from dataclasses import dataclass
+from enum import StrEnum
+import json
+import os
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from pydantic import BaseModel
+
+from pythonxbox.api.provider.gameclips.models import GameClip
+from pythonxbox.api.provider.mediahub.models import GameclipContent, ScreenshotContent
+from pythonxbox.api.provider.mediahub.query import MediahubField, order_by
+
+if TYPE_CHECKING:
+    from pythonxbox.api.client import XboxLiveClient
+
+
+class MediaKind(StrEnum):
+    CLIP = "clip"
+    SCREENSHOT = "screenshot"
+    SAVED_GAMECLIP = "saved_gameclip"
+
+
+class MediaChange(StrEnum):
+    ADDED = "added"
+    REMOVED = "removed"
+
+
+@dataclass
+class MediaEvent:
+    change: MediaChange
+    kind: MediaKind
+    id: str
+    item: BaseModel
+
+
+# Routine syncs rely on the newest items being listed first
+NEWEST_FIRST = order_by(MediahubField.UPLOAD_DATE, descending=True)
+
+
+class _Source(NamedTuple):
+    model: type[BaseModel]
+    id_attr: str
+    iterate: Callable[["XboxLiveClient", int, int], AsyncIterator[Any]]
+
+
+SOURCES: dict[MediaKind, _Source] = {
+    MediaKind.CLIP: _Source(
+        GameclipContent,
+        "content_id",
+        lambda client, size, prefetch: client.mediahub.iter_own_clips(
+            page_size=size, prefetch=prefetch, order_by=NEWEST_FIRST
+        ),
+    ),
+    MediaKind.SCREENSHOT: _Source(
+        ScreenshotContent,
+        "content_id",
+        lambda client, size, prefetch: client.mediahub.iter_own_screenshots(
+            page_size=size, prefetch=prefetch, order_by=NEWEST_FIRST
+        ),
+    ),
+    MediaKind.SAVED_GAMECLIP: _Source(
+        GameClip,
+        "game_clip_id",
+        lambda client, size, prefetch: client.gameclips.iter_saved_own_clips(
+            page_size=size, prefetch=prefetch
+        ),
+    ),
+}
+
+
+class MediaLibrarySync:
+    """
+    Incremental media library synchronisation
+
+    Media is listed newest first, mediahub searches are ordered by upload
+    date explicitly. A routine :meth:`sync` pages through each library until
+    it reaches an already stored item, usually after the first page. Removed items can only be detected by listing the
+    whole library, which is done on the first and on `full` syncs.
+    """
+
+    def __init__(
+        self,
+        client: "XboxLiveClient",
+        kinds: tuple[MediaKind, ...] = (MediaKind.CLIP, MediaKind.SCREENSHOT),
+        page_size: int = 100,
+        state_path: str | os.PathLike | None = None,
+    ) -> None:
+        """
+        Initialize media library sync
+
+        Args:
+            client: Instance of XboxLiveClient
+            kinds: Libraries to sync
+            page_size: Items requested per page
+            state_path: File to persist the stored metadata to
+        """
+        self.client = client
+        self.kinds = kinds
+        self.page_size = page_size
+        self.state_path = state_path
+
+        self.items: dict[MediaKind, dict[str, Any]] = {kind: {} for kind in kinds}
+        self._loaded = False
+
+    async def sync(self, full: bool = False) -> list[MediaEvent]:
+        """
+        Synchronise the stored metadata
+
+        Args:
+            full: List the whole libraries to detect removed items
+
+        Returns: Added and removed items, newest first
+        """
+        if not self._loaded:
+            self._load_state()
+
+        events: list[MediaEvent] = []
+        for kind in self.kinds:
+            events.extend(await self._sync_kind(kind, full or not self.items[kind]))
+        if events:
+            self._save_state()
+        return events
+
+    async def _sync_kind(self, kind: MediaKind, full: bool) -> list[MediaEvent]:
+        source = SOURCES[kind]
+        stored = self.items[kind]
+        seen: dict[str, Any] = {}
+        events: list[MediaEvent] = []
+        # Routine syncs usually stop within the first page, do not prefetch
+        pages = source.iterate(self.client, self.page_size, 1 if full else 0)
+        async with aclosing(pages) as items:
+            async for item in items:
+                item_id = getattr(item, source.id_attr)
+                if item_id in stored and not full:
+                    break
+                if item_id not in stored and item_id not in seen:
+                    events.append(MediaEvent(MediaChange.ADDED, kind, item_id, item))
+                seen[item_id] = item
+
+        if full:
+            events.extend(
+                MediaEvent(MediaChange.REMOVED, kind, item_id, item)
+                for item_id, item in stored.items()
+                if item_id not in seen
+            )
+            self.items[kind] = seen
+        else:
+            # Keep newest first
+            self.items[kind] = {**seen, **stored}
+        return events
+
+    def _load_state(self) -> None:
+        self._loaded = True
+        if not (self.state_path and os.path.exists(self.state_path)):
+            return
+        with open(self.state_path) as f:
+            state = json.load(f)
+        for kind in self.kinds:
+            source = SOURCES[kind]
+            items = (source.model.model_validate(i) for i in state.get(kind, []))
+            self.items[kind] = {getattr(i, source.id_attr): i for i in items}
+
+    def _save_state(self) -> None:
+        if not self.state_path:
+            return
+        state = {
+            kind: [
+                item.model_dump(mode="json", by_alias=True) for item in items.values()
+            ]
+            for kind, items in self.items.items()
+        }
+        tmp_path = f"{os.fspath(self.state_path)}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.state_path)
@@ -13,6 +13,7 @@ from pythonxbox.api.provider.ratelimitedprovider import RateLimitedProvider
 
 if TYPE_CHECKING:
     from pythonxbox.api.client import XboxLiveClient
+    from pythonxbox.api.provider.presence.titleindex import TitleIndex
 
 
 class PeopleProvider(RateLimitedProvider):
@@ -29,6 +30,8 @@ class PeopleProvider(RateLimitedProvider):
     RATE_LIMITS: ClassVar = {"burst": 10, "sustain": 30}
 
     client: "XboxLiveClient"
+    # Updated from people responses with presence details, see TitleIndex.attach
+    title_index: "TitleIndex | None" = None
 
     def __init__(self, client: "XboxLiveClient") -> None:
         """
@@ -62,7 +65,7 @@ class PeopleProvider(RateLimitedProvider):
         url = f"{self.PEOPLE_URL}/users/me/people/friends/decoration/{decoration}"
         resp = await self.client.session.get(url, headers=self._headers, **kwargs)
         resp.raise_for_status()
-        return PeopleResponse.model_validate_json(resp.text)
+        return self._parse_people(resp.text, decoration_fields)
 
     async def get_friends_by_xuid(
         self,
@@ -91,9 +94,14 @@ class PeopleProvider(RateLimitedProvider):
         url = f"{self.PEOPLE_URL}/users/xuid({xuid})/people/friends/decoration/{decoration}"
         resp = await self.client.session.get(url, headers=self._headers, **kwargs)
         resp.raise_for_status()
-        return PeopleResponse.model_validate_json(resp.text)
+        return self._parse_people(resp.text, decoration_fields)
 
-    async def get_friend_by_xuid(self, xuid: str, decoration_fields: list[PeopleDecoration] | None = None, **kwargs) -> PeopleResponse:
+    async def get_friend_by_xuid(
+        self,
+        xuid: str,
+        decoration_fields: list[PeopleDecoration] | None = None,
+        **kwargs,
+    ) -> PeopleResponse:
         """
         Get a single friend's profile from the authenticated user's perspective
 
@@ -118,7 +126,7 @@ class PeopleProvider(RateLimitedProvider):
         url = f"{self.PEOPLE_URL}/users/me/people/xuids({xuid})/decoration/{decoration}"
         resp = await self.client.session.get(url, headers=self._headers, **kwargs)
         resp.raise_for_status()
-        return PeopleResponse.model_validate_json(resp.text)
+        return self._parse_people(resp.text, decoration_fields)
 
     async def get_friends_own_batch(
         self,
@@ -149,7 +157,7 @@ class PeopleProvider(RateLimitedProvider):
             url, json={"xuids": xuids}, headers=self._headers, **kwargs
         )
         resp.raise_for_status()
-        return PeopleResponse.model_validate_json(resp.text)
+        return self._parse_people(resp.text, decoration_fields)
 
     async def get_friend_recommendations(
         self, decoration_fields: list[PeopleDecoration] | None = None, **kwargs
@@ -169,7 +177,7 @@ class PeopleProvider(RateLimitedProvider):
         )
         resp = await self.client.session.get(url, headers=self._headers, **kwargs)
         resp.raise_for_status()
-        return PeopleResponse.model_validate_json(resp.text)
+        return self._parse_people(resp.text, decoration_fields)
 
     async def get_friends_summary_own(self, **kwargs) -> PeopleSummaryResponse:
         """
@@ -222,3 +230,16 @@ class PeopleProvider(RateLimitedProvider):
         )
         resp.raise_for_status()
         return PeopleSummaryResponse.model_validate_json(resp.text)
+
+    def _parse_people(
+        self, text: str, decoration_fields: list[PeopleDecoration]
+    ) -> PeopleResponse:
+        response = PeopleResponse.for_decorations(
+            decoration_fields
+        ).model_validate_json(text)
+        if (
+            self.title_index is not None
+            and PeopleDecoration.PRESENCE_DETAIL in decoration_fields
+        ):
+            self.title_index.add_people(response)
+        return response
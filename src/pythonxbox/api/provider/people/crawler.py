@@ -0,0 +1,291 @@
+"""
+Friend Graph Crawler
+
+Breadth-first crawl of friends-of-friends, streaming the discovered edges
+"""
+
+import asyncio
+import base64
+from collections.abc import AsyncIterator
+import contextlib
+import hashlib
+import json
+import logging
+import math
+import os
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+import httpx
+
+from pythonxbox.api.provider.people.models import PeopleDecoration
+from pythonxbox.common.concurrency import call_rate_limited
+
+if TYPE_CHECKING:
+    from pythonxbox.api.client import XboxLiveClient
+
+log = logging.getLogger("xbox.people.crawler")
+
+
+class FriendEdge(NamedTuple):
+    source: int
+    target: int
+    depth: int
+
+
+class BloomFilter:
+    """
+    Probabilistic set of XUIDs with a fixed memory footprint
+
+    Membership tests may return false positives at the configured error rate,
+    users falsely considered as visited are not crawled.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001) -> None:
+        """
+        Initialize Bloom filter
+
+        Args:
+            capacity: Expected number of XUIDs
+            error_rate: Acceptable false positive rate
+        """
+        self.size = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, xuid: int) -> list[int]:
+        digest = hashlib.blake2b(xuid.to_bytes(8, "little"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, xuid: int) -> None:
+        for pos in self._positions(xuid):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, xuid: object) -> bool:
+        if not isinstance(xuid, int):
+            return False
+        return all(
+            self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(xuid)
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "size": self.size,
+            "hashes": self.hashes,
+            "bits": base64.b64encode(self.bits).decode("ascii"),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "BloomFilter":
+        bloom = cls.__new__(cls)
+        bloom.size = data["size"]
+        bloom.hashes = data["hashes"]
+        bloom.bits = bytearray(base64.b64decode(data["bits"]))
+        return bloom
+
+
+class FriendGraphCrawler:
+    """
+    Crawl the friend graph breadth-first, starting from one or more users
+
+    Within a depth level, users discovered through more already crawled
+    users (mutual friends) are crawled first. Crawl state is periodically
+    written to a checkpoint file, a crawl with an existing checkpoint
+    resumes from it. A user counts as crawled once all of its edges have
+    been consumed, edges of partially consumed users are emitted again after
+    resuming.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        client: "XboxLiveClient",
+        *,
+        max_depth: int = 2,
+        concurrency: int = 4,
+        visited: set[int] | BloomFilter | None = None,
+        checkpoint_path: str | os.PathLike | None = None,
+        checkpoint_interval: int = 100,
+        decoration_fields: list[PeopleDecoration] | None = None,
+        respect_rate_limits: bool = True,
+    ) -> None:
+        """
+        Initialize crawler
+
+        Args:
+            client: Instance of XboxLiveClient
+            max_depth: Maximum distance from the seeds, 1 only crawls the seeds
+            concurrency: Number of friend lists requested in parallel
+            visited: Set of already crawled XUIDs, e.g. :class:`BloomFilter`
+            checkpoint_path: File to write crawl state to
+            checkpoint_interval: Write checkpoint every n crawled users
+            decoration_fields: Decorations to request friend lists with
+            respect_rate_limits: Throttle requests with the people rate limits
+        """
+        self.client = client
+        self.max_depth = max_depth
+        self.concurrency = concurrency
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_interval = checkpoint_interval
+        self.decoration_fields = decoration_fields
+        self.rate_limits = (
+            client.people.rate_limit_read if respect_rate_limits else None
+        )
+
+        self.visited: set[int] | BloomFilter = visited if visited is not None else set()
+        # Discovered, not yet crawled users: xuid -> (depth, times discovered)
+        self._pending: dict[int, tuple[int, int]] = {}
+        self._in_flight: dict[int, int] = {}
+        self._queue: asyncio.PriorityQueue[tuple[int, int, int]] = (
+            asyncio.PriorityQueue()
+        )
+        self._crawled = 0
+
+    async def crawl(self, *seeds: int | str) -> AsyncIterator[FriendEdge]:
+        """
+        Crawl the friend graph
+
+        Seeds are ignored when resuming from a checkpoint. When stopping
+        early, close the generator (e.g. with `contextlib.aclosing`) to write
+        the checkpoint.
+
+        Args:
+            seeds: XUIDs to start crawling from
+
+        Yields: Discovered friendships as :class:`FriendEdge`
+
+        Raises:
+            ValueError: If the checkpoint was written with another `max_depth`
+        """
+        if not self._load_checkpoint():
+            for seed in seeds:
+                self._discover(int(seed), 0)
+
+        edges: asyncio.Queue[FriendEdge | int | BaseException | None] = asyncio.Queue(
+            maxsize=self.concurrency * 1000
+        )
+        workers = [
+            asyncio.create_task(self._worker(edges)) for _ in range(self.concurrency)
+        ]
+        joiner = asyncio.create_task(self._join(edges))
+        completed = False
+        try:
+            while (item := await edges.get()) is not None:
+                if isinstance(item, BaseException):
+                    raise item
+                if isinstance(item, FriendEdge):
+                    yield item
+                else:
+                    # All edges of this user have been consumed
+                    await self._mark_crawled(item)
+            completed = True
+        finally:
+            for task in [*workers, joiner]:
+                task.cancel()
+            if completed:
+                self._remove_checkpoint()
+            else:
+                self._write_checkpoint()
+
+    async def _join(self, edges: asyncio.Queue) -> None:
+        await self._queue.join()
+        await edges.put(None)
+
+    async def _worker(self, edges: asyncio.Queue) -> None:
+        while True:
+            depth, _, xuid = await self._queue.get()
+            try:
+                if self._pending.pop(xuid, None) is None:
+                    # Outdated queue entry of an already crawled user
+                    continue
+                self._in_flight[xuid] = depth
+                for friend in await self._fetch_friends(xuid):
+                    await edges.put(FriendEdge(xuid, friend, depth + 1))
+                    if depth + 1 < self.max_depth:
+                        self._discover(friend, depth + 1)
+                await edges.put(xuid)
+            except Exception as e:
+                await edges.put(e)
+            finally:
+                self._queue.task_done()
+
+    async def _mark_crawled(self, xuid: int) -> None:
+        self.visited.add(xuid)
+        del self._in_flight[xuid]
+        self._crawled += 1
+        if self.checkpoint_path and self._crawled % self.checkpoint_interval == 0:
+            state = self._checkpoint_state()
+            await asyncio.to_thread(self._write_checkpoint, state)
+
+    def _discover(self, xuid: int, depth: int) -> None:
+        if xuid in self._in_flight or xuid in self.visited:
+            return
+        if xuid in self._pending:
+            old_depth, count = self._pending[xuid]
+            depth, count = min(depth, old_depth), count + 1
+        else:
+            count = 1
+        self._pending[xuid] = (depth, count)
+        # Re-queue with higher priority only when the count doubles,
+        # keeps outdated queue entries at O(log n) per user
+        if count & (count - 1) == 0:
+            self._queue.put_nowait((depth, -count, xuid))
+
+    async def _fetch_friends(self, xuid: int) -> list[int]:
+        try:
+            resp = await call_rate_limited(
+                self.client.people.get_friends_by_xuid,
+                str(xuid),
+                self.decoration_fields,
+                rate_limits=self.rate_limits,
+            )
+        except httpx.HTTPStatusError as e:
+            # Friend list is private or user does not exist
+            log.debug("Skipping %s: %s", xuid, e)
+            return []
+        return [int(person.xuid) for person in resp.people]
+
+    def _checkpoint_state(self) -> dict[str, Any]:
+        pending = [[x, d, c] for x, (d, c) in self._pending.items()]
+        pending.extend([x, d, 1] for x, d in self._in_flight.items())
+        if isinstance(self.visited, BloomFilter):
+            visited: dict[str, Any] = {"bloom": self.visited.to_dict()}
+        else:
+            visited = {"xuids": list(self.visited)}
+        return {"max_depth": self.max_depth, "visited": visited, "pending": pending}
+
+    def _write_checkpoint(self, state: dict[str, Any] | None = None) -> None:
+        if not self.checkpoint_path:
+            return
+        state = state or self._checkpoint_state()
+        tmp_path = f"{os.fspath(self.checkpoint_path)}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def _remove_checkpoint(self) -> None:
+        if self.checkpoint_path:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(self.checkpoint_path)
+
+    def _load_checkpoint(self) -> bool:
+        if not (self.checkpoint_path and os.path.exists(self.checkpoint_path)):
+            return False
+        with open(self.checkpoint_path) as f:
+            state = json.load(f)
+        if state["max_depth"] != self.max_depth:
+            # The pending frontier was discovered with the stored depth limit
+            raise ValueError(
+                f"Checkpoint was written with max_depth={state['max_depth']}, "
+                f"crawler uses max_depth={self.max_depth}"
+            )
+
+        visited = state["visited"]
+        if "bloom" in visited:
+            self.visited = BloomFilter.from_dict(visited["bloom"])
+        else:
+            self.visited = set(visited["xuids"])
+        for xuid, depth, count in state["pending"]:
+            self._pending[xuid] = (depth, count)
+            self._queue.put_nowait((depth, -count, xuid))
+        return True
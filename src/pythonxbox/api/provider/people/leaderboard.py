@@ -0,0 +1,297 @@
+"""
+Friends Leaderboards
+
+Rank a user's friends by gamerscore or a title stat, keeping the rankings
+sorted and only touching entries whose score changed
+"""
+
+from bisect import bisect_left, insort
+from collections.abc import Iterable
+import math
+from typing import TYPE_CHECKING, NamedTuple
+
+from pythonxbox.api.provider.people.sync import FriendListSync
+from pythonxbox.api.provider.profile.models import (
+    ProfileSettings,
+    ProfileSettingsPreset,
+)
+from pythonxbox.common.concurrency import call_rate_limited, chunked
+
+if TYPE_CHECKING:
+    from pythonxbox.api.client import XboxLiveClient
+
+GAMERSCORE = "Gamerscore"
+
+
+class LeaderboardEntry(NamedTuple):
+    rank: int
+    xuid: int
+    score: float
+
+
+class Leaderboard:
+    """
+    Scores of a group of users, kept sorted
+
+    Updates are O(n) list insertions with O(log n) lookups, queries do not
+    sort. Equal scores share a rank ("1224" ranking), ties are listed by
+    XUID.
+    """
+
+    def __init__(self, descending: bool = True) -> None:
+        """
+        Initialize leaderboard
+
+        Args:
+            descending: Rank higher scores first
+        """
+        self.descending = descending
+        self._scores: dict[int, float] = {}
+        self._keys: list[tuple[float, int]] = []
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+    def __contains__(self, xuid: object) -> bool:
+        return isinstance(xuid, int | str) and int(xuid) in self._scores
+
+    def _key(self, xuid: int, score: float) -> tuple[float, int]:
+        return (-score if self.descending else score, xuid)
+
+    def update(self, xuid: int | str, score: float) -> bool:
+        """
+        Set the score of a user
+
+        Args:
+            xuid: XUID
+            score: Score
+
+        Returns: `True` if the score changed
+        """
+        xuid = int(xuid)
+        previous = self._scores.get(xuid)
+        if previous == score:
+            return False
+        if previous is not None:
+            del self._keys[self._index(xuid, previous)]
+        self._scores[xuid] = score
+        insort(self._keys, self._key(xuid, score))
+        return True
+
+    def remove(self, xuid: int | str) -> bool:
+        """
+        Remove a user
+
+        Args:
+            xuid: XUID
+
+        Returns: `True` if the user was ranked
+        """
+        xuid = int(xuid)
+        score = self._scores.pop(xuid, None)
+        if score is None:
+            return False
+        del self._keys[self._index(xuid, score)]
+        return True
+
+    def retain(self, xuids: Iterable[int | str]) -> None:
+        """
+        Remove all users not contained in `xuids`
+
+        Args:
+            xuids: XUIDs to keep
+        """
+        keep = {int(xuid) for xuid in xuids}
+        for xuid in [xuid for xuid in self._scores if xuid not in keep]:
+            self.remove(xuid)
+
+    def score(self, xuid: int | str) -> float | None:
+        return self._scores.get(int(xuid))
+
+    def rank(self, xuid: int | str) -> int | None:
+        """
+        Get the rank of a user
+
+        Args:
+            xuid: XUID
+
+        Returns: 1-based rank, `None` if the user is not ranked
+        """
+        score = self._scores.get(int(xuid))
+        if score is None:
+            return None
+        return self._rank_at(self._index(int(xuid), score))
+
+    def top(self, k: int = 10) -> list[LeaderboardEntry]:
+        """
+        Get the highest ranked users
+
+        Args:
+            k: Number of entries
+
+        Returns: Up to `k` entries
+        """
+        return self._entries(0, k)
+
+    def neighbours(self, xuid: int | str, n: int = 2) -> list[LeaderboardEntry]:
+        """
+        Get the users ranked around a user
+
+        Args:
+            xuid: XUID
+            n: Number of entries above and below the user
+
+        Returns: Up to `2 * n + 1` entries, including the user itself
+        """
+        score = self._scores.get(int(xuid))
+        if score is None:
+            return []
+        i = self._index(int(xuid), score)
+        return self._entries(max(i - n, 0), i + n + 1)
+
+    def _index(self, xuid: int, score: float) -> int:
+        return bisect_left(self._keys, self._key(xuid, score))
+
+    def _rank_at(self, i: int) -> int:
+        return bisect_left(self._keys, (self._keys[i][0],)) + 1
+
+    def _entries(self, start: int, stop: int) -> list[LeaderboardEntry]:
+        entries: list[LeaderboardEntry] = []
+        for i in range(start, min(stop, len(self._keys))):
+            key, xuid = self._keys[i]
+            if not entries:
+                rank = self._rank_at(i)
+            elif key == self._keys[i - 1][0]:
+                rank = entries[-1].rank
+            else:
+                rank = i + 1
+            entries.append(LeaderboardEntry(rank, xuid, self._scores[xuid]))
+        return entries
+
+
+class FriendsLeaderboards:
+    """
+    Leaderboards of a user and its friends, per (owner, stat)
+
+    The friend list is kept with :class:`FriendListSync`, so it is only
+    refetched when the friend summary reports a change. Rankings read the
+    scores of all friends with batched requests, only entries whose value
+    changed are re-sorted. All queries are answered from memory.
+    """
+
+    def __init__(self, client: "XboxLiveClient") -> None:
+        """
+        Initialize friends leaderboards
+
+        Args:
+            client: Instance of XboxLiveClient
+        """
+        self.client = client
+        self._syncs: dict[str, FriendListSync] = {}
+        self._boards: dict[tuple[str, str], Leaderboard] = {}
+
+    def board(self, owner: str | None = None, stat: str = GAMERSCORE) -> Leaderboard:
+        """
+        Get a leaderboard, empty until refreshed
+
+        Args:
+            owner: XUID of the user whose friends are ranked, own if omitted
+            stat: Stat name, or `GAMERSCORE`
+
+        Returns: :class:`Leaderboard`
+        """
+        key = (owner or self.client.xuid, stat)
+        board = self._boards.get(key)
+        if board is None:
+            board = self._boards[key] = Leaderboard()
+        return board
+
+    async def refresh_gamerscore(
+        self, owner: str | None = None, force: bool = False
+    ) -> Leaderboard:
+        """
+        Refresh the gamerscore leaderboard of a user and its friends
+
+        Args:
+            owner: XUID of the user whose friends are ranked, own if omitted
+            force: Refetch the friend list regardless of the summary
+
+        Returns: :class:`Leaderboard`
+        """
+        owner = owner or self.client.xuid
+        friends = await self._sync(owner, force)
+        board = self.board(owner)
+        profile = self.client.profile
+        for chunk in chunked([owner, *friends], profile.MAX_BATCH_XUIDS):
+            resp = await call_rate_limited(
+                profile.get_profiles, list(chunk), ProfileSettingsPreset.MINIMAL
+            )
+            for user in resp.profile_users:
+                score = _to_score(user.get_setting(ProfileSettings.GAMERSCORE))
+                if score is not None:
+                    board.update(user.id, score)
+        return board
+
+    async def refresh_stat(
+        self,
+        service_config_id: str,
+        stat: str,
+        owner: str | None = None,
+        force: bool = False,
+    ) -> Leaderboard:
+        """
+        Refresh the leaderboard of a title stat for a user and its friends
+
+        Args:
+            service_config_id: Service Config Id of Game (scid)
+            stat: Stat name
+            owner: XUID of the user whose friends are ranked, own if omitted
+            force: Refetch the friend list regardless of the summary
+
+        Returns: :class:`Leaderboard`
+        """
+        owner = owner or self.client.xuid
+        friends = await self._sync(owner, force)
+        board = self.board(owner, stat)
+        xuids = [owner, *friends]
+        table = await self.client.userstats.get_stats_table_by_scid(
+            xuids, service_config_id, [stat]
+        )
+        ranked: list[int] = []
+        if stat in table.stat_names:
+            present = table.present(stat)
+            for row, xuid in enumerate(table.xuids):
+                score = _to_score(table.get(xuid, stat)) if present[row] else None
+                if score is not None:
+                    board.update(xuid, score)
+                    ranked.append(xuid)
+        board.retain(ranked)
+        return board
+
+    async def _sync(self, owner: str, force: bool) -> list[str]:
+        sync = self._syncs.get(owner)
+        if sync is None:
+            xuid = None if owner == self.client.xuid else owner
+            sync = self._syncs[owner] = FriendListSync(self.client, xuid)
+        diff = await sync.sync(force)
+        if diff is not None:
+            for (board_owner, _), board in self._boards.items():
+                if board_owner == owner:
+                    for person in diff.removed:
+                        board.remove(person.xuid)
+            board = self.board(owner)
+            for person in [*diff.added, *diff.changed]:
+                score = _to_score(person.gamer_score)
+                if score is not None:
+                    board.update(person.xuid, score)
+        return list(sync.friends)
+
+
+def _to_score(value: str | float | None) -> float | None:
+    if value is None or value == "":
+        return None
+    try:
+        score = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(score) else score
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+from collections.abc import Iterable
 from datetime import datetime
 from enum import StrEnum
-from typing import Any
+from functools import lru_cache
+from typing import Annotated, Any
 
-from pydantic import Field
+from pydantic import BeforeValidator, Field, create_model
 
 from pythonxbox.common.models import CamelCaseModel, PascalCaseModel
 
@@ -250,3 +252,59 @@ class PeopleResponse(CamelCaseModel):
     friend_finder_state: FriendFinderState | None = None
     account_link_details: list[LinkedAccount] | None = None
     friend_request_summary: FriendRequestSummary | None = None
+
+    @classmethod
+    def for_decorations(
+        cls, decoration_fields: Iterable[PeopleDecoration]
+    ) -> type[PeopleResponse]:
+        """
+        Get a response model specialised to the requested decorations
+
+        Nested :class:`Person` sections belonging to decorations that were not
+        requested are dropped and left as `None`, even if the service returns
+        them.
+
+        Args:
+            decoration_fields: Decorations used for the request
+
+        Returns: Subclass of :class:`PeopleResponse`
+        """
+        return _people_response_model(frozenset(map(str, decoration_fields)))
+
+
+# Nested Person fields that are only populated for a specific decoration
+PERSON_DECORATION_FIELDS: dict[PeopleDecoration, str] = {
+    PeopleDecoration.SUGGESTION: "suggestion",
+    PeopleDecoration.RECENT_PLAYER: "recent_player",
+    PeopleDecoration.FOLLOWER: "follower",
+    PeopleDecoration.PREFERRED_COLOR: "preferred_color",
+    PeopleDecoration.DETAIL: "detail",
+    PeopleDecoration.MULTIPLAYER_SUMMARY: "multiplayer_summary",
+    PeopleDecoration.PRESENCE_DETAIL: "presence_details",
+    PeopleDecoration.TITLE_PRESENCE: "title_presence",
+    PeopleDecoration.SOCIAL_MANAGER: "social_manager",
+    PeopleDecoration.AVATAR: "avatar",
+}
+
+
+# Discards the section without validating it
+_Dropped = Annotated[None, BeforeValidator(lambda _: None)]
+
+
+@lru_cache
+def _people_response_model(decorations: frozenset[str]) -> type[PeopleResponse]:
+    skipped: dict[str, Any] = {
+        field: (_Dropped, None)
+        for decoration, field in PERSON_DECORATION_FIELDS.items()
+        if decoration not in decorations
+    }
+    if not skipped:
+        return PeopleResponse
+
+    name = "".join(sorted(d[:1].upper() + d[1:] for d in decorations))
+    person_model = create_model(f"{name}Person", __base__=Person, **skipped)
+    return create_model(
+        f"{name}PeopleResponse",
+        __base__=PeopleResponse,
+        people=(list[person_model], ...),
+    )
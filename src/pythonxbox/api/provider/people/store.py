@@ -0,0 +1,307 @@
+"""
+Friend Store
+
+Compact, columnar in-memory storage for the friend lists of many users
+"""
+
+from array import array
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+from pythonxbox.api.provider.people.models import PeopleResponse, Person, PresenceDetail
+
+
+class StringTable:
+    """Interns repeated strings, columns store the integer code only"""
+
+    def __init__(self) -> None:
+        self._values: list[str] = []
+        self._codes: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def intern(self, value: str) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self._values)
+            self._codes[value] = code
+            self._values.append(value)
+        return code
+
+    def code(self, value: str) -> int | None:
+        return self._codes.get(value)
+
+    def value(self, code: int) -> str:
+        return self._values[code]
+
+
+class FriendRow:
+    """Lightweight view on a single row of a :class:`FriendStore`"""
+
+    __slots__ = ("_index", "_store")
+
+    def __init__(self, store: "FriendStore", index: int) -> None:
+        self._store = store
+        self._index = index
+
+    @property
+    def owner_xuid(self) -> int:
+        return self._store._owner_xuids[self._index]
+
+    @property
+    def xuid(self) -> int:
+        return self._store._xuids[self._index]
+
+    @property
+    def gamertag(self) -> str:
+        return self._store._gamertags[self._index]
+
+    @property
+    def gamerscore(self) -> int:
+        return self._store._gamerscores[self._index]
+
+    @property
+    def is_favorite(self) -> bool:
+        return bool(self._store._favorites[self._index])
+
+    @property
+    def presence_state(self) -> str:
+        return self._store._strings.value(self._store._presence_states[self._index])
+
+    @property
+    def device(self) -> str:
+        return self._store._strings.value(self._store._devices[self._index])
+
+    @property
+    def title_id(self) -> int:
+        return self._store._title_ids[self._index]
+
+    def __repr__(self) -> str:
+        return (
+            f"FriendRow(owner_xuid={self.owner_xuid}, xuid={self.xuid}, "
+            f"gamertag={self.gamertag!r}, presence_state={self.presence_state!r}, "
+            f"title_id={self.title_id})"
+        )
+
+
+class FriendStore:
+    """
+    Columnar storage for friend lists
+
+    XUIDs, gamerscores and title ids are kept in integer arrays, repeated
+    strings like presence state and device are interned. Rows are only
+    materialized as :class:`FriendRow` views on access.
+    """
+
+    def __init__(self) -> None:
+        self._strings = StringTable()
+        self._owner_counts: dict[int, int] = {}
+        self._owner_xuids = array("q")
+        self._xuids = array("q")
+        self._gamertags: list[str] = []
+        self._gamerscores = array("q")
+        self._favorites = bytearray()
+        self._presence_states = array("I")
+        self._devices = array("I")
+        self._title_ids = array("q")
+
+    @classmethod
+    def from_response(
+        cls, owner_xuid: int | str, response: PeopleResponse
+    ) -> "FriendStore":
+        """
+        Create store from a single friend list
+
+        Args:
+            owner_xuid: XUID of the user the friend list belongs to
+            response: Friend list
+
+        Returns: Friend store
+        """
+        store = cls()
+        store.add_response(owner_xuid, response)
+        return store
+
+    def __len__(self) -> int:
+        return len(self._xuids)
+
+    def __getitem__(self, index: int) -> FriendRow:
+        if not -len(self) <= index < len(self):
+            raise IndexError("FriendStore index out of range")
+        return FriendRow(self, index % len(self))
+
+    def __iter__(self) -> Iterator[FriendRow]:
+        return (FriendRow(self, i) for i in range(len(self)))
+
+    @property
+    def owners(self) -> set[int]:
+        """XUIDs of all users with a stored friend list"""
+        return set(self._owner_counts)
+
+    def add_response(self, owner_xuid: int | str, response: PeopleResponse) -> None:
+        """
+        Store friend list of a user, replacing a previously stored one
+
+        Args:
+            owner_xuid: XUID of the user the friend list belongs to
+            response: Friend list
+        """
+        owner = int(owner_xuid)
+        if owner in self._owner_counts:
+            self.discard_owner(owner)
+        for person in response.people:
+            self.add_person(owner, person)
+
+    def add_person(self, owner_xuid: int | str, person: Person) -> None:
+        """
+        Append a single friend
+
+        Args:
+            owner_xuid: XUID of the user the friend belongs to
+            person: Friend
+        """
+        owner = int(owner_xuid)
+        device, title_id = _primary_presence(person.presence_details)
+        self._owner_counts[owner] = self._owner_counts.get(owner, 0) + 1
+        self._owner_xuids.append(owner)
+        self._xuids.append(int(person.xuid))
+        self._gamertags.append(person.gamertag)
+        self._gamerscores.append(int(person.gamer_score or 0))
+        self._favorites.append(person.is_favorite)
+        self._presence_states.append(self._strings.intern(person.presence_state))
+        self._devices.append(self._strings.intern(device))
+        self._title_ids.append(title_id)
+
+    def discard_owner(self, owner_xuid: int | str) -> None:
+        """
+        Remove the stored friend list of a user
+
+        Args:
+            owner_xuid: XUID of the user
+        """
+        owner = int(owner_xuid)
+        if self._owner_counts.pop(owner, None) is None:
+            return
+        self._keep([i for i, o in enumerate(self._owner_xuids) if o != owner])
+
+    def rows(self, indices: Iterable[int]) -> list[FriendRow]:
+        """
+        Get row views for a list of row indices
+
+        Args:
+            indices: Row indices, e.g. returned by :meth:`filter`
+
+        Returns: List of row views
+        """
+        return [FriendRow(self, i) for i in indices]
+
+    def xuids(self, indices: Iterable[int] | None = None) -> array:
+        """
+        Get XUID column, optionally restricted to a list of row indices
+
+        Args:
+            indices: Row indices, e.g. returned by :meth:`filter`
+
+        Returns: XUIDs as int64 array
+        """
+        if indices is None:
+            return array("q", self._xuids)
+        return array("q", (self._xuids[i] for i in indices))
+
+    def filter(
+        self,
+        owner_xuid: int | str | None = None,
+        presence_state: str | None = None,
+        device: str | None = None,
+        title_id: int | str | None = None,
+    ) -> list[int]:
+        """
+        Get indices of rows matching all supplied criteria
+
+        Args:
+            owner_xuid: XUID of the friend list owner
+            presence_state: Presence state, e.g. 'Online'
+            device: Device of primary presence, e.g. 'Scarlett'
+            title_id: Title id of primary presence
+
+        Returns: Row indices
+        """
+        columns: list[tuple[Any, int]] = []
+        if owner_xuid is not None:
+            columns.append((self._owner_xuids, int(owner_xuid)))
+        for column, value in (
+            (self._presence_states, presence_state),
+            (self._devices, device),
+        ):
+            if value is None:
+                continue
+            code = self._strings.code(value)
+            if code is None:
+                return []
+            columns.append((column, code))
+        if title_id is not None:
+            columns.append((self._title_ids, int(title_id)))
+
+        indices: Iterable[int] = range(len(self))
+        for column, wanted in columns:
+            indices = [i for i in indices if column[i] == wanted]
+        return list(indices)
+
+    def group_by_title(self, owner_xuid: int | str | None = None) -> dict[int, array]:
+        """
+        Group friends by the title id of their primary presence
+
+        Args:
+            owner_xuid: Restrict to the friend list of a single user
+
+        Returns: Dict of title id to XUIDs, friends without title are omitted
+        """
+        owner = int(owner_xuid) if owner_xuid is not None else None
+        groups: dict[int, array] = {}
+        for i, title_id in enumerate(self._title_ids):
+            if not title_id or (owner is not None and self._owner_xuids[i] != owner):
+                continue
+            groups.setdefault(title_id, array("q")).append(self._xuids[i])
+        return groups
+
+    def owners_of(self, xuid: int | str) -> array:
+        """
+        Get all stored users that have the given user on their friend list
+
+        Args:
+            xuid: XUID of the friend
+
+        Returns: Owner XUIDs as int64 array
+        """
+        wanted = int(xuid)
+        return array(
+            "q",
+            (
+                o
+                for o, x in zip(self._owner_xuids, self._xuids, strict=True)
+                if x == wanted
+            ),
+        )
+
+    def _keep(self, indices: list[int]) -> None:
+        for name in (
+            "_owner_xuids",
+            "_xuids",
+            "_gamerscores",
+            "_presence_states",
+            "_devices",
+            "_title_ids",
+        ):
+            column: array = getattr(self, name)
+            setattr(self, name, array(column.typecode, (column[i] for i in indices)))
+        self._gamertags = [self._gamertags[i] for i in indices]
+        self._favorites = bytearray(self._favorites[i] for i in indices)
+
+
+def _primary_presence(details: list[PresenceDetail] | None) -> tuple[str, int]:
+    """Get device and title id of the primary, active presence detail"""
+    for detail in details or ():
+        if detail.is_primary and detail.state == "Active":
+            return detail.device, int(detail.title_id or 0)
+    return "", 0
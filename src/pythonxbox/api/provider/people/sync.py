@@ -0,0 +1,179 @@
+"""
+Friend List Sync
+
+Keep a local copy of a friend list up to date, only refetching the list
+when the cheap friend summary reports a change
+"""
+
+from dataclasses import dataclass, field
+import json
+import os
+from typing import TYPE_CHECKING, Any
+
+from pythonxbox.api.provider.people.models import (
+    PeopleDecoration,
+    PeopleResponse,
+    PeopleSummaryResponse,
+    Person,
+)
+
+if TYPE_CHECKING:
+    from pythonxbox.api.client import XboxLiveClient
+
+# Person fields compared to detect changed friends, presence is left out
+# on purpose as it changes without affecting the summary watermark
+DEFAULT_COMPARE_FIELDS = (
+    "gamertag",
+    "modern_gamertag",
+    "modern_gamertag_suffix",
+    "unique_modern_gamertag",
+    "display_name",
+    "real_name",
+    "display_pic_raw",
+    "gamer_score",
+    "xbox_one_rep",
+    "is_favorite",
+    "is_following_caller",
+    "is_followed_by_caller",
+)
+
+
+@dataclass
+class FriendListDiff:
+    added: list[Person] = field(default_factory=list)
+    removed: list[Person] = field(default_factory=list)
+    changed: list[Person] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+
+class FriendListSync:
+    """
+    Incremental friend list synchronisation
+
+    Each :meth:`sync` requests the friend summary first and only refetches
+    the full friend list when its watermark or counters changed.
+    """
+
+    def __init__(
+        self,
+        client: "XboxLiveClient",
+        xuid: str | None = None,
+        decoration_fields: list[PeopleDecoration] | None = None,
+        compare_fields: tuple[str, ...] = DEFAULT_COMPARE_FIELDS,
+        state_path: str | os.PathLike | None = None,
+    ) -> None:
+        """
+        Initialize friend list sync
+
+        Args:
+            client: Instance of XboxLiveClient
+            xuid: XUID of the user to sync, own friend list if omitted
+            decoration_fields: Decorations to request the friend list with
+            compare_fields: Person fields compared to detect changed friends
+            state_path: File to persist the stored friend list to
+        """
+        self.client = client
+        self.xuid = xuid
+        self.decoration_fields = decoration_fields
+        self.compare_fields = compare_fields
+        self.state_path = state_path
+
+        self.friends: dict[str, Person] = {}
+        self._summary_key: list[Any] | None = None
+        self._loaded = False
+
+    async def sync(self, force: bool = False) -> FriendListDiff | None:
+        """
+        Synchronise the stored friend list
+
+        Args:
+            force: Refetch the friend list regardless of the summary
+
+        Returns:
+            :class:`FriendListDiff` against the stored copy, `None` if the
+            summary reported no change and the list was not refetched
+        """
+        if not self._loaded:
+            self._load_state()
+
+        summary = await self._get_summary()
+        summary_key = self._get_summary_key(summary)
+        if not force and summary_key == self._summary_key:
+            return None
+
+        response = await self._get_friends()
+        diff = self.apply(response)
+        self._summary_key = summary_key
+        self._save_state(response)
+        return diff
+
+    def apply(self, response: PeopleResponse) -> FriendListDiff:
+        """
+        Replace the stored friend list, computing the difference
+
+        Args:
+            response: Current friend list
+
+        Returns: Difference against the previously stored friend list
+        """
+        current = {person.xuid: person for person in response.people}
+        diff = FriendListDiff(
+            added=[p for xuid, p in current.items() if xuid not in self.friends],
+            removed=[p for xuid, p in self.friends.items() if xuid not in current],
+            changed=[
+                p
+                for xuid, p in current.items()
+                if xuid in self.friends
+                and self._compare_key(p) != self._compare_key(self.friends[xuid])
+            ],
+        )
+        self.friends = current
+        return diff
+
+    async def _get_summary(self) -> PeopleSummaryResponse:
+        if self.xuid is None:
+            return await self.client.people.get_friends_summary_own()
+        return await self.client.people.get_friends_summary_by_xuid(self.xuid)
+
+    async def _get_friends(self) -> PeopleResponse:
+        if self.xuid is None:
+            return await self.client.people.get_friends_own(self.decoration_fields)
+        return await self.client.people.get_friends_by_xuid(
+            self.xuid, self.decoration_fields
+        )
+
+    @staticmethod
+    def _get_summary_key(summary: PeopleSummaryResponse) -> list[Any]:
+        return [
+            summary.watermark,
+            summary.recent_change_count,
+            summary.target_following_count,
+            summary.target_follower_count,
+        ]
+
+    def _compare_key(self, person: Person) -> tuple[Any, ...]:
+        return tuple(getattr(person, name) for name in self.compare_fields)
+
+    def _load_state(self) -> None:
+        self._loaded = True
+        if not (self.state_path and os.path.exists(self.state_path)):
+            return
+        with open(self.state_path) as f:
+            state = json.load(f)
+        self._summary_key = state["summary_key"]
+        response = PeopleResponse.model_validate(state["friends"])
+        self.friends = {person.xuid: person for person in response.people}
+
+    def _save_state(self, response: PeopleResponse) -> None:
+        if not self.state_path:
+            return
+        state = {
+            "summary_key": self._summary_key,
+            "friends": response.model_dump(mode="json", by_alias=True),
+        }
+        tmp_path = f"{os.fspath(self.state_path)}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.state_path)
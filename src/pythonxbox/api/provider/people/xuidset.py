@@ -0,0 +1,269 @@
+"""
+XUID Sets
+
+Friend lists as sorted int64 arrays with set operations, e.g. for mutual
+friends or friend overlap between groups of users
+"""
+
+from array import array
+from bisect import bisect_left
+from collections.abc import Hashable, Iterable, Iterator, Mapping
+from functools import cache
+import heapq
+from types import ModuleType
+from typing import TypeVar, overload
+
+from pythonxbox.api.provider.people.models import PeopleResponse
+
+K = TypeVar("K", bound=Hashable)
+
+
+class XuidSet:
+    """
+    Immutable, sorted set of XUIDs backed by an int64 array
+
+    Set operations merge the sorted arrays, vectorized with NumPy if it is
+    installed, and return new sorted :class:`XuidSet` instances.
+    """
+
+    __slots__ = ("_xuids",)
+
+    def __init__(self, xuids: Iterable[int | str] = ()) -> None:
+        """
+        Initialize XUID set
+
+        Args:
+            xuids: XUIDs, duplicates are removed
+        """
+        self._xuids = array("q", sorted({int(x) for x in xuids}))
+
+    @classmethod
+    def _from_sorted(cls, xuids: array) -> "XuidSet":
+        xuid_set = cls.__new__(cls)
+        xuid_set._xuids = xuids
+        return xuid_set
+
+    @classmethod
+    def from_response(cls, response: PeopleResponse) -> "XuidSet":
+        """
+        Create set from the people of a response, e.g. a friend list
+
+        Args:
+            response: People response
+
+        Returns: XUID set
+        """
+        return cls(person.xuid for person in response.people)
+
+    def __len__(self) -> int:
+        return len(self._xuids)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._xuids)
+
+    @overload
+    def __getitem__(self, index: int) -> int: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "XuidSet": ...
+
+    def __getitem__(self, index: int | slice) -> "int | XuidSet":
+        if isinstance(index, slice):
+            if index.step is not None and index.step < 0:
+                raise ValueError("XuidSet slices must be ascending")
+            return self._from_sorted(self._xuids[index])
+        return self._xuids[index]
+
+    def __contains__(self, xuid: object) -> bool:
+        if not isinstance(xuid, int | str):
+            return False
+        try:
+            value = int(xuid)
+        except ValueError:
+            return False
+        i = bisect_left(self._xuids, value)
+        return i < len(self._xuids) and self._xuids[i] == value
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, XuidSet):
+            return NotImplemented
+        return self._xuids == other._xuids
+
+    def __hash__(self) -> int:
+        return hash(self._xuids.tobytes())
+
+    def __repr__(self) -> str:
+        return f"XuidSet({self._xuids.tolist()})"
+
+    def __and__(self, other: "XuidSet") -> "XuidSet":
+        return self.intersection(other)
+
+    def __or__(self, other: "XuidSet") -> "XuidSet":
+        return self.union(other)
+
+    def __sub__(self, other: "XuidSet") -> "XuidSet":
+        return self.difference(other)
+
+    def to_array(self) -> array:
+        """
+        Get a copy of the underlying int64 array
+
+        Returns: Sorted XUIDs
+        """
+        return array("q", self._xuids)
+
+    def intersection(self, *others: "XuidSet") -> "XuidSet":
+        """
+        XUIDs contained in this and all other sets
+
+        Args:
+            others: Other sets
+
+        Returns: XUID set
+        """
+        result = self._xuids
+        for other in sorted(others, key=len):
+            result = _intersect(result, other._xuids)
+        return self._from_sorted(result)
+
+    def union(self, *others: "XuidSet") -> "XuidSet":
+        """
+        XUIDs contained in any of the sets
+
+        Args:
+            others: Other sets
+
+        Returns: XUID set
+        """
+        result = self._xuids
+        for other in others:
+            result = _union(result, other._xuids)
+        return self._from_sorted(result)
+
+    def difference(self, *others: "XuidSet") -> "XuidSet":
+        """
+        XUIDs contained in this, but none of the other sets
+
+        Args:
+            others: Other sets
+
+        Returns: XUID set
+        """
+        result = self._xuids
+        for other in others:
+            result = _difference(result, other._xuids)
+        return self._from_sorted(result)
+
+    def overlap(self, other: "XuidSet") -> int:
+        """
+        Number of XUIDs contained in both sets
+
+        Args:
+            other: Other set
+
+        Returns: Size of intersection
+        """
+        return len(_intersect(self._xuids, other._xuids))
+
+
+def mutual_friends(
+    friends_a: XuidSet | PeopleResponse, friends_b: XuidSet | PeopleResponse
+) -> XuidSet:
+    """
+    Get friends that two users have in common
+
+    Args:
+        friends_a: Friend list of the first user
+        friends_b: Friend list of the second user
+
+    Returns: XUID set of mutual friends
+    """
+    return _as_xuid_set(friends_a) & _as_xuid_set(friends_b)
+
+
+def top_k_overlap(
+    query: XuidSet | PeopleResponse,
+    candidates: Mapping[K, XuidSet],
+    k: int = 10,
+) -> list[tuple[K, int]]:
+    """
+    Get the candidates sharing the most XUIDs with the query set
+
+    E.g. the users with the most mutual friends, or the groups with the
+    largest overlap with a friend list.
+
+    Args:
+        query: XUID set to compare against
+        candidates: XUID sets to rank, keyed by an arbitrary identifier
+        k: Number of results
+
+    Returns: Up to `k` tuples of candidate key and overlap, largest first
+    """
+    query_set = _as_xuid_set(query)
+    overlaps = ((key, query_set.overlap(xuids)) for key, xuids in candidates.items())
+    return heapq.nlargest(k, overlaps, key=lambda item: item[1])
+
+
+def _as_xuid_set(xuids: XuidSet | PeopleResponse) -> XuidSet:
+    if isinstance(xuids, PeopleResponse):
+        return XuidSet.from_response(xuids)
+    return xuids
+
+
+@cache
+def _numpy() -> ModuleType | None:
+    try:
+        import numpy as np
+    except ImportError:
+        return None
+    return np
+
+
+def _intersect(a: array, b: array) -> array:
+    np = _numpy()
+    if np is not None:
+        result = np.intersect1d(
+            np.frombuffer(a, np.int64), np.frombuffer(b, np.int64), assume_unique=True
+        )
+        return array("q", result.tobytes())
+    result = array("q")
+    i = j = 0
+    while i < len(a) and j < len(b):
+        if a[i] < b[j]:
+            i += 1
+        elif a[i] > b[j]:
+            j += 1
+        else:
+            result.append(a[i])
+            i += 1
+            j += 1
+    return result
+
+
+def _union(a: array, b: array) -> array:
+    np = _numpy()
+    if np is not None:
+        result = np.union1d(np.frombuffer(a, np.int64), np.frombuffer(b, np.int64))
+        return array("q", result.tobytes())
+    result = array("q")
+    for x in heapq.merge(a, b):
+        if not result or result[-1] != x:
+            result.append(x)
+    return result
+
+
+def _difference(a: array, b: array) -> array:
+    np = _numpy()
+    if np is not None:
+        result = np.setdiff1d(
+            np.frombuffer(a, np.int64), np.frombuffer(b, np.int64), assume_unique=True
+        )
+        return array("q", result.tobytes())
+    result = array("q")
+    j = 0
+    for x in a:
+        while j < len(b) and b[j] < x:
+            j += 1
+        if j == len(b) or b[j] != x:
+            result.append(x)
+    return result
@@ -2,8 +2,9 @@
 Presence - Get online status of friends
 """
 
+from collections.abc import Iterable
 from http import HTTPStatus
-from typing import ClassVar
+from typing import TYPE_CHECKING, ClassVar
 
 from pythonxbox.api.provider.baseprovider import BaseProvider
 from pythonxbox.api.provider.presence.models import (
@@ -13,6 +14,9 @@ from pythonxbox.api.provider.presence.models import (
     PresenceState,
 )
 
+if TYPE_CHECKING:
+    from pythonxbox.api.provider.presence.titleindex import TitleIndex
+
 
 class PresenceProvider(BaseProvider):
     PRESENCE_URL = "https://userpresence.xboxlive.com"
@@ -20,6 +24,10 @@ class PresenceProvider(BaseProvider):
         "x-xbl-contract-version": "3",
         "Accept": "application/json",
     }
+    MAX_BATCH_XUIDS = 1100
+
+    # Updated from all presence responses, see TitleIndex.attach
+    title_index: "TitleIndex | None" = None
 
     async def get_presence(
         self,
@@ -43,7 +51,9 @@ class PresenceProvider(BaseProvider):
             url, headers=self.HEADERS_PRESENCE, **kwargs
         )
         resp.raise_for_status()
-        return PresenceItem.model_validate_json(resp.text)
+        item = PresenceItem.model_validate_json(resp.text)
+        self._index([item])
+        return item
 
     async def get_presence_batch(
         self,
@@ -62,9 +72,7 @@ class PresenceProvider(BaseProvider):
 
         Returns: List[:class:`PresenceItem`]: List of presence items
         """
-        MAX_XUIDS = 1100
-
-        if len(xuids) > MAX_XUIDS:
+        if len(xuids) > self.MAX_BATCH_XUIDS:
             raise Exception("Xuid list length is > 1100")
 
         url = self.PRESENCE_URL + "/users/batch"
@@ -78,6 +86,7 @@ class PresenceProvider(BaseProvider):
         )
         resp.raise_for_status()
         parsed = PresenceBatchResponse.model_validate_json(resp.text)
+        self._index(parsed.root)
         return parsed.root
 
     async def get_presence_own(
@@ -98,7 +107,9 @@ class PresenceProvider(BaseProvider):
             url, params=params, headers=self.HEADERS_PRESENCE, **kwargs
         )
         resp.raise_for_status()
-        return PresenceItem.model_validate_json(resp.text)
+        item = PresenceItem.model_validate_json(resp.text)
+        self._index([item])
+        return item
 
     async def set_presence_own(self, presence_state: PresenceState, **kwargs) -> bool:
         """
@@ -116,3 +127,7 @@ class PresenceProvider(BaseProvider):
             url, json=data, headers=self.HEADERS_PRESENCE, **kwargs
         )
         return resp.status_code == HTTPStatus.OK
+
+    def _index(self, items: Iterable[PresenceItem]) -> None:
+        if self.title_index is not None:
+            self.title_index.add_presence(items)
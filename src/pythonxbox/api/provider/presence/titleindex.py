@@ -0,0 +1,184 @@
+"""
+Title Index
+
+Which tracked users are currently playing which title, maintained from the
+presence and people responses passing through the client
+"""
+
+from collections.abc import Iterable
+import heapq
+from typing import TYPE_CHECKING
+
+from pythonxbox.api.provider.people.models import PeopleResponse, Person
+from pythonxbox.api.provider.presence.models import PresenceItem
+from pythonxbox.api.provider.presence.watcher import get_title_ids, is_online
+
+if TYPE_CHECKING:
+    from pythonxbox.api.client import XboxLiveClient
+
+_EMPTY: frozenset[str] = frozenset()
+
+
+class TitleIndex:
+    """
+    In-memory index of title id -> XUIDs and XUID -> title ids
+
+    Attach the index to a client to keep it updated from
+    `get_presence*` responses and from people responses requested with the
+    `PRESENCE_DETAIL` decoration. Each update replaces the titles of a user.
+    """
+
+    def __init__(self) -> None:
+        self._players: dict[str, set[str]] = {}
+        self._titles: dict[str, frozenset[str]] = {}
+
+    def __len__(self) -> int:
+        """Number of users currently present in any title"""
+        return len(self._titles)
+
+    def attach(self, client: "XboxLiveClient") -> None:
+        """
+        Update the index from all presence and people responses of a client
+
+        Args:
+            client: Instance of XboxLiveClient
+        """
+        client.presence.title_index = self
+        client.people.title_index = self
+
+    def detach(self, client: "XboxLiveClient") -> None:
+        """
+        Stop updating the index from responses of a client
+
+        Args:
+            client: Instance of XboxLiveClient
+        """
+        client.presence.title_index = None
+        client.people.title_index = None
+
+    def update(self, xuid: str, title_ids: Iterable[str]) -> None:
+        """
+        Set the titles a user is currently present in
+
+        Args:
+            xuid: XUID
+            title_ids: Title ids, empty if the user is offline
+        """
+        new = frozenset(title_ids)
+        old = self._titles.get(xuid, _EMPTY)
+        if new == old:
+            return
+        for title_id in old - new:
+            players = self._players[title_id]
+            players.discard(xuid)
+            if not players:
+                del self._players[title_id]
+        for title_id in new - old:
+            self._players.setdefault(title_id, set()).add(xuid)
+        if new:
+            self._titles[xuid] = new
+        else:
+            self._titles.pop(xuid, None)
+
+    def remove(self, xuid: str) -> None:
+        """
+        Remove a user from the index
+
+        Args:
+            xuid: XUID
+        """
+        self.update(xuid, ())
+
+    def add_presence(self, items: Iterable[PresenceItem]) -> None:
+        """
+        Update the index from presence items
+
+        Online users without title information (requested with a presence
+        level below `PresenceLevel.TITLE`) are skipped.
+
+        Args:
+            items: Presence items, e.g. from `get_presence_batch`
+        """
+        for item in items:
+            if not is_online(item):
+                self.update(item.xuid, ())
+            elif _has_titles(item):
+                self.update(item.xuid, get_title_ids(item))
+
+    def add_people(self, response: PeopleResponse) -> None:
+        """
+        Update the index from a people response
+
+        People without presence details (the `PRESENCE_DETAIL` decoration was
+        not requested) are skipped.
+
+        Args:
+            response: People response, e.g. a friend list
+        """
+        for person in response.people:
+            title_ids = _active_title_ids(person)
+            if title_ids is not None:
+                self.update(person.xuid, title_ids)
+
+    def players(self, title_id: str) -> frozenset[str]:
+        """
+        Users currently present in a title
+
+        Args:
+            title_id: Title id
+
+        Returns: Snapshot of the XUIDs
+        """
+        return frozenset(self._players.get(title_id, _EMPTY))
+
+    def player_count(self, title_id: str) -> int:
+        """
+        Number of users currently present in a title
+
+        Args:
+            title_id: Title id
+
+        Returns: Number of users
+        """
+        return len(self._players.get(title_id, _EMPTY))
+
+    def titles(self, xuid: str) -> frozenset[str]:
+        """
+        Titles a user is currently present in
+
+        Args:
+            xuid: XUID
+
+        Returns: Title ids, empty if offline or unknown
+        """
+        return self._titles.get(xuid, _EMPTY)
+
+    def top_titles(self, n: int = 10) -> list[tuple[str, int]]:
+        """
+        Titles with the most users currently present
+
+        Args:
+            n: Number of titles
+
+        Returns: Up to `n` tuples of title id and player count, largest first
+        """
+        counts = ((title_id, len(xuids)) for title_id, xuids in self._players.items())
+        return heapq.nlargest(n, counts, key=lambda item: item[1])
+
+
+def _has_titles(item: PresenceItem) -> bool:
+    return item.devices is not None and all(
+        device.titles is not None for device in item.devices
+    )
+
+
+def _active_title_ids(person: Person) -> list[str] | None:
+    if person.presence_details is None:
+        return None
+    if person.presence_state.lower() == "offline":
+        return []
+    return [
+        detail.title_id
+        for detail in person.presence_details
+        if detail.state == "Active" and detail.title_id
+    ]
@@ -0,0 +1,215 @@
+"""
+Presence Watcher
+
+Poll presence of many users and emit state transitions only
+"""
+
+import asyncio
+from collections.abc import AsyncIterator, Iterable
+from dataclasses import dataclass
+from enum import StrEnum
+import time
+from typing import TYPE_CHECKING
+
+from pythonxbox.api.provider.presence.models import PresenceItem, PresenceLevel
+from pythonxbox.common.concurrency import chunked
+
+if TYPE_CHECKING:
+    from pythonxbox.api.client import XboxLiveClient
+
+
+class PresenceChange(StrEnum):
+    ONLINE = "online"
+    OFFLINE = "offline"
+    TITLE = "title"
+    DEVICE = "device"
+
+
+@dataclass
+class PresenceEvent:
+    xuid: str
+    changes: set[PresenceChange]
+    previous: PresenceItem | None
+    current: PresenceItem
+
+
+def is_online(item: PresenceItem) -> bool:
+    return item.state.lower() != "offline"
+
+
+def get_title_ids(item: PresenceItem) -> set[str]:
+    """Title ids of all titles a user is currently present in"""
+    return {
+        title.id
+        for device in item.devices or []
+        for title in device.titles or []
+        if title.id
+    }
+
+
+def get_device_types(item: PresenceItem) -> set[str]:
+    """Types of all devices a user is currently present on"""
+    return {device.type for device in item.devices or [] if device.type}
+
+
+def get_changes(
+    previous: PresenceItem | None, current: PresenceItem
+) -> set[PresenceChange]:
+    """
+    Compare two presence items of the same user
+
+    Args:
+        previous: Previous presence, `None` if unknown
+        current: Current presence
+
+    Returns: Set of changes, empty if nothing relevant changed
+    """
+    if previous is None:
+        return {PresenceChange.ONLINE} if is_online(current) else set()
+
+    changes: set[PresenceChange] = set()
+    if is_online(previous) != is_online(current):
+        changes.add(
+            PresenceChange.ONLINE if is_online(current) else PresenceChange.OFFLINE
+        )
+    if get_title_ids(previous) != get_title_ids(current):
+        changes.add(PresenceChange.TITLE)
+    if get_device_types(previous) != get_device_types(current):
+        changes.add(PresenceChange.DEVICE)
+    return changes
+
+
+class PresenceWatcher:
+    """
+    Poll presence of tracked users with adaptive intervals
+
+    Users are polled in batches of at most
+    :attr:`PresenceProvider.MAX_BATCH_XUIDS`. A user's poll interval is reset
+    to `min_interval` after a change and grows by `backoff` after every
+    unchanged poll, up to `max_interval`.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        client: "XboxLiveClient",
+        xuids: Iterable[str] = (),
+        *,
+        min_interval: float = 30,
+        max_interval: float = 600,
+        backoff: float = 2,
+        presence_level: PresenceLevel = PresenceLevel.ALL,
+    ) -> None:
+        """
+        Initialize presence watcher
+
+        Args:
+            client: Instance of XboxLiveClient
+            xuids: XUIDs to track
+            min_interval: Poll interval in seconds after a change
+            max_interval: Maximum poll interval in seconds
+            backoff: Interval growth factor for unchanged polls
+            presence_level: Presence detail level to request
+        """
+        self.client = client
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.presence_level = presence_level
+
+        self.presence: dict[str, PresenceItem] = {}
+        self._intervals: dict[str, float] = {}
+        self._next_poll: dict[str, float] = {}
+        self.track(xuids)
+
+    def track(self, xuids: Iterable[str]) -> None:
+        """
+        Start tracking users, they are polled on the next cycle
+
+        Args:
+            xuids: XUIDs to track
+        """
+        now = time.monotonic()
+        for xuid in xuids:
+            self._intervals.setdefault(xuid, self.min_interval)
+            self._next_poll.setdefault(xuid, now)
+
+    def untrack(self, xuids: Iterable[str]) -> None:
+        """
+        Stop tracking users
+
+        Args:
+            xuids: XUIDs to stop tracking
+        """
+        for xuid in xuids:
+            self._intervals.pop(xuid, None)
+            self._next_poll.pop(xuid, None)
+            self.presence.pop(xuid, None)
+
+    def get_interval(self, xuid: str) -> float:
+        """
+        Current poll interval of a tracked user
+
+        Args:
+            xuid: XUID
+
+        Returns: Interval in seconds
+        """
+        return self._intervals[xuid]
+
+    async def poll(self, force: bool = False) -> list[PresenceEvent]:
+        """
+        Poll all users that are due
+
+        The first poll of a user that is online emits an `ONLINE` event.
+
+        Args:
+            force: Poll all tracked users, regardless of their interval
+
+        Returns: Events of users whose presence changed
+        """
+        now = time.monotonic()
+        due = [xuid for xuid, at in self._next_poll.items() if force or at <= now]
+        events: list[PresenceEvent] = []
+        for chunk in chunked(due, self.client.presence.MAX_BATCH_XUIDS):
+            items = await self.client.presence.get_presence_batch(
+                list(chunk), presence_level=self.presence_level
+            )
+            received = {item.xuid: item for item in items}
+            for xuid in chunk:
+                if xuid not in self._next_poll:
+                    continue  # untracked while polling
+                item = received.get(xuid)
+                event = self._update(xuid, item) if item is not None else None
+                self._next_poll[xuid] = time.monotonic() + self._intervals[xuid]
+                if event:
+                    events.append(event)
+        return events
+
+    async def watch(self) -> AsyncIterator[PresenceEvent]:
+        """
+        Poll continuously
+
+        Yields: :class:`PresenceEvent` for every presence transition
+        """
+        while True:
+            for event in await self.poll():
+                yield event
+            if self._next_poll:
+                delay = min(self._next_poll.values()) - time.monotonic()
+            else:
+                delay = self.min_interval
+            await asyncio.sleep(max(delay, 0))
+
+    def _update(self, xuid: str, item: PresenceItem) -> PresenceEvent | None:
+        previous = self.presence.get(xuid)
+        self.presence[xuid] = item
+        changes = get_changes(previous, item)
+        if previous is None or changes:
+            self._intervals[xuid] = self.min_interval
+        else:
+            self._intervals[xuid] = min(
+                self._intervals[xuid] * self.backoff, self.max_interval
+            )
+        if not changes:
+            return None
+        return PresenceEvent(xuid, changes, previous, item)
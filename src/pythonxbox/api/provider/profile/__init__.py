@@ -4,9 +4,14 @@ Profile
 Get Userprofiles by XUID or Gamertag
 """
 
+from collections.abc import Sequence
 from typing import ClassVar
 
-from pythonxbox.api.provider.profile.models import ProfileResponse, ProfileSettings
+from pythonxbox.api.provider.profile.models import (
+    ProfileResponse,
+    ProfileSettings,
+    ProfileSettingsPreset,
+)
 from pythonxbox.api.provider.ratelimitedprovider import RateLimitedProvider
 
 
@@ -17,35 +22,29 @@ class ProfileProvider(RateLimitedProvider):
 
     RATE_LIMITS: ClassVar = {"burst": 10, "sustain": 30}
 
-    async def get_profiles(self, xuid_list: list[str], **kwargs) -> ProfileResponse:
+    MAX_BATCH_XUIDS = 100
+
+    async def get_profiles(
+        self,
+        xuid_list: list[str],
+        settings: Sequence[ProfileSettings] | None = None,
+        **kwargs,
+    ) -> ProfileResponse:
         """
         Get profile info for list of xuids
 
         Args:
             xuid_list (list): List of xuids
+            settings (list): List of profile settings to request,
+                see :class:`ProfileSettingsPreset` for predefined lists
 
         Returns:
             :class:`ProfileResponse`: Profile Response
         """
-        post_data = {
-            "settings": [
-                ProfileSettings.GAME_DISPLAY_NAME,
-                ProfileSettings.APP_DISPLAY_NAME,
-                ProfileSettings.APP_DISPLAYPIC_RAW,
-                ProfileSettings.GAMERSCORE,
-                ProfileSettings.GAMERTAG,
-                ProfileSettings.GAME_DISPLAYPIC_RAW,
-                ProfileSettings.ACCOUNT_TIER,
-                ProfileSettings.TENURE_LEVEL,
-                ProfileSettings.XBOX_ONE_REP,
-                ProfileSettings.PREFERRED_COLOR,
-                ProfileSettings.LOCATION,
-                ProfileSettings.BIOGRAPHY,
-                ProfileSettings.WATERMARKS,
-                ProfileSettings.REAL_NAME,
-            ],
-            "userIds": xuid_list,
-        }
+        if not settings:
+            settings = ProfileSettingsPreset.BATCH
+
+        post_data = {"settings": list(settings), "userIds": xuid_list}
         url = self.PROFILE_URL + "/users/batch/profile/settings"
         resp = await self.client.session.post(
             url,
@@ -57,80 +56,52 @@ class ProfileProvider(RateLimitedProvider):
         resp.raise_for_status()
         return ProfileResponse.model_validate_json(resp.text)
 
-    async def get_profile_by_xuid(self, target_xuid: str, **kwargs) -> ProfileResponse:
+    async def get_profile_by_xuid(
+        self,
+        target_xuid: str,
+        settings: Sequence[ProfileSettings] | None = None,
+        **kwargs,
+    ) -> ProfileResponse:
         """
         Get Userprofile by xuid
 
         Args:
             target_xuid: XUID to get profile for
+            settings: List of profile settings to request,
+                see :class:`ProfileSettingsPreset` for predefined lists
 
         Returns:
             :class:`ProfileResponse`: Profile Response
         """
-        url = self.PROFILE_URL + f"/users/xuid({target_xuid})/profile/settings"
-        params = {
-            "settings": self.SEPARATOR.join(
-                [
-                    ProfileSettings.GAMERTAG,
-                    ProfileSettings.MODERN_GAMERTAG,
-                    ProfileSettings.MODERN_GAMERTAG_SUFFIX,
-                    ProfileSettings.UNIQUE_MODERN_GAMERTAG,
-                    ProfileSettings.REAL_NAME_OVERRIDE,
-                    ProfileSettings.BIOGRAPHY,
-                    ProfileSettings.LOCATION,
-                    ProfileSettings.GAMERSCORE,
-                    ProfileSettings.GAME_DISPLAYPIC_RAW,
-                    ProfileSettings.TENURE_LEVEL,
-                    ProfileSettings.ACCOUNT_TIER,
-                    ProfileSettings.XBOX_ONE_REP,
-                    ProfileSettings.PREFERRED_COLOR,
-                    ProfileSettings.WATERMARKS,
-                    ProfileSettings.IS_QUARANTINED,
-                ]
-            )
-        }
-        resp = await self.client.session.get(
-            url,
-            params=params,
-            headers=self.HEADERS_PROFILE,
-            rate_limits=self.rate_limit_read,
-            **kwargs,
-        )
-        resp.raise_for_status()
-        return ProfileResponse.model_validate_json(resp.text)
+        return await self._get_profile(f"xuid({target_xuid})", settings, **kwargs)
 
-    async def get_profile_by_gamertag(self, gamertag: str, **kwargs) -> ProfileResponse:
+    async def get_profile_by_gamertag(
+        self,
+        gamertag: str,
+        settings: Sequence[ProfileSettings] | None = None,
+        **kwargs,
+    ) -> ProfileResponse:
         """
         Get Userprofile by gamertag
 
         Args:
             gamertag: Gamertag to get profile for
+            settings: List of profile settings to request,
+                see :class:`ProfileSettingsPreset` for predefined lists
 
         Returns:
             :class:`ProfileResponse`: Profile Response
         """
-        url = self.PROFILE_URL + f"/users/gt({gamertag})/profile/settings"
-        params = {
-            "settings": self.SEPARATOR.join(
-                [
-                    ProfileSettings.GAMERTAG,
-                    ProfileSettings.MODERN_GAMERTAG,
-                    ProfileSettings.MODERN_GAMERTAG_SUFFIX,
-                    ProfileSettings.UNIQUE_MODERN_GAMERTAG,
-                    ProfileSettings.REAL_NAME_OVERRIDE,
-                    ProfileSettings.BIOGRAPHY,
-                    ProfileSettings.LOCATION,
-                    ProfileSettings.GAMERSCORE,
-                    ProfileSettings.GAME_DISPLAYPIC_RAW,
-                    ProfileSettings.TENURE_LEVEL,
-                    ProfileSettings.ACCOUNT_TIER,
-                    ProfileSettings.XBOX_ONE_REP,
-                    ProfileSettings.PREFERRED_COLOR,
-                    ProfileSettings.WATERMARKS,
-                    ProfileSettings.IS_QUARANTINED,
-                ]
-            )
-        }
+        return await self._get_profile(f"gt({gamertag})", settings, **kwargs)
+
+    async def _get_profile(
+        self, moniker: str, settings: Sequence[ProfileSettings] | None = None, **kwargs
+    ) -> ProfileResponse:
+        if not settings:
+            settings = ProfileSettingsPreset.FULL
+
+        url = self.PROFILE_URL + f"/users/{moniker}/profile/settings"
+        params = {"settings": self.SEPARATOR.join(settings)}
         resp = await self.client.session.get(
             url,
             params=params,
@@ -1,4 +1,5 @@
 from enum import StrEnum
+from typing import ClassVar
 
 from pythonxbox.common.models import CamelCaseModel
 
@@ -31,6 +32,58 @@ class ProfileSettings(StrEnum):
     IS_QUARANTINED = "IsQuarantined"
 
 
+class ProfileSettingsPreset:
+    """
+    Predefined tuples of :class:`ProfileSettings`, used as parameter for Profile API
+    """
+
+    MINIMAL: ClassVar[tuple[ProfileSettings, ...]] = (
+        ProfileSettings.GAMERTAG,
+        ProfileSettings.GAMERSCORE,
+    )
+    BASIC: ClassVar[tuple[ProfileSettings, ...]] = (
+        ProfileSettings.GAMERTAG,
+        ProfileSettings.MODERN_GAMERTAG,
+        ProfileSettings.MODERN_GAMERTAG_SUFFIX,
+        ProfileSettings.UNIQUE_MODERN_GAMERTAG,
+        ProfileSettings.GAMERSCORE,
+        ProfileSettings.GAME_DISPLAYPIC_RAW,
+    )
+    BATCH: ClassVar[tuple[ProfileSettings, ...]] = (
+        ProfileSettings.GAME_DISPLAY_NAME,
+        ProfileSettings.APP_DISPLAY_NAME,
+        ProfileSettings.APP_DISPLAYPIC_RAW,
+        ProfileSettings.GAMERSCORE,
+        ProfileSettings.GAMERTAG,
+        ProfileSettings.GAME_DISPLAYPIC_RAW,
+        ProfileSettings.ACCOUNT_TIER,
+        ProfileSettings.TENURE_LEVEL,
+        ProfileSettings.XBOX_ONE_REP,
+        ProfileSettings.PREFERRED_COLOR,
+        ProfileSettings.LOCATION,
+        ProfileSettings.BIOGRAPHY,
+        ProfileSettings.WATERMARKS,
+        ProfileSettings.REAL_NAME,
+    )
+    FULL: ClassVar[tuple[ProfileSettings, ...]] = (
+        ProfileSettings.GAMERTAG,
+        ProfileSettings.MODERN_GAMERTAG,
+        ProfileSettings.MODERN_GAMERTAG_SUFFIX,
+        ProfileSettings.UNIQUE_MODERN_GAMERTAG,
+        ProfileSettings.REAL_NAME_OVERRIDE,
+        ProfileSettings.BIOGRAPHY,
+        ProfileSettings.LOCATION,
+        ProfileSettings.GAMERSCORE,
+        ProfileSettings.GAME_DISPLAYPIC_RAW,
+        ProfileSettings.TENURE_LEVEL,
+        ProfileSettings.ACCOUNT_TIER,
+        ProfileSettings.XBOX_ONE_REP,
+        ProfileSettings.PREFERRED_COLOR,
+        ProfileSettings.WATERMARKS,
+        ProfileSettings.IS_QUARANTINED,
+    )
+
+
 class Setting(CamelCaseModel):
     id: str
     value: str
@@ -42,6 +95,29 @@ class ProfileUser(CamelCaseModel):
     settings: list[Setting]
     is_sponsored_user: bool
 
+    def get_setting(self, setting: ProfileSettings | str) -> str | None:
+        """
+        Get the value of a single setting
+
+        Args:
+            setting: Setting to look up
+
+        Returns: Setting value or `None` if the setting was not requested
+        """
+        for item in self.settings:
+            if item.id == setting:
+                return item.value
+        return None
+
+    @property
+    def settings_dict(self) -> dict[str, str]:
+        """
+        Settings as dict, keyed by setting id
+
+        Returns: Dict of setting id to value
+        """
+        return {item.id: item.value for item in self.settings}
+
 
 class ProfileResponse(CamelCaseModel):
     profile_users: list[ProfileUser]
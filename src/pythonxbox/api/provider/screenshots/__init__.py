@@ -2,10 +2,12 @@
 Screenshots - Get screenshot info
 """
 
+from collections.abc import AsyncIterator
 from typing import ClassVar
 
 from pythonxbox.api.provider.baseprovider import BaseProvider
-from pythonxbox.api.provider.screenshots.models import ScreenshotResponse
+from pythonxbox.api.provider.screenshots.models import Screenshot, ScreenshotResponse
+from pythonxbox.common.paging import iterate_offset
 
 
 class ScreenshotsProvider(BaseProvider):
@@ -175,3 +177,133 @@ class ScreenshotsProvider(BaseProvider):
         )
         resp.raise_for_status()
         return ScreenshotResponse.model_validate_json(resp.text)
+
+    def iter_recent_own_screenshots(
+        self,
+        title_id: str | None = None,
+        page_size: int = 25,
+        prefetch: int = 1,
+        max_items: int | None = None,
+        **kwargs,
+    ) -> AsyncIterator[Screenshot]:
+        """
+        Iterate own recent screenshots, optionally filter for title Id, following pages
+
+        Args:
+            title_id: Optional title id filter
+            page_size: Item count to load per page
+            prefetch: Number of pages requested ahead
+            max_items: Stop after this many screenshots
+
+        Returns:
+            Async iterator of :class:`Screenshot`
+        """
+        return iterate_offset(
+            self.get_recent_own_screenshots,
+            lambda resp: resp.screenshots,
+            page_size=page_size,
+            prefetch=prefetch,
+            max_items=max_items,
+            is_last=lambda resp: not resp.paging_info.continuation_token,
+            title_id=title_id,
+            **kwargs,
+        )
+
+    def iter_recent_screenshots_by_xuid(
+        self,
+        xuid: str,
+        title_id: str | None = None,
+        page_size: int = 25,
+        prefetch: int = 1,
+        max_items: int | None = None,
+        **kwargs,
+    ) -> AsyncIterator[Screenshot]:
+        """
+        Iterate recent screenshots by XUID, optionally filter for title Id, following pages
+
+        Args:
+            xuid: XUID of user to get screenshots from
+            title_id: Optional title id filter
+            page_size: Item count to load per page
+            prefetch: Number of pages requested ahead
+            max_items: Stop after this many screenshots
+
+        Returns:
+            Async iterator of :class:`Screenshot`
+        """
+        return iterate_offset(
+            self.get_recent_screenshots_by_xuid,
+            lambda resp: resp.screenshots,
+            page_size=page_size,
+            prefetch=prefetch,
+            max_items=max_items,
+            is_last=lambda resp: not resp.paging_info.continuation_token,
+            xuid=xuid,
+            title_id=title_id,
+            **kwargs,
+        )
+
+    def iter_saved_own_screenshots(
+        self,
+        title_id: str | None = None,
+        page_size: int = 25,
+        prefetch: int = 1,
+        max_items: int | None = None,
+        **kwargs,
+    ) -> AsyncIterator[Screenshot]:
+        """
+        Iterate own saved screenshots, optionally filter for title Id, following pages
+
+        Args:
+            title_id: Optional title id filter
+            page_size: Item count to load per page
+            prefetch: Number of pages requested ahead
+            max_items: Stop after this many screenshots
+
+        Returns:
+            Async iterator of :class:`Screenshot`
+        """
+        return iterate_offset(
+            self.get_saved_own_screenshots,
+            lambda resp: resp.screenshots,
+            page_size=page_size,
+            prefetch=prefetch,
+            max_items=max_items,
+            is_last=lambda resp: not resp.paging_info.continuation_token,
+            title_id=title_id,
+            **kwargs,
+        )
+
+    def iter_saved_screenshots_by_xuid(
+        self,
+        xuid: str,
+        title_id: str | None = None,
+        page_size: int = 25,
+        prefetch: int = 1,
+        max_items: int | None = None,
+        **kwargs,
+    ) -> AsyncIterator[Screenshot]:
+        """
+        Iterate saved screenshots by XUID, optionally filter for title Id, following pages
+
+        Args:
+            xuid: XUID of user to get screenshots from
+            title_id: Optional title id filter
+            page_size: Item count to load per page
+            prefetch: Number of pages requested ahead
+            max_items: Stop after this many screenshots
+
+        Returns:
+            Async iterator of :class:`Screenshot`
+        """
+        return iterate_offset(
+            self.get_saved_screenshots_by_xuid,
+            lambda resp: resp.screenshots,
+            page_size=page_size,
+            prefetch=prefetch,
+            max_items=max_items,
+            is_last=lambda resp: not resp.paging_info.continuation_token,
+            xuid=xuid,
+            title_id=title_id,
+            **kwargs,
+        )
@@ -0,0 +1,192 @@
+"""
+SmartGlass Console Fleet
+
+Send commands to many consoles concurrently, using a cached console list
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass, field
+import time
+from typing import TYPE_CHECKING
+
+from pythonxbox.api.provider.smartglass.models import (
+    CommandResponse,
+    OpStatusNode,
+    SmartglassConsole,
+    SmartglassConsoleList,
+)
+from pythonxbox.api.provider.smartglass.waiter import OperationWaiter
+
+if TYPE_CHECKING:
+    from pythonxbox.api.client import XboxLiveClient
+
+Command = Callable[[str], Awaitable[CommandResponse]]
+
+
+@dataclass
+class FleetResult:
+    responses: dict[str, CommandResponse] = field(default_factory=dict)
+    statuses: dict[str, OpStatusNode] = field(default_factory=dict)
+    failures: dict[str, BaseException] = field(default_factory=dict)
+    waited: bool = False
+
+    @property
+    def succeeded(self) -> list[str]:
+        """Device ids whose command was accepted, or completed if waited for"""
+        if self.waited:
+            return [d for d, s in self.statuses.items() if s.succeeded]
+        return list(self.responses)
+
+
+class ConsoleFleet:
+    """
+    Control all consoles of an account
+
+    The console list is cached for `ttl` seconds. Commands are sent to up to
+    `concurrency` consoles at a time, failures of single consoles are
+    collected instead of raised. Completion of the commands is optionally
+    awaited with a shared :class:`OperationWaiter`.
+    """
+
+    def __init__(
+        self,
+        client: "XboxLiveClient",
+        *,
+        ttl: float = 300,
+        concurrency: int = 8,
+        waiter: OperationWaiter | None = None,
+    ) -> None:
+        """
+        Initialize console fleet
+
+        Args:
+            client: Instance of XboxLiveClient
+            ttl: Seconds the console list is cached
+            concurrency: Number of commands sent in parallel
+            waiter: Waiter used when waiting for completion
+        """
+        self.client = client
+        self.ttl = ttl
+        self.concurrency = concurrency
+        self.waiter = waiter or OperationWaiter(client)
+
+        self._consoles: SmartglassConsoleList | None = None
+        self._expires = 0.0
+        self._lock = asyncio.Lock()
+
+    async def get_consoles(self, force: bool = False) -> SmartglassConsoleList:
+        """
+        Get the console list, cached
+
+        Args:
+            force: Refetch the console list regardless of the TTL
+
+        Returns: Console List
+        """
+        async with self._lock:
+            if force or self._consoles is None or time.monotonic() >= self._expires:
+                self._consoles = await self.client.smartglass.get_console_list(
+                    include_storage_devices=False
+                )
+                self._expires = time.monotonic() + self.ttl
+            return self._consoles
+
+    def invalidate(self) -> None:
+        """Refetch the console list on next use"""
+        self._consoles = None
+
+    async def send(
+        self,
+        command: Command,
+        device_ids: Iterable[str] | None = None,
+        wait: bool = False,
+        timeout: float | None = None,
+    ) -> FleetResult:
+        """
+        Send a command to many consoles
+
+        Args:
+            command: Coroutine function sending the command to one device id,
+                e.g. `client.smartglass.turn_off`
+            device_ids: Target consoles, all consoles if omitted
+            wait: Wait for the commands to complete
+            timeout: Deadline in seconds when waiting
+
+        Returns: :class:`FleetResult`
+        """
+        if device_ids is None:
+            device_ids = [console.id for console in await self._all_consoles()]
+        semaphore = asyncio.Semaphore(self.concurrency)
+        result = FleetResult(waited=wait)
+
+        async def run(device_id: str) -> None:
+            try:
+                async with semaphore:
+                    response = await command(device_id)
+                result.responses[device_id] = response
+                if wait:
+                    status = await self.waiter.wait(response, timeout)
+                    result.statuses[device_id] = status
+            except Exception as e:
+                result.failures[device_id] = e
+
+        await asyncio.gather(
+            *(run(device_id) for device_id in dict.fromkeys(device_ids))
+        )
+        return result
+
+    async def wake_up(
+        self, device_ids: Iterable[str] | None = None, **kwargs
+    ) -> FleetResult:
+        """
+        Wake up many consoles
+
+        Args:
+            device_ids: Target consoles, all consoles if omitted
+            kwargs: `wait` and `timeout`, see :meth:`send`
+
+        Returns: :class:`FleetResult`
+        """
+        return await self.send(self.client.smartglass.wake_up, device_ids, **kwargs)
+
+    async def turn_off(
+        self, device_ids: Iterable[str] | None = None, **kwargs
+    ) -> FleetResult:
+        """
+        Turn off many consoles
+
+        Args:
+            device_ids: Target consoles, all consoles if omitted
+            kwargs: `wait` and `timeout`, see :meth:`send`
+
+        Returns: :class:`FleetResult`
+        """
+        return await self.send(self.client.smartglass.turn_off, device_ids, **kwargs)
+
+    async def launch_app(
+        self,
+        one_store_product_id: str,
+        device_ids: Iterable[str] | None = None,
+        **kwargs,
+    ) -> FleetResult:
+        """
+        Launch an application on many consoles
+
+        Args:
+            one_store_product_id: OneStoreProductID for the app to launch
+            device_ids: Target consoles, all consoles if omitted
+            kwargs: `wait` and `timeout`, see :meth:`send`
+
+        Returns: :class:`FleetResult`
+        """
+
+        async def launch(device_id: str) -> CommandResponse:
+            return await self.client.smartglass.launch_app(
+                device_id, one_store_product_id
+            )
+
+        return await self.send(launch, device_ids, **kwargs)
+
+    async def _all_consoles(self) -> list[SmartglassConsole]:
+        return (await self.get_consoles()).result
@@ -0,0 +1,237 @@
+"""
+SmartGlass Operation Waiter
+
+Await the completion of console commands, sharing one status polling loop
+across all outstanding operations
+"""
+
+import asyncio
+from collections import defaultdict
+import contextlib
+from dataclasses import dataclass
+import logging
+import time
+from typing import TYPE_CHECKING
+
+from pythonxbox.api.provider.smartglass.models import (
+    CommandResponse,
+    OpStatus,
+    OpStatusNode,
+)
+
+if TYPE_CHECKING:
+    from pythonxbox.api.client import XboxLiveClient
+
+log = logging.getLogger("xbox.smartglass.waiter")
+
+TERMINAL_STATUSES = frozenset(
+    {OpStatus.Succeeded, OpStatus.Error, OpStatus.TimedOut, OpStatus.OffConsoleError}
+)
+
+
+@dataclass
+class _Operation:
+    device_id: str
+    future: "asyncio.Future[OpStatusNode]"
+    deadline: float
+    interval: float
+    next_check: float
+    last: OpStatusNode | None = None
+
+
+class OperationWaiter:
+    """
+    Wait for SmartGlass commands to reach a terminal :class:`OpStatus`
+
+    Each operation is checked with exponential backoff, starting at
+    `min_interval`. All operations are polled by one shared loop, running
+    only while operations are outstanding. Checks of operations that are
+    due at the same time are sent together, concurrently per console and
+    sequentially within a console. Every status response resolves all
+    outstanding operations it lists, which saves the requests for them.
+    """
+
+    def __init__(
+        self,
+        client: "XboxLiveClient",
+        *,
+        min_interval: float = 0.5,
+        max_interval: float = 5,
+        backoff: float = 2,
+        timeout: float = 30,
+    ) -> None:
+        """
+        Initialize operation waiter
+
+        Args:
+            client: Instance of XboxLiveClient
+            min_interval: Delay of the first status check in seconds
+            max_interval: Maximum delay between status checks in seconds
+            backoff: Delay growth factor between status checks
+            timeout: Default deadline in seconds
+        """
+        self.client = client
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.timeout = timeout
+
+        self._operations: dict[str, _Operation] = {}
+        self._poller: asyncio.Task[None] | None = None
+        self._wakeup = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self._operations)
+
+    async def wait(
+        self, command: CommandResponse, timeout: float | None = None
+    ) -> OpStatusNode:
+        """
+        Wait for a command to complete
+
+        Args:
+            command: Response of a command, e.g. `SmartglassProvider.wake_up`
+            timeout: Deadline in seconds, `timeout` of the waiter if omitted
+
+        Returns: Final status of the operation
+
+        Raises:
+            TimeoutError: Operation did not complete before the deadline
+        """
+        return await self.wait_op(
+            command.destination.id, command.op_id, timeout=timeout
+        )
+
+    async def wait_op(
+        self, device_id: str, op_id: str, timeout: float | None = None
+    ) -> OpStatusNode:
+        """
+        Wait for an operation to complete
+
+        Args:
+            device_id: ID of console (from console list)
+            op_id: Operation ID (from previous command)
+            timeout: Deadline in seconds, `timeout` of the waiter if omitted
+
+        Returns: Final status of the operation
+
+        Raises:
+            TimeoutError: Operation did not complete before the deadline
+        """
+        operation = self._operations.get(op_id)
+        if operation is None:
+            now = time.monotonic()
+            operation = _Operation(
+                device_id,
+                asyncio.get_running_loop().create_future(),
+                now + (self.timeout if timeout is None else timeout),
+                self.min_interval,
+                now + self.min_interval,
+            )
+            self._operations[op_id] = operation
+            self._ensure_poller()
+            self._wakeup.set()
+        # One cancelled waiter must not cancel the operation for the others
+        return await asyncio.shield(operation.future)
+
+    async def wait_all(
+        self, commands: list[CommandResponse], timeout: float | None = None
+    ) -> list[OpStatusNode | BaseException]:
+        """
+        Wait for many commands to complete
+
+        Args:
+            commands: Command responses
+            timeout: Deadline in seconds, `timeout` of the waiter if omitted
+
+        Returns: Final status or error, in order of `commands`
+        """
+        return await asyncio.gather(
+            *(self.wait(command, timeout) for command in commands),
+            return_exceptions=True,
+        )
+
+    def _ensure_poller(self) -> None:
+        if self._poller is None or self._poller.done():
+            self._poller = asyncio.create_task(self._poll_loop())
+
+    async def _poll_loop(self) -> None:
+        while True:
+            now = time.monotonic()
+            self._expire(now)
+            if not self._operations:
+                break
+            due = [
+                (op_id, op)
+                for op_id, op in self._operations.items()
+                if op.next_check <= now
+            ]
+            if due:
+                await self._check(due)
+                continue
+
+            wait = min(
+                min(op.next_check, op.deadline) for op in self._operations.values()
+            )
+            await self._sleep(max(wait - time.monotonic(), 0))
+
+    async def _sleep(self, delay: float) -> None:
+        # Operations added in the meantime cut the sleep short
+        self._wakeup.clear()
+        with contextlib.suppress(TimeoutError):
+            await asyncio.wait_for(self._wakeup.wait(), delay)
+
+    def _expire(self, now: float) -> None:
+        for op_id, op in list(self._operations.items()):
+            if op.deadline <= now:
+                del self._operations[op_id]
+                if not op.future.done():
+                    status = op.last.operation_status if op.last else "unknown"
+                    op.future.set_exception(
+                        TimeoutError(f"Operation {op_id} still {status} at deadline")
+                    )
+
+    async def _check(self, due: list[tuple[str, _Operation]]) -> None:
+        by_device: dict[str, list[str]] = defaultdict(list)
+        for op_id, op in due:
+            by_device[op.device_id].append(op_id)
+        await asyncio.gather(
+            *(
+                self._check_device(device, op_ids)
+                for device, op_ids in by_device.items()
+            )
+        )
+
+    async def _check_device(self, device_id: str, op_ids: list[str]) -> None:
+        for op_id in op_ids:
+            op = self._operations.get(op_id)
+            if op is None or op.next_check > time.monotonic():
+                # Resolved or updated by a previous response
+                continue
+            try:
+                resp = await self.client.smartglass.get_op_status(device_id, op_id)
+            except Exception as e:
+                log.debug("Checking operation %s failed: %s", op_id, e)
+                self._schedule(op)
+                continue
+            for node in resp.op_status_list:
+                self._update(node)
+            if all(node.op_id != op_id for node in resp.op_status_list):
+                # Operation not listed yet
+                self._schedule(op)
+
+    def _update(self, node: OpStatusNode) -> None:
+        op = self._operations.get(node.op_id)
+        if op is None:
+            return
+        op.last = node
+        if node.operation_status in TERMINAL_STATUSES:
+            del self._operations[node.op_id]
+            if not op.future.done():
+                op.future.set_result(node)
+        else:
+            self._schedule(op)
+
+    def _schedule(self, op: _Operation) -> None:
+        op.next_check = time.monotonic() + op.interval
+        op.interval = min(op.interval * self.backoff, self.max_interval)
@@ -2,18 +2,26 @@
 Titlehub - Get Title history and info
 """
 
+import asyncio
 from typing import TYPE_CHECKING
 
 from pythonxbox.api.provider.baseprovider import BaseProvider
-from pythonxbox.api.provider.titlehub.models import TitleFields, TitleHubResponse
+from pythonxbox.api.provider.titlehub.models import Title, TitleFields, TitleHubResponse
+from pythonxbox.common.concurrency import call_rate_limited, chunked
 
 if TYPE_CHECKING:
     from pythonxbox.api.client import XboxLiveClient
+    from pythonxbox.api.provider.titlehub.cache import TitleCache
 
 
 class TitlehubProvider(BaseProvider):
     TITLEHUB_URL = "https://titlehub.xboxlive.com"
     SEPARATOR = ","
+    MAX_BATCH_PFNS = 100
+
+    # Stores all title responses, serves title info requested without
+    # user specific decorations
+    cache: "TitleCache | None" = None
 
     def __init__(self, client: "XboxLiveClient") -> None:
         """
@@ -63,7 +71,7 @@ class TitlehubProvider(BaseProvider):
             url, params=params, headers=self._headers, **kwargs
         )
         resp.raise_for_status()
-        return TitleHubResponse.model_validate_json(resp.text)
+        return self._parse_titles(resp.text)
 
     async def _get_title_info(
         self, moniker: str, fields: list[TitleFields] | None = None, **kwargs
@@ -81,7 +89,7 @@ class TitlehubProvider(BaseProvider):
         url = f"{self.TITLEHUB_URL}/users/xuid({self.client.xuid})/titles/{moniker}/decoration/{fields}"
         resp = await self.client.session.get(url, headers=self._headers, **kwargs)
         resp.raise_for_status()
-        return TitleHubResponse.model_validate_json(resp.text)
+        return self._parse_titles(resp.text)
 
     async def get_title_info(
         self, title_id: str, fields: list[TitleFields] | None = None, **kwargs
@@ -96,6 +104,10 @@ class TitlehubProvider(BaseProvider):
         Returns:
             :class:`TitleHubResponse`: Title Hub Response
         """
+        if self.cache is not None and fields:
+            title = self.cache.get(title_id, self.client.language.locale, fields)
+            if title is not None:
+                return TitleHubResponse(xuid=self.client.xuid, titles=[title])
         return await self._get_title_info(f"titleid({title_id})", fields, **kwargs)
 
     async def get_title_info_by_pfn(
@@ -111,6 +123,10 @@ class TitlehubProvider(BaseProvider):
         Returns:
             :class:`TitleHubResponse`: Title Hub Response
         """
+        if self.cache is not None and fields:
+            title = self.cache.get_by_pfn(pfn, self.client.language.locale, fields)
+            if title is not None:
+                return TitleHubResponse(xuid=self.client.xuid, titles=[title])
         return await self._get_title_info(f"pfn({pfn})", fields, **kwargs)
 
     async def get_titles_batch(
@@ -141,4 +157,75 @@ class TitlehubProvider(BaseProvider):
             url, json=post_data, headers=self._headers, **kwargs
         )
         resp.raise_for_status()
-        return TitleHubResponse.model_validate_json(resp.text)
+        return self._parse_titles(resp.text)
+
+    async def get_titles_batch_bulk(
+        self,
+        pfns: list[str],
+        fields: list[TitleFields] | None = None,
+        concurrency: int = 4,
+        **kwargs,
+    ) -> TitleHubResponse:
+        """
+        Get Title info for any number of PFN ids
+
+        PFNs are deduplicated and requested in concurrent batches of at most
+        `MAX_BATCH_PFNS`. PFNs served by :attr:`cache` are not requested.
+        User specific fields, e.g. `TitleFields.ACHIEVEMENT`, are never
+        served by the cache, so they are not requested by default.
+
+        Args:
+            pfns: List of Package family names
+            fields: List of title fields, defaults to detail, image and
+                service config id
+            concurrency: Number of batches requested in parallel
+
+        Returns:
+            :class:`TitleHubResponse`: Title Hub Response, titles in order of `pfns`
+        """
+        if not fields:
+            fields = [
+                TitleFields.DETAIL,
+                TitleFields.IMAGE,
+                TitleFields.SERVICE_CONFIG_ID,
+            ]
+        unique_pfns = list(dict.fromkeys(pfns))
+        titles: dict[str, Title] = {}
+        if self.cache is not None:
+            locale = self.client.language.locale
+            for pfn in unique_pfns:
+                title = self.cache.get_by_pfn(pfn, locale, fields)
+                if title is not None:
+                    titles[pfn] = title
+        missing = [pfn for pfn in unique_pfns if pfn not in titles]
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def get_batch(batch: list[str]) -> TitleHubResponse:
+            async with semaphore:
+                return await call_rate_limited(
+                    self.get_titles_batch, batch, fields, **kwargs
+                )
+
+        responses = await asyncio.gather(
+            *(get_batch(list(batch)) for batch in chunked(missing, self.MAX_BATCH_PFNS))
+        )
+        requested = set(missing)
+        unmatched: list[Title] = []
+        for response in responses:
+            for title in response.titles:
+                if title.pfn in requested and title.pfn not in titles:
+                    titles[title.pfn] = title
+                else:
+                    unmatched.append(title)
+
+        result: dict[str, Title] = {}
+        for title in [*(titles[p] for p in unique_pfns if p in titles), *unmatched]:
+            result.setdefault(title.title_id, title)
+        return TitleHubResponse(titles=list(result.values()))
+
+    def _parse_titles(self, text: str) -> TitleHubResponse:
+        response = TitleHubResponse.model_validate_json(text)
+        if self.cache is not None:
+            self.cache.add(response, self.client.language.locale)
+        return response
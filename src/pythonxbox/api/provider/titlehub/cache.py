@@ -0,0 +1,259 @@
+"""
+Title Cache
+
+Persistent title metadata store, filled from the title hub responses passing
+through the client
+"""
+
+from collections.abc import Iterable
+import json
+import os
+import time
+from typing import Any
+
+from pythonxbox.api.provider.titlehub.models import Title, TitleFields, TitleHubResponse
+
+# Decorations with data of the requesting user, never served from the cache
+USER_FIELDS = frozenset(
+    {TitleFields.ACHIEVEMENT, TitleFields.STATS, TitleFields.FRIENDS_WHO_PLAYED}
+)
+
+# Title attributes holding data of the requesting user, never stored
+USER_ATTRIBUTES = ("achievement", "stats", "title_history", "friends_who_played")
+
+# Title attribute holding the section of a decoration
+FIELD_ATTRIBUTES = {
+    TitleFields.SERVICE_CONFIG_ID: "service_config_id",
+    TitleFields.GAME_PASS: "game_pass",
+    TitleFields.IMAGE: "images",
+    TitleFields.DETAIL: "detail",
+    TitleFields.ALTERNATE_TITLE_ID: "alternate_title_ids",
+    TitleFields.CONTENT_BOARD: "content_boards",
+}
+
+
+class TitleCache:
+    """
+    Title metadata indexed by title id, PFN, alternate title id and SCID
+
+    Titles are stored per locale, as names and details are localized. The
+    PFN, SCID and alternate title id indexes are locale independent, so
+    cross lookups like PFN -> SCID resolve from titles of any locale.
+    Sections of a title are merged, a response without e.g. the `detail`
+    decoration does not drop a previously stored detail.
+    """
+
+    def __init__(
+        self, path: str | os.PathLike | None = None, ttl: float = 30 * 24 * 3600
+    ) -> None:
+        """
+        Initialize title cache, loading it from `path` if it exists
+
+        Args:
+            path: File to persist the cache to
+            ttl: Seconds until a stored title expires
+        """
+        self.path = path
+        self.ttl = ttl
+        # (locale, title id) -> (stored at, title)
+        self._titles: dict[tuple[str, str], tuple[float, Title]] = {}
+        self._pfns: dict[str, str] = {}
+        self._scids: dict[str, str] = {}
+        self._alternate_ids: dict[str, str] = {}
+        if path and os.path.exists(path):
+            self.load()
+
+    def __len__(self) -> int:
+        return len(self._titles)
+
+    def add(self, response: TitleHubResponse, locale: str) -> None:
+        """
+        Store all titles of a response
+
+        Args:
+            response: Title hub response
+            locale: Locale the response was requested with
+        """
+        for title in response.titles:
+            self.add_title(title, locale)
+
+    def add_title(
+        self, title: Title, locale: str, stored_at: float | None = None
+    ) -> None:
+        """
+        Store a title, merging it with a previously stored one
+
+        Sections with data of the requesting user are dropped.
+
+        Args:
+            title: Title
+            locale: Locale the title was requested with
+            stored_at: Timestamp of the title, now if omitted
+        """
+        key = (locale, title.title_id)
+        title = title.model_copy(update=dict.fromkeys(USER_ATTRIBUTES))
+        if key in self._titles:
+            sections = {name: value for name, value in title if value is not None}
+            title = self._titles[key][1].model_copy(update=sections)
+        self._titles[key] = (time.time() if stored_at is None else stored_at, title)
+
+        if title.pfn:
+            self._pfns[title.pfn] = title.title_id
+        if title.service_config_id:
+            self._scids[title.service_config_id] = title.title_id
+        for alternate_id in title.alternate_title_ids or ():
+            self._alternate_ids[str(alternate_id)] = title.title_id
+
+    def get(
+        self,
+        title_id: str,
+        locale: str | None = None,
+        fields: Iterable[TitleFields] = (),
+    ) -> Title | None:
+        """
+        Get a title by title id or alternate title id
+
+        Args:
+            title_id: Title id
+            locale: Locale, any locale if omitted
+            fields: Decorations the title must include
+
+        Returns: :class:`Title`, `None` if not stored, expired or incomplete
+        """
+        title_id = str(title_id)
+        title_id = self._alternate_ids.get(title_id, title_id)
+        fields = frozenset(fields)
+        if fields & USER_FIELDS:
+            return None
+
+        if locale is not None:
+            candidates = [self._titles.get((locale, title_id))]
+        else:
+            candidates = [v for k, v in self._titles.items() if k[1] == title_id]
+        now = time.time()
+        for entry in candidates:
+            if entry is None or now - entry[0] >= self.ttl:
+                continue
+            if has_fields(entry[1], fields):
+                return entry[1]
+        return None
+
+    def get_by_pfn(
+        self, pfn: str, locale: str | None = None, fields: Iterable[TitleFields] = ()
+    ) -> Title | None:
+        """
+        Get a title by package family name
+
+        Args:
+            pfn: Package family name
+            locale: Locale, any locale if omitted
+            fields: Decorations the title must include
+
+        Returns: :class:`Title`, `None` if not stored, expired or incomplete
+        """
+        title_id = self._pfns.get(pfn)
+        return self.get(title_id, locale, fields) if title_id else None
+
+    def get_by_scid(
+        self,
+        service_config_id: str,
+        locale: str | None = None,
+        fields: Iterable[TitleFields] = (),
+    ) -> Title | None:
+        """
+        Get a title by service config id
+
+        Args:
+            service_config_id: Service config id
+            locale: Locale, any locale if omitted
+            fields: Decorations the title must include
+
+        Returns: :class:`Title`, `None` if not stored, expired or incomplete
+        """
+        title_id = self._scids.get(service_config_id)
+        return self.get(title_id, locale, fields) if title_id else None
+
+    def get_title_id(self, pfn: str) -> str | None:
+        """
+        Resolve a package family name to a title id
+
+        Args:
+            pfn: Package family name
+
+        Returns: Title id, `None` if unknown
+        """
+        return self._pfns.get(pfn)
+
+    def get_service_config_id(
+        self, title_id: str | None = None, pfn: str | None = None
+    ) -> str | None:
+        """
+        Resolve a title id or package family name to a service config id
+
+        Args:
+            title_id: Title id
+            pfn: Package family name
+
+        Returns: Service config id, `None` if unknown
+        """
+        if title_id is None and pfn is not None:
+            title_id = self._pfns.get(pfn)
+        if title_id is None:
+            return None
+        title = self.get(title_id, fields=[TitleFields.SERVICE_CONFIG_ID])
+        return title.service_config_id if title else None
+
+    def expire(self) -> None:
+        """Drop all expired titles"""
+        now = time.time()
+        for key, (stored_at, _) in list(self._titles.items()):
+            if now - stored_at >= self.ttl:
+                del self._titles[key]
+        title_ids = {title_id for _, title_id in self._titles}
+        for index in (self._pfns, self._scids, self._alternate_ids):
+            for key, title_id in list(index.items()):
+                if title_id not in title_ids:
+                    del index[key]
+
+    def load(self) -> None:
+        """Load the cache from `path`"""
+        if not self.path:
+            return
+        with open(self.path) as f:
+            state = json.load(f)
+        for locale, stored_at, title in state["titles"]:
+            self.add_title(Title.model_validate(title), locale, stored_at)
+
+    def save(self) -> None:
+        """Write the cache to `path`, dropping expired titles"""
+        if not self.path:
+            return
+        self.expire()
+        state: dict[str, Any] = {
+            "titles": [
+                [locale, stored_at, title.model_dump(mode="json", by_alias=True)]
+                for (locale, _), (stored_at, title) in self._titles.items()
+            ]
+        }
+        tmp_path = f"{os.fspath(self.path)}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.path)
+
+
+def has_fields(title: Title, fields: Iterable[TitleFields]) -> bool:
+    """
+    Check whether a title includes the sections of all decorations
+
+    Args:
+        title: Title
+        fields: Decorations
+
+    Returns: `True` if all sections are present, `False` for decorations
+        that can not be checked
+    """
+    return all(
+        field in FIELD_ATTRIBUTES
+        and getattr(title, FIELD_ATTRIBUTES[field]) is not None
+        for field in fields
+    )
@@ -2,6 +2,8 @@
 Userstats - Get game statistics
 """
 
+import asyncio
+from collections.abc import Awaitable, Callable
 from typing import ClassVar
 
 from pythonxbox.api.provider.ratelimitedprovider import RateLimitedProvider
@@ -9,6 +11,8 @@ from pythonxbox.api.provider.userstats.models import (
     GeneralStatsField,
     UserStatsResponse,
 )
+from pythonxbox.api.provider.userstats.table import StatsTable
+from pythonxbox.common.concurrency import call_rate_limited, chunked
 
 
 class UserStatsProvider(RateLimitedProvider):
@@ -21,6 +25,7 @@ class UserStatsProvider(RateLimitedProvider):
     # Are mentioned as their own objects but their rate limits are the same and do not collide
     # (Stats Read -> read rate limit, Stats Write -> write rate limit)
     RATE_LIMITS: ClassVar = {"burst": 100, "sustain": 300}
+    MAX_BATCH_XUIDS = 100
 
     async def get_stats(
         self,
@@ -166,3 +171,88 @@ class UserStatsProvider(RateLimitedProvider):
         )
         resp.raise_for_status()
         return UserStatsResponse.model_validate_json(resp.text)
+
+    async def get_stats_table(
+        self,
+        xuids: list[str],
+        title_id: str,
+        stats_fields: list[GeneralStatsField] | None = None,
+        concurrency: int = 4,
+        **kwargs,
+    ) -> StatsTable:
+        """
+        Get userstats of any number of users as table
+
+        XUIDs are requested in concurrent batches of at most
+        `MAX_BATCH_XUIDS`, waiting for the rate limit to reset if exceeded.
+
+        Args:
+            xuids: List of XUIDs to get stats for
+            title_id: Game Title Id
+            stats_fields: List of stats fields to acquire
+            concurrency: Number of batches requested in parallel
+
+        Returns:
+            :class:`StatsTable`: One row per XUID, one column per stat
+        """
+        return await self._get_stats_table(
+            self.get_stats_batch, xuids, title_id, stats_fields, concurrency, **kwargs
+        )
+
+    async def get_stats_table_by_scid(
+        self,
+        xuids: list[str],
+        service_config_id: str,
+        stats_fields: list[GeneralStatsField] | None = None,
+        concurrency: int = 4,
+        **kwargs,
+    ) -> StatsTable:
+        """
+        Get userstats of any number of users as table, via scid
+
+        XUIDs are requested in concurrent batches of at most
+        `MAX_BATCH_XUIDS`, waiting for the rate limit to reset if exceeded.
+
+        Args:
+            xuids: List of XUIDs to get stats for
+            service_config_id: Service Config Id of Game (scid)
+            stats_fields: List of stats fields to acquire
+            concurrency: Number of batches requested in parallel
+
+        Returns:
+            :class:`StatsTable`: One row per XUID, one column per stat
+        """
+        return await self._get_stats_table(
+            self.get_stats_batch_by_scid,
+            xuids,
+            service_config_id,
+            stats_fields,
+            concurrency,
+            **kwargs,
+        )
+
+    async def _get_stats_table(
+        self,
+        get_batch: Callable[..., Awaitable[UserStatsResponse]],
+        xuids: list[str],
+        title: str,
+        stats_fields: list[GeneralStatsField] | None,
+        concurrency: int,
+        **kwargs,
+    ) -> StatsTable:
+        unique_xuids = list(dict.fromkeys(str(xuid) for xuid in xuids))
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def get_chunk(chunk: list[str]) -> UserStatsResponse:
+            async with semaphore:
+                return await call_rate_limited(
+                    get_batch, chunk, title, stats_fields, **kwargs
+                )
+
+        responses = await asyncio.gather(
+            *(
+                get_chunk(list(chunk))
+                for chunk in chunked(unique_xuids, self.MAX_BATCH_XUIDS)
+            )
+        )
+        return StatsTable.from_responses(responses, unique_xuids)
@@ -0,0 +1,259 @@
+"""
+Stats Table
+
+Columnar storage of user stats: one row per XUID, one typed column per stat
+"""
+
+from array import array
+from collections.abc import Iterable, Iterator
+import math
+from typing import Any
+
+from pythonxbox.api.provider.userstats.models import Stat, UserStatsResponse
+
+# Stat types stored in int64 columns, other numeric types are stored as double
+INTEGER_TYPES = frozenset({"Integer", "Int32", "Int64", "Long"})
+DOUBLE_TYPES = frozenset({"Double", "Float"})
+
+
+class StatsTable:
+    """
+    User stats as typed columns
+
+    Integer stats are stored in int64 arrays, floating point stats in double
+    arrays and any other stat type as a list of strings. Missing values are
+    tracked with a presence mask per column.
+    """
+
+    def __init__(self, xuids: Iterable[int | str] = ()) -> None:
+        """
+        Initialize stats table
+
+        Args:
+            xuids: XUIDs to create (empty) rows for, in row order
+        """
+        self.xuids = array("q")
+        self._rows: dict[int, int] = {}
+        self._columns: dict[str, array | list[str]] = {}
+        self._present: dict[str, bytearray] = {}
+        for xuid in xuids:
+            self._row(int(xuid))
+
+    @classmethod
+    def from_responses(
+        cls, responses: Iterable[UserStatsResponse], xuids: Iterable[int | str] = ()
+    ) -> "StatsTable":
+        """
+        Create table from stats responses
+
+        Args:
+            responses: Stats responses, e.g. of `get_stats_batch`
+            xuids: XUIDs to create rows for first, in row order
+
+        Returns: Stats table
+        """
+        table = cls(xuids)
+        for response in responses:
+            table.add_response(response)
+        return table
+
+    def __len__(self) -> int:
+        return len(self.xuids)
+
+    @property
+    def stat_names(self) -> list[str]:
+        return list(self._columns)
+
+    def add_response(self, response: UserStatsResponse) -> None:
+        """
+        Add all stats of a response, overwriting existing values
+
+        Args:
+            response: Stats response
+        """
+        for stat in _iter_stats(response):
+            self.set_value(stat.xuid, stat.name, stat.value, stat.type)
+
+    def set_value(self, xuid: int | str, name: str, value: str, stat_type: str) -> None:
+        """
+        Set a stat value
+
+        Args:
+            xuid: XUID
+            name: Stat name
+            value: Stat value as returned by the service
+            stat_type: Stat type as returned by the service
+        """
+        row = self._row(int(xuid))
+        column = self._columns.get(name)
+        if column is None:
+            column = self._add_column(name, stat_type)
+        if isinstance(column, list):
+            column[row] = value
+        elif column.typecode == "q":
+            column[row] = _to_int(value)
+        else:
+            column[row] = float(value)
+        self._present[name][row] = 1
+
+    def column(self, name: str) -> array | list[str]:
+        """
+        Get the values of a stat, missing values are 0, NaN or empty
+
+        Args:
+            name: Stat name
+
+        Returns: Column in row order
+        """
+        return self._columns[name]
+
+    def present(self, name: str) -> bytearray:
+        """
+        Get the presence mask of a stat
+
+        Args:
+            name: Stat name
+
+        Returns: 1 for rows with a value, 0 otherwise
+        """
+        return self._present[name]
+
+    def get(self, xuid: int | str, name: str) -> Any:
+        """
+        Get a single stat value
+
+        Args:
+            xuid: XUID
+            name: Stat name
+
+        Returns: Value, `None` if missing
+        """
+        row = self._rows.get(int(xuid))
+        if row is None or name not in self._columns or not self._present[name][row]:
+            return None
+        return self._columns[name][row]
+
+    def row(self, xuid: int | str) -> dict[str, Any]:
+        """
+        Get all stat values of a user
+
+        Args:
+            xuid: XUID
+
+        Returns: Stat name -> value, missing stats are left out
+        """
+        return {
+            name: value
+            for name in self._columns
+            if (value := self.get(xuid, name)) is not None
+        }
+
+    def ranked(self, name: str, descending: bool = True) -> list[int]:
+        """
+        Get row indices of users with a value, ordered by value
+
+        Args:
+            name: Stat name
+            descending: Highest value first
+
+        Returns: Row indices, look up XUIDs with :attr:`xuids`
+        """
+        column = self._columns[name]
+        present = self._present[name]
+        rows = [row for row in range(len(self.xuids)) if present[row]]
+        rows.sort(key=column.__getitem__, reverse=descending)
+        return rows
+
+    def percentile(self, name: str, q: float) -> float:
+        """
+        Get a percentile of a numeric stat, linearly interpolated
+
+        Args:
+            name: Stat name
+            q: Percentile, 0 to 100
+
+        Returns: Value at the percentile, NaN if no user has a value
+        """
+        column = self._columns[name]
+        if isinstance(column, list):
+            raise TypeError(f"Stat {name} is not numeric")
+        present = self._present[name]
+        values = sorted(v for v, p in zip(column, present, strict=True) if p)
+        if not values:
+            return math.nan
+        position = (len(values) - 1) * q / 100
+        lower = math.floor(position)
+        upper = min(lower + 1, len(values) - 1)
+        return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+    def to_numpy(self, masked: bool = False) -> dict[str, Any]:
+        """
+        Export all columns as NumPy arrays, requires NumPy
+
+        Args:
+            masked: Export columns as masked arrays, masking missing values
+
+        Returns: Column name -> array, the XUIDs are exported as `xuid`
+        """
+        try:
+            import numpy as np
+        except ImportError as e:
+            raise ImportError(
+                "NumPy export requires the 'numpy' extra: pip install python-xbox[numpy]"
+            ) from e
+
+        result: dict[str, Any] = {"xuid": np.array(self.xuids, dtype=np.int64)}
+        for name, column in self._columns.items():
+            if isinstance(column, list):
+                values = np.array(column, dtype=object)
+            else:
+                values = np.array(column, dtype=np.dtype(column.typecode))
+            if masked:
+                mask = np.frombuffer(self._present[name], dtype=np.uint8) == 0
+                values = np.ma.MaskedArray(values, mask=mask)
+            result[name] = values
+        return result
+
+    def _row(self, xuid: int) -> int:
+        row = self._rows.get(xuid)
+        if row is None:
+            row = self._rows[xuid] = len(self.xuids)
+            self.xuids.append(xuid)
+            for name, column in self._columns.items():
+                column.append(_missing_value(column))
+                self._present[name].append(0)
+        return row
+
+    def _add_column(self, name: str, stat_type: str) -> array | list[str]:
+        size = len(self.xuids)
+        column: array | list[str]
+        if stat_type in INTEGER_TYPES:
+            column = array("q", bytes(8 * size))
+        elif stat_type in DOUBLE_TYPES:
+            column = array("d", [math.nan]) * size
+        else:
+            column = [""] * size
+        self._columns[name] = column
+        self._present[name] = bytearray(size)
+        return column
+
+
+def _iter_stats(response: UserStatsResponse) -> Iterator[Stat]:
+    collections = list(response.statlistscollection)
+    for group in response.groups or ():
+        collections.extend(group.statlistscollection)
+    for collection in collections:
+        yield from collection.stats
+
+
+def _missing_value(column: array | list[str]) -> Any:
+    if isinstance(column, list):
+        return ""
+    return 0 if column.typecode == "q" else math.nan
+
+
+def _to_int(value: str) -> int:
+    try:
+        return int(value)
+    except ValueError:
+        return int(float(value))
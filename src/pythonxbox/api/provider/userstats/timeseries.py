@@ -0,0 +1,341 @@
+"""
+Stats Time Series
+
+Periodically sample user stats into fixed-size, array-backed ring buffers
+"""
+
+from array import array
+import asyncio
+import base64
+from bisect import bisect_left, bisect_right
+from collections.abc import Callable, Iterable
+import json
+import logging
+import math
+import os
+import time
+from typing import TYPE_CHECKING, Any
+
+from pythonxbox.api.provider.userstats.models import GeneralStatsField
+
+if TYPE_CHECKING:
+    from pythonxbox.api.client import XboxLiveClient
+
+log = logging.getLogger("xbox.userstats.timeseries")
+
+AGGREGATES: dict[str, Callable[[list[float]], float]] = {
+    "last": lambda values: values[-1],
+    "first": lambda values: values[0],
+    "min": min,
+    "max": max,
+    "mean": lambda values: math.fsum(values) / len(values),
+}
+
+
+class RingBuffer:
+    """
+    Fixed-size series of (timestamp, value) samples
+
+    Timestamps and values are stored in two double arrays. Once full, the
+    oldest sample is overwritten. Timestamps have to be non-decreasing.
+    """
+
+    __slots__ = ("_length", "_start", "_times", "_values", "capacity")
+
+    def __init__(self, capacity: int) -> None:
+        """
+        Initialize ring buffer
+
+        Args:
+            capacity: Maximum number of samples
+        """
+        if capacity < 1:
+            raise ValueError("Capacity must be at least 1")
+        self.capacity = capacity
+        self._times = array("d", bytes(8 * capacity))
+        self._values = array("d", bytes(8 * capacity))
+        self._start = 0
+        self._length = 0
+
+    def __len__(self) -> int:
+        return self._length
+
+    def _index(self, i: int) -> int:
+        return (self._start + i) % self.capacity
+
+    def time_at(self, i: int) -> float:
+        return self._times[self._index(i)]
+
+    def append(self, timestamp: float, value: float) -> None:
+        """
+        Add a sample
+
+        Args:
+            timestamp: Unix timestamp of the sample
+            value: Sample value
+        """
+        if self._length and timestamp < self.time_at(self._length - 1):
+            raise ValueError("Samples must be appended in chronological order")
+        if self._length < self.capacity:
+            i = self._index(self._length)
+            self._length += 1
+        else:
+            i = self._start
+            self._start = self._index(1)
+        self._times[i] = timestamp
+        self._values[i] = value
+
+    def last(self) -> tuple[float, float] | None:
+        """Latest sample, `None` if empty"""
+        if not self._length:
+            return None
+        i = self._index(self._length - 1)
+        return self._times[i], self._values[i]
+
+    def range(
+        self, start: float | None = None, end: float | None = None
+    ) -> list[tuple[float, float]]:
+        """
+        Get samples within a time range
+
+        Args:
+            start: Earliest timestamp, inclusive
+            end: Latest timestamp, inclusive
+
+        Returns: Samples in chronological order
+        """
+        lo, hi = self._bounds(start, end)
+        return [
+            (self._times[j], self._values[j]) for j in map(self._index, range(lo, hi))
+        ]
+
+    def downsample(
+        self,
+        bucket: float,
+        start: float | None = None,
+        end: float | None = None,
+        aggregate: str = "last",
+    ) -> list[tuple[float, float]]:
+        """
+        Aggregate samples within a time range into fixed-width buckets
+
+        Args:
+            bucket: Bucket width in seconds
+            start: Earliest timestamp, inclusive
+            end: Latest timestamp, inclusive
+            aggregate: One of `last`, `first`, `min`, `max` and `mean`
+
+        Returns: (bucket start, aggregated value) of all non-empty buckets
+        """
+        func = AGGREGATES[aggregate]
+        buckets: list[tuple[float, list[float]]] = []
+        for timestamp, value in self.range(start, end):
+            bucket_start = timestamp - timestamp % bucket
+            if not buckets or buckets[-1][0] != bucket_start:
+                buckets.append((bucket_start, []))
+            buckets[-1][1].append(value)
+        return [(bucket_start, func(values)) for bucket_start, values in buckets]
+
+    def _bounds(self, start: float | None, end: float | None) -> tuple[int, int]:
+        view = _TimesView(self)
+        lo = 0 if start is None else bisect_left(view, start)
+        hi = self._length if end is None else bisect_right(view, end)
+        return lo, hi
+
+    def to_dict(self) -> dict[str, Any]:
+        samples = self.range()
+        return {
+            "capacity": self.capacity,
+            "times": _encode(array("d", (t for t, _ in samples))),
+            "values": _encode(array("d", (v for _, v in samples))),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "RingBuffer":
+        buffer = cls(data["capacity"])
+        times = _decode(data["times"])
+        values = _decode(data["values"])
+        for timestamp, value in zip(times, values, strict=True):
+            buffer.append(timestamp, value)
+        return buffer
+
+
+class _TimesView:
+    """Chronologically ordered, read-only view of the timestamps for bisect"""
+
+    __slots__ = ("_buffer",)
+
+    def __init__(self, buffer: RingBuffer) -> None:
+        self._buffer = buffer
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def __getitem__(self, i: int) -> float:
+        return self._buffer.time_at(i)
+
+
+SeriesKey = tuple[str, str, str]
+
+
+class StatsCollector:
+    """
+    Sample stats of tracked users periodically
+
+    Every sample reads the stats of all users tracked for a service config
+    id with batched requests (see `UserStatsProvider.get_stats_table_by_scid`)
+    and appends the values to one :class:`RingBuffer` per
+    (xuid, scid, stat).
+    """
+
+    def __init__(
+        self,
+        client: "XboxLiveClient",
+        *,
+        interval: float = 300,
+        capacity: int = 2016,
+        state_path: str | os.PathLike | None = None,
+    ) -> None:
+        """
+        Initialize stats collector
+
+        Args:
+            client: Instance of XboxLiveClient
+            interval: Seconds between samples
+            capacity: Samples kept per series, default is a week of 5 minutes
+            state_path: File to persist the series to
+        """
+        self.client = client
+        self.interval = interval
+        self.capacity = capacity
+        self.state_path = state_path
+
+        # scid -> (xuids, stats)
+        self._tracked: dict[str, tuple[dict[str, None], dict[str, None]]] = {}
+        self._series: dict[SeriesKey, RingBuffer] = {}
+        if state_path and os.path.exists(state_path):
+            self.load()
+
+    def track(
+        self,
+        xuids: Iterable[str],
+        service_config_id: str,
+        stats_fields: Iterable[str] = (GeneralStatsField.MINUTES_PLAYED,),
+    ) -> None:
+        """
+        Start sampling stats of users
+
+        Args:
+            xuids: XUIDs
+            service_config_id: Service Config Id of Game (scid)
+            stats_fields: Stats to sample
+        """
+        tracked_xuids, tracked_stats = self._tracked.setdefault(
+            service_config_id, ({}, {})
+        )
+        tracked_xuids.update(dict.fromkeys(xuids))
+        tracked_stats.update(dict.fromkeys(stats_fields))
+
+    def untrack(self, xuids: Iterable[str], service_config_id: str) -> None:
+        """
+        Stop sampling stats of users, their series are kept
+
+        Args:
+            xuids: XUIDs
+            service_config_id: Service Config Id of Game (scid)
+        """
+        tracked = self._tracked.get(service_config_id)
+        if tracked is None:
+            return
+        for xuid in xuids:
+            tracked[0].pop(xuid, None)
+        if not tracked[0]:
+            del self._tracked[service_config_id]
+
+    def series(self, xuid: str, service_config_id: str, stat: str) -> RingBuffer:
+        """
+        Get the samples of a stat
+
+        Args:
+            xuid: XUID
+            service_config_id: Service Config Id of Game (scid)
+            stat: Stat name
+
+        Returns: :class:`RingBuffer`, empty if not sampled yet
+        """
+        key = (xuid, service_config_id, stat)
+        return self._series.get(key) or RingBuffer(self.capacity)
+
+    async def sample(self, timestamp: float | None = None) -> int:
+        """
+        Read all tracked stats once
+
+        Args:
+            timestamp: Unix timestamp of the samples, now if omitted
+
+        Returns: Number of stored samples
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        count = 0
+        for scid, (xuids, stats) in list(self._tracked.items()):
+            table = await self.client.userstats.get_stats_table_by_scid(
+                list(xuids), scid, list(stats)
+            )
+            for stat in table.stat_names:
+                column = table.column(stat)
+                if isinstance(column, list):
+                    continue  # Only numeric stats are sampled
+                present = table.present(stat)
+                for row, xuid in enumerate(table.xuids):
+                    if not present[row]:
+                        continue
+                    key = (str(xuid), scid, stat)
+                    series = self._series.get(key)
+                    if series is None:
+                        series = self._series[key] = RingBuffer(self.capacity)
+                    series.append(timestamp, column[row])
+                    count += 1
+        return count
+
+    async def run(self) -> None:
+        """Sample forever, persisting the series after each sample"""
+        while True:
+            started = time.monotonic()
+            try:
+                await self.sample()
+            except Exception:
+                log.exception("Sampling stats failed")
+            else:
+                await asyncio.to_thread(self.save)
+            await asyncio.sleep(max(self.interval - (time.monotonic() - started), 0))
+
+    def load(self) -> None:
+        """Load the series from `state_path`"""
+        if not self.state_path:
+            return
+        with open(self.state_path) as f:
+            state = json.load(f)
+        for xuid, scid, stat, data in state["series"]:
+            self._series[(xuid, scid, stat)] = RingBuffer.from_dict(data)
+
+    def save(self) -> None:
+        """Write the series to `state_path`"""
+        if not self.state_path:
+            return
+        state = {
+            "series": [[*key, series.to_dict()] for key, series in self._series.items()]
+        }
+        tmp_path = f"{os.fspath(self.state_path)}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.state_path)
+
+
+def _encode(values: array) -> str:
+    return base64.b64encode(values.tobytes()).decode("ascii")
+
+
+def _decode(data: str) -> array:
+    values = array("d")
+    values.frombytes(base64.b64decode(data))
+    return values
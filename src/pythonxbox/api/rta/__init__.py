@@ -0,0 +1,401 @@
+"""
+Real-Time Activity (RTA)
+
+Push subscriptions for presence and social changes, multiplexed over a single
+WebSocket connection. Requires the optional `rta` dependencies.
+"""
+
+import asyncio
+from collections.abc import AsyncIterator
+import contextlib
+import json
+import logging
+import re
+from types import ModuleType
+from typing import TYPE_CHECKING, Any
+
+from pythonxbox.api.rta.models import (
+    RTAEvent,
+    RTAMessageType,
+    RTAPresenceEvent,
+    RTAResyncEvent,
+    RTARichPresence,
+    RTASocialEvent,
+    RTASocialNotification,
+    RTAStatus,
+)
+from pythonxbox.authentication.manager import AuthenticationManager
+from pythonxbox.common.exceptions import RTAException
+
+if TYPE_CHECKING:
+    from websockets.asyncio.client import ClientConnection
+
+log = logging.getLogger("xbox.rta")
+
+RTA_URL = "wss://rta.xboxlive.com/connect"
+RTA_SUBPROTOCOL = "rta.xboxlive.com.V2"
+
+PRESENCE_RESOURCE = "https://userpresence.xboxlive.com/users/xuid({xuid})/richpresence"
+SOCIAL_RESOURCE = "http://social.xboxlive.com/users/xuid({xuid})/friends"
+
+_XUID_RE = re.compile(r"/users/xuid\((\d+)\)/")
+
+
+def parse_event(resource: str, data: Any) -> RTAEvent:
+    """
+    Parse the payload of a subscribed resource
+
+    Args:
+        resource: Subscribed resource URI
+        data: Raw payload
+
+    Returns: Typed event for presence and social resources, generic otherwise
+    """
+    match = _XUID_RE.search(resource)
+    if match and isinstance(data, dict):
+        xuid = match.group(1)
+        if resource == PRESENCE_RESOURCE.format(xuid=xuid):
+            presence = RTARichPresence.model_validate(data)
+            return RTAPresenceEvent(resource, data, xuid, presence)
+        if resource == SOCIAL_RESOURCE.format(xuid=xuid):
+            notification = RTASocialNotification.model_validate(data)
+            return RTASocialEvent(resource, data, xuid, notification)
+    return RTAEvent(resource, data)
+
+
+class RTAClient:
+    """
+    Real-time activity subscription client
+
+    Subscriptions are kept across connection losses: the client reconnects
+    with exponential backoff and resubscribes all resources. As pushes may
+    have been missed in between, a :class:`RTAResyncEvent` is emitted,
+    followed by the current data of every resubscribed resource.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        auth_mgr: AuthenticationManager,
+        *,
+        url: str = RTA_URL,
+        min_reconnect_delay: float = 1,
+        max_reconnect_delay: float = 60,
+        max_queued_events: int = 0,
+        unsubscribe_timeout: float = 10,
+    ) -> None:
+        """
+        Initialize RTA client
+
+        Args:
+            auth_mgr: Authentication manager to take the XSTS token from
+            url: RTA WebSocket endpoint
+            min_reconnect_delay: Delay in seconds before the first reconnect
+            max_reconnect_delay: Maximum delay in seconds between reconnects
+            max_queued_events: Maximum number of unconsumed events, 0 for
+                unlimited
+            unsubscribe_timeout: Seconds to wait for the service to
+                acknowledge an unsubscribe
+        """
+        self._auth_mgr = auth_mgr
+        self.url = url
+        self.min_reconnect_delay = min_reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.unsubscribe_timeout = unsubscribe_timeout
+
+        self._events: asyncio.Queue[RTAEvent | RTAResyncEvent | None] = asyncio.Queue(
+            max_queued_events
+        )
+        # Subscribed resources, resolved with the initial data once acknowledged
+        self._resources: dict[str, asyncio.Future[Any]] = {}
+        # Subscription ids and in flight requests of the current connection
+        self._subscription_ids: dict[str, int] = {}
+        self._resources_by_id: dict[int, str] = {}
+        self._requests: dict[int, tuple[RTAMessageType, str]] = {}
+        self._unsubscribes: dict[int, asyncio.Future[None]] = {}
+        self._sequence = 0
+
+        self._ws: ClientConnection | None = None
+        self._task: asyncio.Task | None = None
+
+    async def __aenter__(self) -> "RTAClient":
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        await self.close()
+
+    @property
+    def connected(self) -> bool:
+        return self._ws is not None
+
+    @property
+    def resources(self) -> list[str]:
+        """Currently subscribed resources"""
+        return list(self._resources)
+
+    async def connect(self) -> None:
+        """
+        Connect and keep the connection alive in the background
+
+        Raises:
+            RTAException: If the initial connection fails
+        """
+        if self._task is not None:
+            return
+        _import_websockets()
+        connected: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._task = asyncio.create_task(self._run(connected))
+        try:
+            await connected
+        except BaseException:
+            self._task.cancel()
+            self._task = None
+            raise
+
+    async def close(self) -> None:
+        """Close the connection, ends the event stream"""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        for resource, future in self._resources.items():
+            _fail(
+                future, RTAException(f"Client closed before subscribing to {resource}")
+            )
+        self._resources.clear()
+        if self._events.full():
+            # Make room for the end of stream marker
+            self._events.get_nowait()
+        self._events.put_nowait(None)
+
+    async def subscribe(self, resource: str) -> Any:
+        """
+        Subscribe to a resource
+
+        Args:
+            resource: Resource URI, e.g. :data:`PRESENCE_RESOURCE`
+
+        Returns: Initial data of the resource
+
+        Raises:
+            RTAException: If the subscription is rejected
+        """
+        if resource not in self._resources:
+            self._resources[resource] = asyncio.get_running_loop().create_future()
+            if self._ws is not None:
+                await self._send_subscribe(resource)
+        return await asyncio.shield(self._resources[resource])
+
+    async def subscribe_presence(self, xuid: str) -> RTARichPresence:
+        """
+        Subscribe to rich presence changes of a user
+
+        Args:
+            xuid: XUID
+
+        Returns: Current rich presence
+        """
+        data = await self.subscribe(PRESENCE_RESOURCE.format(xuid=xuid))
+        return RTARichPresence.model_validate(data)
+
+    async def subscribe_social(self, xuid: str) -> None:
+        """
+        Subscribe to friend list changes of a user
+
+        Args:
+            xuid: XUID
+        """
+        await self.subscribe(SOCIAL_RESOURCE.format(xuid=xuid))
+
+    async def unsubscribe(self, resource: str) -> None:
+        """
+        Unsubscribe from a resource
+
+        Args:
+            resource: Resource URI
+        """
+        future = self._resources.pop(resource, None)
+        if future is None:
+            return
+        _fail(future, RTAException(f"Unsubscribed from {resource}"))
+        subscription_id = self._subscription_ids.pop(resource, None)
+        if subscription_id is None or self._ws is None:
+            return
+        del self._resources_by_id[subscription_id]
+        sequence = self._next_sequence(RTAMessageType.UNSUBSCRIBE, resource)
+        done = self._unsubscribes[sequence] = asyncio.get_running_loop().create_future()
+        try:
+            async with asyncio.timeout(self.unsubscribe_timeout):
+                await self._send(
+                    [RTAMessageType.UNSUBSCRIBE, sequence, subscription_id]
+                )
+                await done
+        except TimeoutError:
+            log.warning("Unsubscribe from %s not acknowledged", resource)
+        finally:
+            self._unsubscribes.pop(sequence, None)
+            self._requests.pop(sequence, None)
+
+    async def events(self) -> AsyncIterator[RTAEvent | RTAResyncEvent]:
+        """
+        Stream events of all subscriptions until the client is closed
+
+        Yields: :class:`RTAEvent`, typed for presence and social resources
+        """
+        while (event := await self._events.get()) is not None:
+            yield event
+
+    async def _run(self, connected: asyncio.Future[None]) -> None:
+        delay = self.min_reconnect_delay
+        while True:
+            try:
+                ws = await self._open()
+            except Exception as e:
+                if not connected.done():
+                    connected.set_exception(
+                        RTAException(f"Failed to connect to {self.url}: {e}")
+                    )
+                    return
+                log.warning("Reconnect failed: %s", e)
+            else:
+                delay = self.min_reconnect_delay
+                await self._serve(ws, connected)
+            log.debug("Reconnecting in %.1fs", delay)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    async def _serve(
+        self, ws: "ClientConnection", connected: asyncio.Future[None]
+    ) -> None:
+        websockets = _import_websockets()
+        self._ws = ws
+        try:
+            if connected.done():
+                await self._events.put(RTAResyncEvent())
+            for resource in list(self._resources):
+                await self._send_subscribe(resource)
+            if not connected.done():
+                connected.set_result(None)
+            async for message in ws:
+                await self._handle_message(message)
+            log.warning("Connection closed by server")
+        except (OSError, websockets.exceptions.ConnectionClosed) as e:
+            log.warning("Connection lost: %s", e)
+        except Exception:
+            # Reconnect rather than ending the event stream for good
+            log.exception("Connection failed")
+        finally:
+            self._ws = None
+            self._reset_connection_state()
+            await ws.close()
+
+    async def _open(self) -> "ClientConnection":
+        websockets = _import_websockets()
+        await self._auth_mgr.refresh_tokens()
+        headers = {
+            "Authorization": self._auth_mgr.xsts_token.authorization_header_value
+        }
+        return await websockets.asyncio.client.connect(
+            self.url, additional_headers=headers, subprotocols=[RTA_SUBPROTOCOL]
+        )
+
+    def _reset_connection_state(self) -> None:
+        self._subscription_ids.clear()
+        self._resources_by_id.clear()
+        self._requests.clear()
+        for future in self._unsubscribes.values():
+            # Subscriptions do not outlive the connection
+            if not future.done():
+                future.set_result(None)
+        self._unsubscribes.clear()
+
+    def _next_sequence(self, message_type: RTAMessageType, resource: str) -> int:
+        self._sequence += 1
+        self._requests[self._sequence] = (message_type, resource)
+        return self._sequence
+
+    async def _send(self, message: list[Any]) -> None:
+        if self._ws is not None:
+            await self._ws.send(json.dumps(message))
+
+    async def _send_subscribe(self, resource: str) -> None:
+        sequence = self._next_sequence(RTAMessageType.SUBSCRIBE, resource)
+        await self._send([RTAMessageType.SUBSCRIBE, sequence, resource])
+
+    async def _handle_message(self, message: str | bytes) -> None:
+        try:
+            await self._dispatch(json.loads(message))
+        except (ValueError, TypeError, LookupError) as e:
+            # Includes malformed JSON and payloads failing validation
+            log.warning("Ignoring malformed RTA message %r: %s", message, e)
+
+    async def _dispatch(self, message: list[Any]) -> None:
+        message_type = message[0]
+        if message_type == RTAMessageType.EVENT:
+            _, subscription_id, data = message
+            resource = self._resources_by_id.get(subscription_id)
+            if resource is not None:
+                await self._events.put(parse_event(resource, data))
+        elif message_type == RTAMessageType.SUBSCRIBE:
+            await self._handle_subscribe(*message[1:])
+        elif message_type == RTAMessageType.UNSUBSCRIBE:
+            self._requests.pop(message[1], None)
+            done = self._unsubscribes.pop(message[1], None)
+            if done is not None and not done.done():
+                done.set_result(None)
+        elif message_type == RTAMessageType.RESYNC:
+            await self._events.put(RTAResyncEvent())
+        else:
+            log.debug("Unknown RTA message: %s", message)
+
+    async def _handle_subscribe(
+        self,
+        sequence: int,
+        status: int,
+        subscription_id: int | None = None,
+        data: Any = None,
+    ) -> None:
+        _, resource = self._requests.pop(sequence, (None, ""))
+        future = self._resources.get(resource)
+        if future is None:
+            # Unsubscribed while the subscription was in flight
+            if status == RTAStatus.SUCCESS and self._ws is not None:
+                await self._send([RTAMessageType.UNSUBSCRIBE, 0, subscription_id])
+            return
+
+        if status != RTAStatus.SUCCESS or subscription_id is None:
+            del self._resources[resource]
+            if not future.done():
+                future.set_exception(
+                    RTAException(f"Subscription to {resource} failed", status)
+                )
+            else:
+                log.warning("Resubscribing to %s failed: %s", resource, status)
+            return
+
+        self._subscription_ids[resource] = subscription_id
+        self._resources_by_id[subscription_id] = resource
+        if future.done():
+            # Resubscribed after a reconnect, emit the current state
+            await self._events.put(parse_event(resource, data))
+        else:
+            future.set_result(data)
+
+
+def _fail(future: asyncio.Future[Any], exception: Exception) -> None:
+    if not future.done():
+        future.set_exception(exception)
+        # Waiters see the exception, an unawaited future must not warn about it
+        future.exception()
+
+
+def _import_websockets() -> ModuleType:
+    try:
+        import websockets.asyncio.client
+        import websockets.exceptions
+    except ImportError as e:
+        raise ImportError(
+            "RTA requires the 'rta' extra: pip install python-xbox[rta]"
+        ) from e
+    return websockets
@@ -0,0 +1,62 @@
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Any
+
+from pydantic import Field
+
+from pythonxbox.common.models import CamelCaseModel, PascalCaseModel
+
+
+class RTAMessageType(IntEnum):
+    SUBSCRIBE = 1
+    UNSUBSCRIBE = 2
+    EVENT = 3
+    RESYNC = 4
+
+
+class RTAStatus(IntEnum):
+    SUCCESS = 0
+    UNKNOWN_RESOURCE = 1
+    SUBSCRIPTION_LIMIT_REACHED = 2
+    NO_RESOURCE_DATA = 3
+    THROTTLED = 1001
+    SERVICE_UNAVAILABLE = 1002
+
+
+class RTARichPresence(CamelCaseModel):
+    device_type: str | None = Field(None, alias="devicetype")
+    title_id: int | None = Field(None, alias="titleid")
+    string1: str | None = None
+    string2: str | None = None
+    presence_state: str | None = None
+    presence_text: str | None = None
+
+
+class RTASocialNotification(PascalCaseModel):
+    notification_type: str
+    xuids: list[str] = Field(default_factory=list)
+
+
+@dataclass
+class RTAEvent:
+    """Event of a subscribed resource, `data` is the raw payload"""
+
+    resource: str
+    data: Any
+
+
+@dataclass
+class RTAPresenceEvent(RTAEvent):
+    xuid: str
+    presence: RTARichPresence
+
+
+@dataclass
+class RTASocialEvent(RTAEvent):
+    xuid: str
+    notification: RTASocialNotification
+
+
+@dataclass
+class RTAResyncEvent:
+    """Events may have been missed, subscribed state should be refetched"""
@@ -0,0 +1,104 @@
+"""
+Concurrency helpers
+
+Shared by the bulk / background components built on top of the providers
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Iterator, Sequence
+from datetime import datetime
+from http import HTTPStatus
+import logging
+from typing import ParamSpec, TypeVar
+
+import httpx
+
+from pythonxbox.common.exceptions import RateLimitExceededException
+from pythonxbox.common.ratelimits.models import TimePeriod
+
+log = logging.getLogger("xbox.concurrency")
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+# Retries on HTTP 429 responses, local rate limits are always waited for
+MAX_TOO_MANY_REQUESTS_RETRIES = 3
+
+
+async def call_rate_limited(
+    func: Callable[P, Awaitable[T]], *args: P.args, **kwargs: P.kwargs
+) -> T:
+    """
+    Call a provider method, waiting out exceeded rate limits
+
+    Local rate limits (:class:`RateLimitExceededException`) are waited for
+    until they reset. HTTP 429 responses are retried after the time given by
+    the `Retry-After` header, up to `MAX_TOO_MANY_REQUESTS_RETRIES` times.
+
+    Args:
+        func: Coroutine function to call, e.g. a provider method
+        args: Positional arguments for `func`
+        kwargs: Keyword arguments for `func`
+
+    Returns: Return value of `func`
+    """
+    retries = 0
+    while True:
+        try:
+            return await func(*args, **kwargs)
+        except RateLimitExceededException as e:
+            delay = seconds_until(e.try_again_in)
+            log.debug("Rate limit exceeded, waiting %.1fs", delay)
+            await asyncio.sleep(delay)
+        except httpx.HTTPStatusError as e:
+            if (
+                e.response.status_code != HTTPStatus.TOO_MANY_REQUESTS
+                or retries >= MAX_TOO_MANY_REQUESTS_RETRIES
+            ):
+                raise
+            retries += 1
+            delay = retry_after(e.response)
+            log.debug("Too many requests, retrying in %.1fs", delay)
+            await asyncio.sleep(delay)
+
+
+def seconds_until(reset_after: datetime | None) -> float:
+    """
+    Seconds until a rate limit resets
+
+    Args:
+        reset_after: Reset time, as returned by `RateLimit.get_reset_after`
+
+    Returns: Seconds to wait, burst period if the reset time is unknown
+    """
+    if reset_after is None:
+        return float(TimePeriod.BURST.value)
+    return max((reset_after - datetime.now()).total_seconds(), 0.0)
+
+
+def retry_after(response: httpx.Response) -> float:
+    """
+    Seconds to wait according to the `Retry-After` header of a response
+
+    Args:
+        response: HTTP Response
+
+    Returns: Seconds to wait, burst period if the header is missing
+    """
+    try:
+        return max(float(response.headers["Retry-After"]), 0.0)
+    except (KeyError, ValueError):
+        return float(TimePeriod.BURST.value)
+
+
+def chunked(items: Sequence[T], size: int) -> Iterator[Sequence[T]]:
+    """
+    Split a sequence into chunks, e.g. to respect a batch request limit
+
+    Args:
+        items: Sequence to split
+        size: Maximum chunk size
+
+    Returns: Iterator of chunks
+    """
+    return (items[i : i + size] for i in range(0, len(items), size))
@@ -59,3 +59,29 @@ class RateLimitExceededException(XboxException):
         self.message = message
         self.rate_limit = rate_limit
         self.try_again_in = rate_limit.get_reset_after()
+
+
+class RTAException(XboxException):
+    def __init__(self, message: str, status: int | None = None) -> None:
+        """
+        Raised when a real-time activity subscription fails
+
+        Args:
+            message (str): Exception message
+            status (int): RTA status code returned by the service, if any
+        """
+        super().__init__(message)
+        self.status = status
+
+
+class DownloadException(XboxException):
+    def __init__(self, message: str, url: str | None = None) -> None:
+        """
+        Raised when a media download fails verification
+
+        Args:
+            message (str): Exception message
+            url (str): Downloaded URL, if known
+        """
+        super().__init__(message)
+        self.url = url
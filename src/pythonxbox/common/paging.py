@@ -0,0 +1,138 @@
+"""
+Paging helpers
+
+Follow continuation tokens or skip offsets of paged endpoints as async
+iterators
+"""
+
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable, Sequence
+from typing import Any, TypeVar
+
+R = TypeVar("R")
+T = TypeVar("T")
+
+
+async def iterate_continuation(
+    fetch: Callable[..., Awaitable[R]],
+    get_items: Callable[[R], Sequence[T]],
+    get_token: Callable[[R], str | None],
+    *,
+    max_items: int | None = None,
+    continuation_param: str = "continuationToken",
+    **kwargs: Any,
+) -> AsyncIterator[T]:
+    """
+    Iterate the items of all pages of a continuation token paged endpoint
+
+    The next page is requested while the items of the current page are
+    consumed. It is not requested if `max_items` is reached with the
+    current page.
+
+    Args:
+        fetch: Coroutine function requesting a page, e.g. a provider method
+        get_items: Get the items of a page
+        get_token: Get the continuation token of a page, `None` on the last
+        max_items: Stop after this many items
+        continuation_param: Query parameter to pass the continuation token in
+        kwargs: Keyword arguments for `fetch`
+
+    Yields: Items of all pages
+    """
+    extra_params = kwargs.pop("extra_params", None) or {}
+    seen_tokens: set[str] = set()
+    remaining = max_items
+
+    def request(token: str | None) -> "asyncio.Task[R]":
+        params = {**extra_params, continuation_param: token} if token else extra_params
+        return asyncio.ensure_future(fetch(**kwargs, extra_params=params or None))
+
+    task: asyncio.Task[R] | None = request(None)
+    try:
+        while task is not None:
+            page = await task
+            items = get_items(page)
+            if remaining is not None:
+                items = items[:remaining]
+                remaining -= len(items)
+
+            token = get_token(page)
+            task = None
+            if token and token not in seen_tokens and remaining != 0:
+                seen_tokens.add(token)
+                task = request(token)
+
+            for item in items:
+                yield item
+    finally:
+        if task is not None:
+            task.cancel()
+
+
+async def iterate_offset(  # noqa: PLR0913
+    fetch: Callable[..., Awaitable[R]],
+    get_items: Callable[[R], Sequence[T]],
+    *,
+    page_size: int,
+    prefetch: int = 1,
+    skip: int = 0,
+    max_items: int | None = None,
+    is_last: Callable[[R], bool] | None = None,
+    skip_param: str = "skip_items",
+    size_param: str = "max_items",
+    **kwargs: Any,
+) -> AsyncIterator[T]:
+    """
+    Iterate the items of all pages of a skip / max paged endpoint
+
+    Up to `prefetch` pages after the current one are requested while its
+    items are consumed. Iteration stops on the first short or empty page,
+    or when `is_last` reports the last page, pending requests are cancelled.
+
+    Args:
+        fetch: Coroutine function requesting a page, e.g. a provider method
+        get_items: Get the items of a page
+        page_size: Items to request per page
+        prefetch: Number of pages requested ahead
+        skip: Items to skip at the beginning
+        max_items: Stop after this many items
+        is_last: Check whether a page is the last one
+        skip_param: Keyword argument of `fetch` taking the offset
+        size_param: Keyword argument of `fetch` taking the page size
+        kwargs: Keyword arguments for `fetch`
+
+    Yields: Items of all pages
+    """
+    if page_size < 1:
+        raise ValueError("Page size must be at least 1")
+    end = None if max_items is None else skip + max_items
+    offset = skip
+    pending: deque[tuple[asyncio.Task[R], int]] = deque()
+
+    def fill() -> None:
+        nonlocal offset
+        while len(pending) <= prefetch and (end is None or offset < end):
+            size = page_size if end is None else min(page_size, end - offset)
+            params = {skip_param: offset, size_param: size}
+            pending.append((asyncio.ensure_future(fetch(**kwargs, **params)), size))
+            offset += size
+
+    try:
+        fill()
+        while pending:
+            task, size = pending.popleft()
+            page = await task
+            items = get_items(page)[:size]
+            if len(items) < size or (is_last is not None and is_last(page)):
+                for pending_task, _ in pending:
+                    pending_task.cancel()
+                pending.clear()
+            else:
+                fill()
+
+            for item in items:
+                yield item
+    finally:
+        for task, _ in pending:
+            task.cancel()
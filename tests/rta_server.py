@@ -0,0 +1,112 @@
+"""Local stand-in for the real-time activity (RTA) service."""
+
+from http import HTTPStatus
+import itertools
+import json
+from typing import Any
+
+from websockets.asyncio.server import Server, ServerConnection, serve
+from websockets.http11 import Request, Response
+
+from pythonxbox.api.rta import RTA_SUBPROTOCOL
+from pythonxbox.api.rta.models import RTAMessageType, RTAStatus
+
+
+class RTAServer:
+    def __init__(self, resources: dict[str, Any], authorization: str) -> None:
+        """
+        Args:
+            resources: Initial data of all known resources
+            authorization: Expected `Authorization` header value
+        """
+        self.resources = resources
+        self.authorization = authorization
+        self.connection_count = 0
+        self._subscriptions: dict[ServerConnection, dict[int, str]] = {}
+        self._subscription_ids = itertools.count(1)
+        self._server: Server | None = None
+
+    async def __aenter__(self) -> "RTAServer":
+        self._server = await serve(
+            self._handler,
+            "127.0.0.1",
+            0,
+            subprotocols=[RTA_SUBPROTOCOL],
+            process_request=self._check_auth,
+        )
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        assert self._server
+        self._server.close()
+        await self._server.wait_closed()
+
+    @property
+    def url(self) -> str:
+        assert self._server
+        host, port = next(iter(self._server.sockets)).getsockname()[:2]
+        return f"ws://{host}:{port}"
+
+    @property
+    def subscribed(self) -> set[str]:
+        return {r for subs in self._subscriptions.values() for r in subs.values()}
+
+    async def push(self, resource: str, data: Any) -> None:
+        self.resources[resource] = data
+        for connection, subs in self._subscriptions.items():
+            for subscription_id, subscribed in subs.items():
+                if subscribed == resource:
+                    await connection.send(
+                        json.dumps([RTAMessageType.EVENT, subscription_id, data])
+                    )
+
+    async def send_raw(self, message: str) -> None:
+        for connection in self._subscriptions:
+            await connection.send(message)
+
+    async def resync(self) -> None:
+        for connection in self._subscriptions:
+            await connection.send(json.dumps([RTAMessageType.RESYNC]))
+
+    async def drop(self) -> None:
+        for connection in list(self._subscriptions):
+            await connection.close(1011)
+
+    def _check_auth(
+        self, connection: ServerConnection, request: Request
+    ) -> Response | None:
+        if request.headers.get("Authorization") != self.authorization:
+            return connection.respond(HTTPStatus.UNAUTHORIZED, "Unauthorized\n")
+        return None
+
+    async def _handler(self, connection: ServerConnection) -> None:
+        self.connection_count += 1
+        subs = self._subscriptions[connection] = {}
+        try:
+            async for message in connection:
+                await self._handle_message(connection, subs, json.loads(message))
+        finally:
+            del self._subscriptions[connection]
+
+    async def _handle_message(
+        self, connection: ServerConnection, subs: dict[int, str], message: list[Any]
+    ) -> None:
+        if message[0] == RTAMessageType.SUBSCRIBE:
+            _, sequence, resource = message
+            if resource not in self.resources:
+                reply = [message[0], sequence, RTAStatus.UNKNOWN_RESOURCE]
+            else:
+                subscription_id = next(self._subscription_ids)
+                subs[subscription_id] = resource
+                reply = [
+                    message[0],
+                    sequence,
+                    RTAStatus.SUCCESS,
+                    subscription_id,
+                    self.resources[resource],
+                ]
+        else:
+            _, sequence, subscription_id = message
+            subs.pop(subscription_id, None)
+            reply = [message[0], sequence, RTAStatus.SUCCESS]
+        await connection.send(json.dumps(reply))
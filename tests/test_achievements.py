@@ -1,8 +1,14 @@
+import asyncio
+from pathlib import Path
+
 from httpx import Response
 import pytest
 from respx import MockRouter
 
 from pythonxbox.api.client import XboxLiveClient
+from pythonxbox.api.provider.achievements.harvester import AchievementHarvester
+from pythonxbox.api.provider.achievements.index import AchievementIndex
+from pythonxbox.api.provider.achievements.watcher import AchievementUnlockWatcher
 from tests.common import get_response_json
 
 
@@ -112,3 +118,177 @@ async def test_achievement_one_recent_progress(
 
     assert len(ret.titles) == 32
     assert route.called
+
+
+@pytest.mark.asyncio
+async def test_achievement_one_gameprogress_iter(
+    respx_mock: MockRouter, xbl_client: XboxLiveClient
+) -> None:
+    first = get_response_json("achievements_one_gameprogress")
+    last = {**first, "pagingInfo": {"continuationToken": None, "totalRecords": 73}}
+    route = respx_mock.get("https://achievements.xboxlive.com").mock(
+        side_effect=[Response(200, json=first), Response(200, json=last)]
+    )
+
+    achievements = [
+        a
+        async for a in xbl_client.achievements.iter_achievements_xboxone_gameprogress(
+            "2669321029139235", "219630713"
+        )
+    ]
+
+    assert len(achievements) == 64
+    assert route.call_count == 2
+    assert "continuationToken" not in route.calls[0].request.url.params
+    assert route.calls[1].request.url.params["continuationToken"] == "32"
+    assert route.calls[1].request.url.params["titleId"] == "219630713"
+
+
+@pytest.mark.asyncio
+async def test_achievement_one_gameprogress_iter_max_items(
+    respx_mock: MockRouter, xbl_client: XboxLiveClient
+) -> None:
+    route = respx_mock.get("https://achievements.xboxlive.com").mock(
+        return_value=Response(
+            200, json=get_response_json("achievements_one_gameprogress")
+        )
+    )
+
+    achievements = [
+        a
+        async for a in xbl_client.achievements.iter_achievements_xboxone_gameprogress(
+            "2669321029139235", "219630713", max_items=40
+        )
+    ]
+
+    assert len(achievements) == 40
+    # The second page reaches max_items, no further page is requested
+    assert route.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_achievement_harvester(
+    respx_mock: MockRouter, xbl_client: XboxLiveClient, tmp_path: Path
+) -> None:
+    history = get_response_json("titlehub_titlehistory")
+    progress = get_response_json("achievements_one_gameprogress")
+    progress["pagingInfo"]["continuationToken"] = None
+    titlehub = respx_mock.get("https://titlehub.xboxlive.com").mock(
+        side_effect=lambda _: Response(200, json=history)
+    )
+    achievements = respx_mock.get("https://achievements.xboxlive.com").mock(
+        return_value=Response(200, json=progress)
+    )
+    state_path = tmp_path / "harvest.json"
+    harvester = AchievementHarvester(xbl_client, state_path=state_path)
+
+    records = [r async for r in harvester.harvest("2669321029139235")]
+
+    # Titles without achievements (Win32 title) are skipped
+    assert achievements.call_count == 4
+    assert len(records) == 4 * 32
+    record = records[0]
+    assert record.xuid == "2669321029139235"
+    assert record.unlocked
+    assert record.time_unlocked is not None
+    assert record.gamerscore == 10
+    assert harvester.harvested["2669321029139235"]["1828326430"] == 12
+    assert titlehub.calls[0].request.url.params["maxItems"] == "1000"
+
+    # Unchanged titles are skipped, state is persisted
+    harvester = AchievementHarvester(xbl_client, state_path=state_path)
+    assert [r async for r in harvester.harvest("2669321029139235")] == []
+    assert achievements.call_count == 4
+
+    history["titles"][3]["achievement"]["currentAchievements"] = 13
+    records = [r async for r in harvester.harvest("2669321029139235")]
+    assert achievements.call_count == 5
+    assert {r.title_id for r in records} == {"1828326430"}
+    assert harvester.harvested["2669321029139235"]["1828326430"] == 13
+
+
+@pytest.mark.asyncio
+async def test_achievement_index(
+    respx_mock: MockRouter, xbl_client: XboxLiveClient
+) -> None:
+    scid = "1370999b-fca2-4c53-8ec5-73493bcb67e5"
+    progress = get_response_json("achievements_one_gameprogress")
+    progress["pagingInfo"]["continuationToken"] = None
+    gameprogress = respx_mock.get(
+        "https://achievements.xboxlive.com/users/xuid(2669321029139235)/achievements"
+    ).mock(return_value=Response(200, json=progress))
+    details = respx_mock.get(
+        f"https://achievements.xboxlive.com/users/xuid(2669321029139235)/achievements/{scid}/39"
+    ).mock(
+        return_value=Response(200, json=get_response_json("achievements_one_details"))
+    )
+    index = AchievementIndex(xbl_client)
+
+    # Not indexed yet, resolves the title and loads all of its achievements
+    achievement = await index.get("2669321029139235", scid, "39")
+    assert achievement.id == "39"
+    assert details.call_count == 1
+    assert gameprogress.call_count == 1
+
+    for achievement_id in ("5", "6", "7"):
+        achievement = await index.get("2669321029139235", scid, achievement_id)
+        assert achievement.id == achievement_id
+    assert index.get_cached("2669321029139235", scid, "5") is not None
+    assert gameprogress.call_count == 1
+    assert details.call_count == 1
+
+    index.invalidate("2669321029139235")
+    achievements = await asyncio.gather(
+        index.load("2669321029139235", "219630713"),
+        index.load("2669321029139235", "219630713"),
+    )
+    assert len(achievements[0]) == 32
+    assert gameprogress.call_count == 2
+
+    # Title id given, nothing to resolve
+    index = AchievementIndex(xbl_client)
+    await index.get("2669321029139235", scid, "5", title_id="219630713")
+    assert gameprogress.call_count == 3
+    assert details.call_count == 1
+
+    index.ttl = 0
+    await index.get("2669321029139235", scid, "5")
+    assert gameprogress.call_count == 4
+
+    index.invalidate("2669321029139235")
+    assert index.get_cached("2669321029139235", scid, "5") is None
+
+
+@pytest.mark.asyncio
+async def test_achievement_unlock_watcher(
+    respx_mock: MockRouter, xbl_client: XboxLiveClient
+) -> None:
+    recent = get_response_json("achievements_one_recent_progress")
+    halo = recent["titles"][14]
+    halo.update(earnedAchievements=22, lastUnlock="2015-11-11T05:30:00Z")
+    progress = get_response_json("achievements_one_gameprogress")
+    progress["pagingInfo"]["continuationToken"] = None
+    respx_mock.get(
+        "https://achievements.xboxlive.com/users/xuid(2669321029139235)/history/titles"
+    ).mock(side_effect=lambda _: Response(200, json=recent))
+    gameprogress = respx_mock.get(
+        "https://achievements.xboxlive.com/users/xuid(2669321029139235)/achievements"
+    ).mock(return_value=Response(200, json=progress))
+    watcher = AchievementUnlockWatcher(xbl_client, ["2669321029139235"])
+
+    assert await watcher.poll() == []
+    assert await watcher.poll() == []
+    assert not gameprogress.called
+
+    halo.update(earnedAchievements=24, lastUnlock="2015-11-11T06:22:21.9376390Z")
+    events = await watcher.poll()
+    assert gameprogress.call_count == 1
+    assert gameprogress.calls[0].request.url.params["titleId"] == "219630713"
+    assert [e.time_unlocked.isoformat() for e in events] == [
+        "2015-11-11T06:02:13.055054+00:00",
+        "2015-11-11T06:22:21.937639+00:00",
+    ]
+    assert events[0].title_name == "Halo 5: Guardians"
+
+    assert await watcher.poll() == []
+    assert gameprogress.call_count == 1
@@ -0,0 +1,198 @@
+import base64
+from datetime import UTC, datetime, timedelta
+import hashlib
+import json
+from pathlib import Path
+
+from httpx import Request, Response
+import pytest
+from respx import MockRouter
+
+from pythonxbox.api.client import XboxLiveClient
+from pythonxbox.api.download import (
+    DownloadJob,
+    DownloadSource,
+    MediaDownloader,
+    _parse_expiration,
+)
+from pythonxbox.api.provider.gameclips.models import GameClip
+from pythonxbox.api.provider.mediahub.models import GameclipContent
+from pythonxbox.common.exceptions import DownloadException
+from tests.common import get_response_json
+
+CONTENT = bytes(range(256)) * 40
+MEDIA_URL = "https://gameclipscontent-d3017.xboxlive.com/clip.MP4"
+
+
+def serve(request: Request) -> Response:
+    assert "Authorization" not in request.headers
+    if "Range" in request.headers:
+        start = int(request.headers["Range"].removeprefix("bytes=").rstrip("-"))
+        return Response(206, content=CONTENT[start:])
+    md5 = base64.b64encode(hashlib.md5(CONTENT, usedforsecurity=False).digest())
+    return Response(200, content=CONTENT, headers={"Content-MD5": md5.decode()})
+
+
+@pytest.mark.asyncio
+async def test_download_resume(
+    respx_mock: MockRouter, xbl_client: XboxLiveClient, tmp_path: Path
+) -> None:
+    route = respx_mock.get(MEDIA_URL).mock(side_effect=serve)
+    downloader = MediaDownloader(xbl_client, chunk_size=1000)
+    source = DownloadSource(MEDIA_URL, len(CONTENT))
+
+    result = await downloader.download(DownloadJob(source, tmp_path / "a.mp4"))
+    assert (tmp_path / "a.mp4").read_bytes() == CONTENT
+    assert result.sha256 == hashlib.sha256(CONTENT).hexdigest()
+    assert not result.resumed
+
+    (tmp_path / "b.mp4.part").write_bytes(CONTENT[:1234])
+    job = DownloadJob(source, tmp_path / "b.mp4", sha256=result.sha256)
+    result = await downloader.download(job)
+    assert result.resumed
+    assert route.calls.last.request.headers["Range"] == "bytes=1234-"
+    assert (tmp_path / "b.mp4").read_bytes() == CONTENT
+    assert not (tmp_path / "b.mp4.part").exists()
+
+
+@pytest.mark.asyncio
+async def test_download_refresh_expired(
+    respx_mock: MockRouter, xbl_client: XboxLiveClient, tmp_path: Path
+) -> None:
+    data = get_response_json("gameclips_recent_xuid")
+    clip = GameClip.model_validate(data["gameClips"][0])
+    fresh = data["gameClips"][0]["gameClipUris"][0]
+    fresh["uri"] = MEDIA_URL
+    fresh["fileSize"] = len(CONTENT)
+    fresh["expiration"] = (datetime.now(UTC) + timedelta(hours=1)).isoformat()
+    data["gameClips"] = data["gameClips"][:1]
+    data["pagingInfo"]["continuationToken"] = None
+
+    metadata_route = respx_mock.get("https://gameclipsmetadata.xboxlive.com").mock(
+        return_value=Response(200, json=data)
+    )
+    respx_mock.get(MEDIA_URL).mock(side_effect=serve)
+    downloader = MediaDownloader(xbl_client)
+
+    # Fixture URI expired in 2018
+    job = downloader.gameclip_job(clip, tmp_path)
+    assert job.source.is_expired()
+    result = await downloader.download(job)
+
+    assert metadata_route.call_count == 1
+    assert job.source.uri == MEDIA_URL
+    assert result.size == len(CONTENT)
+    assert (tmp_path / f"{clip.game_clip_id}.mp4").read_bytes() == CONTENT
+
+
+@pytest.mark.asyncio
+async def test_download_refresh_saved(
+    respx_mock: MockRouter, xbl_client: XboxLiveClient, tmp_path: Path
+) -> None:
+    data = get_response_json("gameclips_saved_xuid")
+    data["gameClips"][0]["savedByUser"] = False
+    clip = GameClip.model_validate(data["gameClips"][0])
+    fresh = data["gameClips"][0]["gameClipUris"][0]
+    fresh["uri"] = MEDIA_URL
+    fresh["fileSize"] = len(CONTENT)
+    # Without offset, read as UTC
+    fresh["expiration"] = (datetime.now(UTC) + timedelta(hours=1)).strftime(
+        "%Y-%m-%dT%H:%M:%S"
+    )
+    data["gameClips"] = data["gameClips"][:1]
+    data["pagingInfo"]["continuationToken"] = None
+
+    recent_route = respx_mock.get(path__regex=r"/clips$").mock(
+        return_value=Response(200, json={**data, "gameClips": []})
+    )
+    saved_route = respx_mock.get(path__regex=r"/clips/saved$").mock(
+        return_value=Response(200, json=data)
+    )
+    respx_mock.get(MEDIA_URL).mock(side_effect=serve)
+    downloader = MediaDownloader(xbl_client)
+
+    job = downloader.gameclip_job(clip, tmp_path)
+    result = await downloader.download(job)
+
+    assert not job.source.is_expired()
+    assert recent_route.call_count == 1
+    assert saved_route.call_count == 1
+    assert result.size == len(CONTENT)
+
+
+@pytest.mark.asyncio
+async def test_download_restart_unsatisfiable(
+    respx_mock: MockRouter, xbl_client: XboxLiveClient, tmp_path: Path
+) -> None:
+    def serve_shorter(request: Request) -> Response:
+        if "Range" in request.headers:
+            return Response(416)
+        return serve(request)
+
+    route = respx_mock.get(MEDIA_URL).mock(side_effect=serve_shorter)
+    downloader = MediaDownloader(xbl_client)
+    (tmp_path / "a.mp4.part").write_bytes(CONTENT + b"stale")
+
+    job = DownloadJob(DownloadSource(MEDIA_URL), tmp_path / "a.mp4")
+    result = await downloader.download(job)
+
+    assert route.call_count == 2
+    assert "Range" not in route.calls.last.request.headers
+    assert not result.resumed
+    assert (tmp_path / "a.mp4").read_bytes() == CONTENT
+
+
+@pytest.mark.asyncio
+async def test_download_refresh_content(
+    respx_mock: MockRouter, xbl_client: XboxLiveClient, tmp_path: Path
+) -> None:
+    data = get_response_json("mediahub_gameclips_own")
+    content = GameclipContent.model_validate(data["values"][0])
+    locator = data["values"][0]["contentLocators"][0]
+    locator.update(uri=MEDIA_URL, fileSize=len(CONTENT), expiration=None)
+
+    search_route = respx_mock.post(
+        "https://mediahub.xboxlive.com/gameclips/search"
+    ).mock(return_value=Response(200, json=data))
+    respx_mock.get(MEDIA_URL).mock(side_effect=serve)
+    downloader = MediaDownloader(xbl_client)
+
+    # Fixture URI expired in 2022
+    result = await downloader.download(downloader.content_job(content, tmp_path))
+
+    assert result.size == len(CONTENT)
+    assert search_route.call_count == 1
+    body = json.loads(search_route.calls.last.request.content)
+    assert body["max"] == 1
+    assert f"ContentId eq '{content.content_id}'" in body["query"]
+
+
+def test_download_sources(xbl_client: XboxLiveClient, tmp_path: Path) -> None:
+    expiration = _parse_expiration("2018-03-28T12:49:01")
+    assert expiration == datetime(2018, 3, 28, 12, 49, 1, tzinfo=UTC)
+    assert DownloadSource(MEDIA_URL, expiration=expiration).is_expired()
+
+    data = get_response_json("mediahub_gameclips_own")["values"][0]
+    data["contentLocators"] = data["contentLocators"][1:]
+    content = GameclipContent.model_validate(data)
+    with pytest.raises(DownloadException):
+        MediaDownloader(xbl_client).content_job(content, tmp_path)
+
+
+@pytest.mark.asyncio
+async def test_download_all_verification(
+    respx_mock: MockRouter, xbl_client: XboxLiveClient, tmp_path: Path
+) -> None:
+    respx_mock.get(MEDIA_URL).mock(side_effect=serve)
+    downloader = MediaDownloader(xbl_client, concurrency=2)
+    jobs = [
+        DownloadJob(DownloadSource(MEDIA_URL, len(CONTENT)), tmp_path / "ok.mp4"),
+        DownloadJob(DownloadSource(MEDIA_URL, len(CONTENT) + 1), tmp_path / "bad.mp4"),
+    ]
+
+    results = {r.job.path.name: r async for r in downloader.download_all(jobs)}
+
+    assert results["ok.mp4"].error is None
+    assert isinstance(results["bad.mp4"].error, DownloadException)
+    assert not (tmp_path / "bad.mp4").exists()
+    assert not (tmp_path / "bad.mp4.part").exists()
@@ -1,4 +1,4 @@
-from httpx import Response
+from httpx import Request, Response
 import pytest
 from respx import MockRouter
 
@@ -154,3 +154,43 @@ async def test_gameclips_saved_community(
 
     assert len(ret.game_clips) == 99
     assert route.called
+
+
+@pytest.mark.asyncio
+async def test_gameclips_iter_recent_own(
+    respx_mock: MockRouter, xbl_client: XboxLiveClient
+) -> None:
+    data = get_response_json("gameclips_recent_own")
+    clips = data["gameClips"]
+
+    def page(request: Request) -> Response:
+        skip = int(request.url.params["skipItems"])
+        end = skip + int(request.url.params["maxItems"])
+        token = "abcde_vwxyzGQAAAA2" if end < len(clips) else None
+        return Response(
+            200,
+            json={
+                "gameClips": clips[skip:end],
+                "pagingInfo": {"continuationToken": token},
+            },
+        )
+
+    route = respx_mock.get("https://gameclipsmetadata.xboxlive.com").mock(
+        side_effect=page
+    )
+
+    ret = [
+        clip async for clip in xbl_client.gameclips.iter_recent_own_clips(page_size=10)
+    ]
+    assert [clip.game_clip_id for clip in ret] == [c["gameClipId"] for c in clips]
+    assert route.call_count >= 3
+
+    route.reset()
+    ret = [
+        clip
+        async for clip in xbl_client.gameclips.iter_recent_own_clips(
+            page_size=10, max_items=12
+        )
+    ]
+    assert len(ret) == 12
+    assert [call.request.url.params["maxItems"] for call in route.calls] == ["10", "2"]
@@ -0,0 +1,78 @@
+import asyncio
+from pathlib import Path
+
+from httpx import Response
+import pytest
+from respx import MockRouter
+
+from pythonxbox.api.client import XboxLiveClient
+from pythonxbox.api.images import ImageCache, ImageFetcher, resized_url
+from pythonxbox.api.provider.catalog.models import Image
+
+IMAGE_URL = "https://images-eds-ssl.xboxlive.com/image?url=abc.X5Z%3D&format=png"
+
+
+def test_resized_url() -> None:
+    assert resized_url(IMAGE_URL, 64, 64) == IMAGE_URL + "&w=64&h=64"
+    assert resized_url(IMAGE_URL + "&w=10", width=64) == IMAGE_URL + "&w=64"
+    assert (
+        resized_url("//store-images.s-microsoft.com/image/apps.1.2", height=100)
+        == "https://store-images.s-microsoft.com/image/apps.1.2?h=100"
+    )
+    assert resized_url("https://example.com/a.png", 64, 64) == (
+        "https://example.com/a.png"
+    )
+
+
+def test_image_cache_lru(tmp_path: Path) -> None:
+    cache = ImageCache(tmp_path, max_bytes=10)
+    cache.put("a", b"aaaaaa")
+    cache.put("b", b"bbbbbb")
+    cache.put("c", b"bbbbbb")
+
+    assert cache.get("a") is None
+    assert cache.get("c") == b"bbbbbb"
+    assert len(cache) == 1
+    assert cache.size == 6
+
+    cache = ImageCache(tmp_path, max_bytes=10)
+    assert cache.get("b") == b"bbbbbb"
+    assert cache.get("a") is None
+
+
+@pytest.mark.asyncio
+async def test_image_fetcher(
+    respx_mock: MockRouter, xbl_client: XboxLiveClient, tmp_path: Path
+) -> None:
+    route = respx_mock.get(IMAGE_URL + "&w=64").mock(
+        return_value=Response(200, content=b"png")
+    )
+    fetcher = ImageFetcher(xbl_client, ImageCache(tmp_path))
+
+    results = await asyncio.gather(*(fetcher.fetch(IMAGE_URL, 64) for _ in range(5)))
+    assert results == [b"png"] * 5
+    assert route.call_count == 1
+    assert "Authorization" not in route.calls.last.request.headers
+
+    fetcher = ImageFetcher(xbl_client, ImageCache(tmp_path))
+    assert await fetcher.fetch_many([IMAGE_URL], width=64) == [b"png"]
+    assert route.call_count == 1
+
+    store_route = respx_mock.get(
+        "https://store-images.s-microsoft.com/image/apps.1.2"
+    ).mock(return_value=Response(200, content=b"box art"))
+    image = Image.model_validate(
+        {
+            "FileSizeInBytes": 7,
+            "Height": 100,
+            "ImagePurpose": "BoxArt",
+            "UnscaledImageSHA256Hash": "hash",
+            "Uri": "//store-images.s-microsoft.com/image/apps.1.2",
+            "Width": 100,
+        }
+    )
+    assert await fetcher.fetch_catalog_image(image) == b"box art"
+    # Same source image behind another URL is served from cache
+    other = image.model_copy(update={"uri": "//store-images.s-microsoft.com/x"})
+    assert await fetcher.fetch_catalog_image(other) == b"box art"
+    assert store_route.call_count == 1
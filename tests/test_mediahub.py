@@ -1,8 +1,25 @@
-from httpx import Response
+from datetime import UTC, datetime, timedelta, timezone
+import json
+from pathlib import Path
+
+from httpx import Request, Response
 import pytest
 from respx import MockRouter
 
 from pythonxbox.api.client import XboxLiveClient
+from pythonxbox.api.provider.mediahub.query import (
+    MediahubField,
+    any_of,
+    eq,
+    order_by,
+    title_id,
+    uploaded_between,
+)
+from pythonxbox.api.provider.mediahub.sync import (
+    MediaChange,
+    MediaKind,
+    MediaLibrarySync,
+)
 from tests.common import get_response_json
 
 
@@ -30,3 +47,111 @@ async def test_media_gameclips_own(
 
     assert len(ret.values) == 1
     assert route.called
+
+
+@pytest.mark.asyncio
+async def test_media_iter_own_clips(
+    respx_mock: MockRouter, xbl_client: XboxLiveClient
+) -> None:
+    route = respx_mock.post("https://mediahub.xboxlive.com/gameclips/search").mock(
+        return_value=Response(200, json=get_response_json("mediahub_gameclips_own"))
+    )
+    ret = [clip async for clip in xbl_client.mediahub.iter_own_clips(page_size=2)]
+
+    # Short page ends iteration
+    assert len(ret) == 1
+    assert route.call_count in {1, 2}
+    body = json.loads(route.calls[0].request.content)
+    assert body["skip"] == 0
+    assert body["max"] == 2
+
+
+@pytest.mark.asyncio
+async def test_media_library_sync(
+    respx_mock: MockRouter, xbl_client: XboxLiveClient, tmp_path: Path
+) -> None:
+    template = get_response_json("mediahub_gameclips_own")["values"][0]
+    library = [{**template, "contentId": f"clip-{i}"} for i in (3, 2, 1)]
+
+    def search(request: Request) -> Response:
+        body = json.loads(request.content)
+        # Oldest first unless ordered
+        ordered = library if body.get("orderBy") == "UploadDate desc" else library[::-1]
+        page = ordered[body["skip"] : body["skip"] + body["max"]]
+        return Response(200, json={"values": page})
+
+    route = respx_mock.post("https://mediahub.xboxlive.com/gameclips/search").mock(
+        side_effect=search
+    )
+    state_path = tmp_path / "media.json"
+    sync = MediaLibrarySync(
+        xbl_client, kinds=(MediaKind.CLIP,), page_size=2, state_path=state_path
+    )
+
+    # First sync lists the whole library
+    events = await sync.sync()
+    assert [(e.change, e.id) for e in events] == [
+        (MediaChange.ADDED, "clip-3"),
+        (MediaChange.ADDED, "clip-2"),
+        (MediaChange.ADDED, "clip-1"),
+    ]
+
+    # Routine sync stops at the first known item
+    library.insert(0, {**template, "contentId": "clip-4"})
+    route.reset()
+    sync = MediaLibrarySync(
+        xbl_client, kinds=(MediaKind.CLIP,), page_size=2, state_path=state_path
+    )
+    events = await sync.sync()
+    assert [(e.change, e.id) for e in events] == [(MediaChange.ADDED, "clip-4")]
+    assert route.call_count == 1
+    assert list(sync.items[MediaKind.CLIP]) == ["clip-4", "clip-3", "clip-2", "clip-1"]
+    assert await sync.sync() == []
+
+    del library[2]
+    events = await sync.sync(full=True)
+    assert [(e.change, e.id) for e in events] == [(MediaChange.REMOVED, "clip-2")]
+    assert list(sync.items[MediaKind.CLIP]) == ["clip-4", "clip-3", "clip-1"]
+
+
+def test_media_query() -> None:
+    week = uploaded_between(
+        datetime(2022, 11, 1, tzinfo=UTC),
+        datetime(2022, 11, 8, 1, tzinfo=timezone(timedelta(hours=1))),
+    )
+    query = title_id(1717113201) & week
+    assert str(query) == (
+        "TitleId eq 1717113201 and UploadDate ge 2022-11-01T00:00:00Z"
+        " and UploadDate lt 2022-11-08T00:00:00Z"
+    )
+
+    devices = any_of(MediahubField.UPLOAD_DEVICE_TYPE, ["XboxOne", "Scarlett"])
+    assert str(title_id(1) & devices) == (
+        "TitleId eq 1 and (UploadDeviceType eq 'XboxOne'"
+        " or UploadDeviceType eq 'Scarlett')"
+    )
+    assert str(~eq(MediahubField.CONTENT_STATE, "It's")) == (
+        "not (ContentState eq 'It''s')"
+    )
+
+
+@pytest.mark.asyncio
+async def test_media_clips_filtered(
+    respx_mock: MockRouter, xbl_client: XboxLiveClient
+) -> None:
+    route = respx_mock.post("https://mediahub.xboxlive.com/gameclips/search").mock(
+        return_value=Response(200, json=get_response_json("mediahub_gameclips_own"))
+    )
+    await xbl_client.mediahub.fetch_own_clips(
+        count=50,
+        query=title_id(1717113201),
+        order_by=order_by(MediahubField.UPLOAD_DATE),
+    )
+
+    body = json.loads(route.calls.last.request.content)
+    assert body == {
+        "max": 50,
+        "query": f"OwnerXuid eq {xbl_client.xuid} and TitleId eq 1717113201",
+        "skip": 0,
+        "orderBy": "UploadDate desc",
+    }
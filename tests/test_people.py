@@ -1,8 +1,38 @@
-from httpx import Response
+from contextlib import aclosing
+import json
+from pathlib import Path
+import re
+
+from httpx import Request, Response
 import pytest
 from respx import MockRouter
 
 from pythonxbox.api.client import XboxLiveClient
+from pythonxbox.api.provider.people import xuidset
+from pythonxbox.api.provider.people.crawler import (
+    BloomFilter,
+    FriendEdge,
+    FriendGraphCrawler,
+)
+from pythonxbox.api.provider.people.leaderboard import (
+    FriendsLeaderboards,
+    Leaderboard,
+    LeaderboardEntry,
+)
+from pythonxbox.api.provider.people.models import (
+    Detail,
+    PeopleDecoration,
+    PeopleResponse,
+    Person,
+    PreferredColor,
+)
+from pythonxbox.api.provider.people.store import FriendStore
+from pythonxbox.api.provider.people.sync import FriendListSync
+from pythonxbox.api.provider.people.xuidset import (
+    XuidSet,
+    mutual_friends,
+    top_k_overlap,
+)
 from tests.common import get_response_json
 
 
@@ -19,6 +49,42 @@ async def test_people_friends_own(
     assert route.called
 
 
+@pytest.mark.asyncio
+async def test_people_friends_own_decoration_model(
+    respx_mock: MockRouter, xbl_client: XboxLiveClient
+) -> None:
+    route = respx_mock.get("https://peoplehub.xboxlive.com").mock(
+        return_value=Response(200, json=get_response_json("people_friends_own"))
+    )
+    ret = await xbl_client.people.get_friends_own(
+        decoration_fields=[PeopleDecoration.DETAIL]
+    )
+
+    assert route.calls.last.request.url.path.endswith("/decoration/detail")
+    assert isinstance(ret, PeopleResponse)
+    assert isinstance(ret.people[0], Person)
+    assert isinstance(ret.people[0].detail, Detail)
+    assert ret.people[0].preferred_color is None
+    assert ret.people[0].gamertag
+
+
+def test_people_response_for_decorations() -> None:
+    all_decorations = list(PeopleDecoration)
+    assert PeopleResponse.for_decorations(all_decorations) is PeopleResponse
+    assert PeopleResponse.for_decorations(
+        [PeopleDecoration.DETAIL, PeopleDecoration.PREFERRED_COLOR]
+    ) is PeopleResponse.for_decorations(
+        [PeopleDecoration.PREFERRED_COLOR, PeopleDecoration.DETAIL]
+    )
+
+    ret = PeopleResponse.for_decorations(
+        [PeopleDecoration.PREFERRED_COLOR]
+    ).model_validate(get_response_json("people_friends_own"))
+    assert isinstance(ret.people[0].preferred_color, PreferredColor)
+    assert ret.people[0].detail is None
+    assert PeopleResponse.for_decorations(["preferredColor"]) is type(ret)
+
+
 @pytest.mark.asyncio
 async def test_people_friends_by_xuid(
     respx_mock: MockRouter, xbl_client: XboxLiveClient
@@ -110,3 +176,331 @@ async def test_people_summary_by_gamertag(
     await xbl_client.people.get_friends_summary_by_gamertag("e")
 
     assert route.called
+
+
+def test_friend_store() -> None:
+    own = PeopleResponse.model_validate(get_response_json("people_friends_own"))
+    other = PeopleResponse.model_validate(get_response_json("people_friends_by_xuid"))
+
+    store = FriendStore.from_response("2669321029139235", own)
+    store.add_response(2533274812261808, other)
+    assert len(store) == 4
+    assert store.owners == {2669321029139235, 2533274812261808}
+
+    row = store[0]
+    assert row.owner_xuid == 2669321029139235
+    assert row.xuid == 2533274838782903
+    assert row.gamertag == "Ikken Hissatsuu"
+    assert row.gamerscore == 27210
+    assert row.is_favorite is True
+    assert row.presence_state == "Offline"
+    assert row.title_id == 0
+
+    online = store.filter(presence_state="Online")
+    assert [r.gamertag for r in store.rows(online)] == ["Aeroset"]
+    assert store[online[0]].device == "XboxOne"
+    assert store.filter(title_id=122001257) == online
+    assert store.filter(presence_state="Away") == []
+    assert list(store.xuids(store.filter(owner_xuid=2669321029139235))) == [
+        2533274838782903,
+        2533274913657542,
+    ]
+    assert {k: list(v) for k, v in store.group_by_title().items()} == {
+        122001257: [2533274816796628]
+    }
+    assert list(store.owners_of(2533274838782903)) == [2669321029139235]
+
+    # Replacing a friend list drops the previous rows of that owner
+    store.add_response("2669321029139235", own)
+    assert len(store) == 4
+    store.discard_owner(2533274812261808)
+    assert len(store) == 2
+    assert [r.owner_xuid for r in store] == [2669321029139235] * 2
+
+
+FRIEND_GRAPH = {1: [2, 3], 2: [1, 3, 4], 3: [1, 2, 5], 4: [2, 6], 5: [3]}
+
+
+def _mock_friend_graph(respx_mock: MockRouter) -> None:
+    template = get_response_json("people_friends_own")
+
+    def friends(request: Request) -> Response:
+        xuid = int(re.search(r"xuid\((\d+)\)", request.url.path).group(1))
+        people = [
+            {**template["people"][0], "xuid": str(friend)}
+            for friend in FRIEND_GRAPH.get(xuid, [])
+        ]
+        return Response(200, json={**template, "people": people})
+
+    respx_mock.get(url__regex=r"https://peoplehub.xboxlive.com/users/xuid").mock(
+        side_effect=friends
+    )
+
+
+@pytest.mark.asyncio
+async def test_friend_graph_crawler(
+    respx_mock: MockRouter, xbl_client: XboxLiveClient
+) -> None:
+    _mock_friend_graph(respx_mock)
+    crawler = FriendGraphCrawler(xbl_client, max_depth=2)
+
+    edges = [edge async for edge in crawler.crawl("1")]
+
+    assert sorted(edges) == sorted(
+        FriendEdge(source, target, 1 if source == 1 else 2)
+        for source in (1, 2, 3)
+        for target in FRIEND_GRAPH[source]
+    )
+    assert crawler.visited == {1, 2, 3}
+
+
+@pytest.mark.asyncio
+async def test_friend_graph_crawler_resume(
+    respx_mock: MockRouter, xbl_client: XboxLiveClient, tmp_path: Path
+) -> None:
+    _mock_friend_graph(respx_mock)
+    checkpoint = tmp_path / "crawl.json"
+
+    crawler = FriendGraphCrawler(
+        xbl_client, max_depth=3, concurrency=1, checkpoint_path=checkpoint
+    )
+    async with aclosing(crawler.crawl(1)) as edges:
+        first = [await anext(edges)]
+    assert checkpoint.exists()
+
+    crawler = FriendGraphCrawler(xbl_client, max_depth=2, checkpoint_path=checkpoint)
+    with pytest.raises(ValueError, match="max_depth"):
+        await anext(crawler.crawl())
+
+    crawler = FriendGraphCrawler(
+        xbl_client,
+        max_depth=3,
+        checkpoint_path=checkpoint,
+        visited=BloomFilter(1000),
+    )
+    second = [edge async for edge in crawler.crawl()]
+
+    assert {edge.source for edge in first + second} == {1, 2, 3, 4, 5}
+    assert not checkpoint.exists()
+
+
+def test_bloom_filter() -> None:
+    bloom = BloomFilter(1000, error_rate=0.01)
+    for xuid in range(2533274800000000, 2533274800000500):
+        bloom.add(xuid)
+
+    assert 2533274800000000 in bloom
+    assert 2533274800000499 in bloom
+    false_positives = sum(
+        xuid in bloom for xuid in range(2533274900000000, 2533274900001000)
+    )
+    assert false_positives < 50
+    assert 2533274800000100 in BloomFilter.from_dict(bloom.to_dict())
+
+
+def test_xuid_set() -> None:
+    a = XuidSet([5, 3, 1, 3, "7"])
+    b = XuidSet([7, 2, 3])
+
+    assert list(a) == [1, 3, 5, 7]
+    assert len(a) == 4
+    assert a[0] == 1
+    assert a[1:3] == XuidSet([3, 5])
+    assert 7 in a
+    assert "5" in a
+    assert 2 not in a
+    assert "gamertag" not in a
+
+    assert a & b == XuidSet([3, 7])
+    assert a | b == XuidSet([1, 2, 3, 5, 7])
+    assert a - b == XuidSet([1, 5])
+    assert a.intersection(b, XuidSet([7])) == XuidSet([7])
+    assert a.difference(b, XuidSet([1])) == XuidSet([5])
+    assert a.overlap(b) == 2
+    assert a.to_array().typecode == "q"
+
+
+@pytest.mark.parametrize("backend", ["numpy", "merge"])
+def test_xuid_set_operations(backend: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    if backend == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(xuidset, "_numpy", lambda: None)
+    base = 2533274800000000
+    a, b, c = (set(range(base, base + 300, step)) for step in (2, 3, 5))
+
+    assert list(XuidSet(a) & XuidSet(b)) == sorted(a & b)
+    assert list(XuidSet(a) | XuidSet(b)) == sorted(a | b)
+    assert list(XuidSet(a) - XuidSet(b)) == sorted(a - b)
+    assert list(XuidSet(a).intersection(XuidSet(b), XuidSet(c))) == sorted(a & b & c)
+    assert list(XuidSet(a).union(XuidSet(b), XuidSet(c))) == sorted(a | b | c)
+    assert list(XuidSet(a).difference(XuidSet(b), XuidSet(c))) == sorted(a - b - c)
+    assert XuidSet(a).overlap(XuidSet()) == 0
+    assert XuidSet(a).overlap(XuidSet(b)) == len(a & b)
+
+
+def test_xuid_set_friends() -> None:
+    own = PeopleResponse.model_validate(get_response_json("people_friends_own"))
+    other = PeopleResponse.model_validate(get_response_json("people_friends_by_xuid"))
+    own_set = XuidSet.from_response(own)
+
+    assert list(own_set) == [2533274838782903, 2533274913657542]
+    assert mutual_friends(own, own_set) == own_set
+    assert len(mutual_friends(own, other)) == 0
+
+    groups = {
+        "own": own_set,
+        "other": XuidSet.from_response(other),
+        "mixed": XuidSet([2533274838782903, 2533274816796628]),
+    }
+    assert top_k_overlap(own, groups, k=2) == [("own", 2), ("mixed", 1)]
+
+
+@pytest.mark.asyncio
+async def test_friend_list_sync(
+    respx_mock: MockRouter, xbl_client: XboxLiveClient, tmp_path: Path
+) -> None:
+    summary = get_response_json("people_summary_own")
+    friends = get_response_json("people_friends_own")
+    summary_route = respx_mock.get("https://social.xboxlive.com").mock(
+        return_value=Response(200, json=summary)
+    )
+    friends_route = respx_mock.get("https://peoplehub.xboxlive.com").mock(
+        return_value=Response(200, json=friends)
+    )
+    sync = FriendListSync(xbl_client, state_path=tmp_path / "friends.json")
+
+    diff = await sync.sync()
+    assert [p.gamertag for p in diff.added] == ["Ikken Hissatsuu", "erics273"]
+    assert not diff.removed
+    assert not diff.changed
+
+    # Unchanged summary does not refetch the friend list
+    assert await sync.sync() is None
+    assert summary_route.call_count == 2
+    assert friends_route.call_count == 1
+
+    changed_friend = {**friends["people"][1], "gamertag": "erics274"}
+    summary_route.return_value = Response(200, json={**summary, "watermark": "1"})
+    friends_route.return_value = Response(
+        200, json={**friends, "people": [changed_friend]}
+    )
+
+    # State is restored from disk
+    sync = FriendListSync(xbl_client, state_path=tmp_path / "friends.json")
+    diff = await sync.sync()
+    assert friends_route.call_count == 2
+    assert [p.gamertag for p in diff.removed] == ["Ikken Hissatsuu"]
+    assert [p.gamertag for p in diff.changed] == ["erics274"]
+    assert not diff.added
+    assert list(sync.friends) == ["2533274913657542"]
+
+
+def test_leaderboard() -> None:
+    board = Leaderboard()
+    for xuid, score in ((1, 10), (2, 30), (3, 20), (4, 20), (5, 5)):
+        board.update(xuid, score)
+
+    assert board.top(3) == [
+        LeaderboardEntry(1, 2, 30),
+        LeaderboardEntry(2, 3, 20),
+        LeaderboardEntry(2, 4, 20),
+    ]
+    assert board.rank("4") == 2
+    assert board.rank(1) == 4
+    assert [entry.xuid for entry in board.neighbours(4, 1)] == [3, 4, 1]
+    assert board.neighbours(4, 1)[0].rank == 2
+    assert not board.update(1, 10)
+    assert board.update(1, 40)
+    assert board.rank(1) == 1
+    assert board.remove(2)
+    assert board.rank(3) == 2
+    board.retain([1, 3])
+    assert [entry.xuid for entry in board.top()] == [1, 3]
+    assert board.rank(2) is None
+
+    ascending = Leaderboard(descending=False)
+    ascending.update(1, 10)
+    ascending.update(2, 5)
+    assert ascending.rank(2) == 1
+
+
+@pytest.mark.asyncio
+async def test_friends_leaderboards(
+    respx_mock: MockRouter, xbl_client: XboxLiveClient
+) -> None:
+    owner = xbl_client.xuid
+    friends_route = respx_mock.get("https://peoplehub.xboxlive.com").mock(
+        return_value=Response(200, json=get_response_json("people_friends_own"))
+    )
+    respx_mock.get("https://social.xboxlive.com").mock(
+        return_value=Response(200, json=get_response_json("people_summary_own"))
+    )
+    gamerscores = {owner: "5000", "2533274838782903": "27210"}
+
+    def profiles(request: Request) -> Response:
+        users = [
+            {
+                "id": xuid,
+                "hostId": xuid,
+                "settings": [{"id": "Gamerscore", "value": gamerscores[xuid]}],
+                "isSponsoredUser": False,
+            }
+            for xuid in json.loads(request.content)["userIds"]
+            if xuid in gamerscores
+        ]
+        return Response(200, json={"profileUsers": users})
+
+    profile_route = respx_mock.post("https://profile.xboxlive.com").mock(
+        side_effect=profiles
+    )
+    scores = {"2533274838782903": "7", "2533274913657542": "12"}
+
+    def batch(request: Request) -> Response:
+        data = get_response_json("userstats_batch")
+        group = data["groups"][0]
+        template = group["statlistscollection"][0]
+        group["statlistscollection"] = [
+            {
+                **template,
+                "arrangebyfieldid": xuid,
+                "stats": [
+                    {**template["stats"][0], "xuid": xuid, "value": scores[xuid]}
+                ],
+            }
+            for xuid in json.loads(request.content)["xuids"]
+            if xuid in scores
+        ]
+        return Response(200, json=data)
+
+    stats_route = respx_mock.post("https://userstats.xboxlive.com").mock(
+        side_effect=batch
+    )
+    leaderboards = FriendsLeaderboards(xbl_client)
+
+    gamerscore = await leaderboards.refresh_gamerscore()
+    assert [(e.xuid, e.score) for e in gamerscore.top()] == [
+        (2533274838782903, 27210),
+        (int(owner), 5000),
+        (2533274913657542, 3802),
+    ]
+
+    # Gamerscore changed without a friend list change
+    gamerscores["2533274838782903"] = "100"
+    gamerscore = await leaderboards.refresh_gamerscore()
+    assert gamerscore.rank(2533274838782903) == 3
+    assert gamerscore.score(2533274838782903) == 100
+    assert friends_route.call_count == 1
+    assert profile_route.call_count == 2
+
+    scid = "00000000-0000-0000-0000-000066591171"
+    board = await leaderboards.refresh_stat(scid, "ChestsCashedIn")
+    assert [e.xuid for e in board.top()] == [2533274913657542, 2533274838782903]
+    assert leaderboards.board(stat="ChestsCashedIn") is board
+
+    # Unchanged friend summary does not refetch the friend list
+    scores["2533274838782903"] = "20"
+    board = await leaderboards.refresh_stat(scid, "ChestsCashedIn")
+    assert board.rank(2533274838782903) == 1
+    assert friends_route.call_count == 1
+    assert stats_route.call_count == 2
@@ -4,6 +4,8 @@ from respx import MockRouter
 
 from pythonxbox.api.client import XboxLiveClient
 from pythonxbox.api.provider.presence.models import PresenceState
+from pythonxbox.api.provider.presence.titleindex import TitleIndex
+from pythonxbox.api.provider.presence.watcher import PresenceChange, PresenceWatcher
 from tests.common import get_response_json
 
 
@@ -78,8 +80,11 @@ async def test_presence_own_set_fail(
     assert route.called
     assert not ret
 
+
 @pytest.mark.asyncio
-async def test_presence_with_activity(respx_mock: MockRouter, xbl_client: XboxLiveClient) -> None:
+async def test_presence_with_activity(
+    respx_mock: MockRouter, xbl_client: XboxLiveClient
+) -> None:
 
     route = respx_mock.get("https://userpresence.xboxlive.com").mock(
         return_value=Response(200, json=get_response_json("presence_activity"))
@@ -89,5 +94,112 @@ async def test_presence_with_activity(respx_mock: MockRouter, xbl_client: XboxLi
 
     assert route.called
     assert response.xuid == "0123456789"
-    assert response.devices[0].titles[0].activity.richPresence == "Team Deathmatch on Nirvana"
+    assert (
+        response.devices[0].titles[0].activity.richPresence
+        == "Team Deathmatch on Nirvana"
+    )
+
+
+@pytest.mark.asyncio
+async def test_presence_watcher(
+    respx_mock: MockRouter, xbl_client: XboxLiveClient
+) -> None:
+    online = get_response_json("presence_activity")
+    offline = {"xuid": "0123456789", "state": "Offline"}
+    other_title = {
+        **online,
+        "devices": [{"type": "D", "titles": [{"id": "1", "name": "Contoso 6"}]}],
+    }
+    route = respx_mock.post("https://userpresence.xboxlive.com/users/batch").mock(
+        side_effect=[
+            Response(200, json=[offline, *get_response_json("presence_batch")]),
+            Response(200, json=[online]),
+            Response(200, json=[online]),
+            Response(200, json=[other_title]),
+            Response(200, json=[offline]),
+        ]
+    )
+    watcher = PresenceWatcher(
+        xbl_client,
+        ["0123456789", "2669321029139235", "2584878536129841"],
+        min_interval=10,
+        max_interval=25,
+    )
+
+    assert await watcher.poll() == []
+    assert await watcher.poll() == []  # nobody is due yet
 
+    watcher.untrack(["2669321029139235", "2584878536129841"])
+    events = await watcher.poll(force=True)
+    assert [e.changes for e in events] == [
+        {PresenceChange.ONLINE, PresenceChange.TITLE, PresenceChange.DEVICE}
+    ]
+    assert watcher.get_interval("0123456789") == 10
+
+    assert await watcher.poll(force=True) == []
+    assert watcher.get_interval("0123456789") == 20
+
+    events = await watcher.poll(force=True)
+    assert events[0].changes == {PresenceChange.TITLE}
+    assert events[0].previous.devices[0].titles[0].id == "12341234"
+
+    events = await watcher.poll(force=True)
+    assert events[0].changes == {
+        PresenceChange.OFFLINE,
+        PresenceChange.TITLE,
+        PresenceChange.DEVICE,
+    }
+    assert watcher.presence["0123456789"].state == "Offline"
+    assert route.call_count == 5
+
+
+@pytest.mark.asyncio
+async def test_title_index(respx_mock: MockRouter, xbl_client: XboxLiveClient) -> None:
+    online = get_response_json("presence_activity")
+    friends = get_response_json("people_friends_own")
+    playing = friends["people"][0]
+    playing["presenceState"] = "Online"
+    playing["presenceDetails"] = [
+        {**friends["people"][1]["presenceDetails"][0], "State": "Active"},
+        {**friends["people"][1]["presenceDetails"][0], "TitleId": "12341234"},
+    ]
+    respx_mock.post("https://userpresence.xboxlive.com").mock(
+        return_value=Response(200, json=[online, *get_response_json("presence_batch")])
+    )
+    respx_mock.get("https://peoplehub.xboxlive.com").mock(
+        return_value=Response(200, json=friends)
+    )
+    index = TitleIndex()
+    index.attach(xbl_client)
+
+    await xbl_client.presence.get_presence_batch(
+        ["0123456789", "2669321029139235", "2584878536129841"]
+    )
+    assert index.players("12341234") == {"0123456789"}
+    assert index.titles("0123456789") == {"12341234"}
+    assert index.titles("2669321029139235") == set()
+    assert len(index) == 1
+
+    await xbl_client.people.get_friends_own()
+    assert index.players("750323071") == {"2533274838782903"}
+    # LastSeen details are not counted
+    assert index.titles("2533274838782903") == {"750323071"}
+    assert index.player_count("12341234") == 1
+
+    # No title information at user level, known titles are kept
+    respx_mock.post("https://userpresence.xboxlive.com").mock(
+        return_value=Response(200, json=[{**online, "devices": None}])
+    )
+    await xbl_client.presence.get_presence_batch(["0123456789"])
+    assert index.titles("0123456789") == {"12341234"}
+
+    players = index.players("12341234")
+    index.update("2533274838782903", ["12341234"])
+    assert players == {"0123456789"}
+    assert index.top_titles() == [("12341234", 2)]
+    assert index.players("750323071") == set()
+
+    index.remove("0123456789")
+    index.detach(xbl_client)
+    await xbl_client.presence.get_presence_batch(["0123456789"])
+    assert index.players("12341234") == {"2533274838782903"}
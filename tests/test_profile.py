@@ -1,8 +1,14 @@
+import json
+
 from httpx import Response
 import pytest
 from respx import MockRouter
 
 from pythonxbox.api.client import XboxLiveClient
+from pythonxbox.api.provider.profile.models import (
+    ProfileSettings,
+    ProfileSettingsPreset,
+)
 from tests.common import get_response_json
 
 
@@ -48,3 +54,41 @@ async def test_profiles_batch(
     assert len(ret.profile_users) == 2
 
     assert route.called
+
+
+@pytest.mark.asyncio
+async def test_profile_by_xuid_settings(
+    respx_mock: MockRouter, xbl_client: XboxLiveClient
+) -> None:
+    route = respx_mock.get("https://profile.xboxlive.com").mock(
+        return_value=Response(200, json=get_response_json("profile_by_xuid"))
+    )
+    ret = await xbl_client.profile.get_profile_by_xuid(
+        "2669321029139235", settings=ProfileSettingsPreset.MINIMAL
+    )
+
+    assert route.calls.last.request.url.params["settings"] == "Gamertag,Gamerscore"
+    assert ret.profile_users[0].get_setting(ProfileSettings.GAMERTAG) == "e"
+    assert ret.profile_users[0].get_setting(ProfileSettings.REAL_NAME) is None
+    assert ret.profile_users[0].settings_dict["Gamerscore"] == "98096"
+
+
+@pytest.mark.asyncio
+async def test_profiles_batch_settings(
+    respx_mock: MockRouter, xbl_client: XboxLiveClient
+) -> None:
+    route = respx_mock.post("https://profile.xboxlive.com").mock(
+        return_value=Response(200, json=get_response_json("profile_batch"))
+    )
+    await xbl_client.profile.get_profiles(
+        ["2669321029139235", "2584878536129841"],
+        settings=[ProfileSettings.GAMERTAG],
+    )
+
+    body = json.loads(route.calls.last.request.content)
+    assert body["settings"] == ["Gamertag"]
+
+    await xbl_client.profile.get_profiles(["2669321029139235"])
+    body = json.loads(route.calls.last.request.content)
+    assert body["settings"] == list(ProfileSettingsPreset.BATCH)
+    assert isinstance(ProfileSettingsPreset.BATCH, tuple)
@@ -0,0 +1,179 @@
+import asyncio
+from collections.abc import AsyncGenerator
+
+import pytest
+
+pytest.importorskip("websockets")
+
+from pythonxbox.api.rta import PRESENCE_RESOURCE, SOCIAL_RESOURCE, RTAClient
+from pythonxbox.api.rta.models import (
+    RTAPresenceEvent,
+    RTAResyncEvent,
+    RTASocialEvent,
+    RTAStatus,
+)
+from pythonxbox.authentication.manager import AuthenticationManager
+from pythonxbox.common.exceptions import RTAException
+from tests.rta_server import RTAServer
+
+XUID = "2669321029139235"
+PRESENCE = PRESENCE_RESOURCE.format(xuid=XUID)
+SOCIAL = SOCIAL_RESOURCE.format(xuid=XUID)
+ONLINE = {
+    "devicetype": "XboxOne",
+    "titleid": 750323071,
+    "string1": "Online",
+    "string2": "",
+    "presenceState": "Online",
+    "presenceText": "Home",
+}
+
+
+@pytest.fixture
+async def rta_server(auth_mgr: AuthenticationManager) -> AsyncGenerator[RTAServer]:
+    server = RTAServer(
+        {PRESENCE: {**ONLINE, "presenceState": "Offline"}, SOCIAL: {}},
+        auth_mgr.xsts_token.authorization_header_value,
+    )
+    async with server:
+        yield server
+
+
+@pytest.mark.asyncio
+async def test_rta_subscribe(
+    auth_mgr: AuthenticationManager, rta_server: RTAServer
+) -> None:
+    async with RTAClient(auth_mgr, url=rta_server.url) as rta:
+        presence = await rta.subscribe_presence(XUID)
+        await rta.subscribe_social(XUID)
+        assert presence.presence_state == "Offline"
+        assert rta_server.subscribed == {PRESENCE, SOCIAL}
+
+        events = rta.events()
+        await rta_server.push(PRESENCE, ONLINE)
+        event = await anext(events)
+        assert isinstance(event, RTAPresenceEvent)
+        assert event.xuid == XUID
+        assert event.presence.title_id == 750323071
+        assert event.presence.presence_state == "Online"
+
+        await rta_server.push(SOCIAL, {"NotificationType": "Added", "Xuids": ["1"]})
+        event = await anext(events)
+        assert isinstance(event, RTASocialEvent)
+        assert event.notification.notification_type == "Added"
+        assert event.notification.xuids == ["1"]
+
+        await rta_server.resync()
+        assert isinstance(await anext(events), RTAResyncEvent)
+
+        await rta.unsubscribe(SOCIAL)
+        assert rta_server.subscribed == {PRESENCE}
+        assert rta.resources == [PRESENCE]
+
+        with pytest.raises(RTAException) as exc_info:
+            await rta.subscribe(PRESENCE_RESOURCE.format(xuid="1"))
+        assert exc_info.value.status == RTAStatus.UNKNOWN_RESOURCE
+        assert rta.resources == [PRESENCE]
+
+    assert [event async for event in events] == []
+
+
+@pytest.mark.asyncio
+async def test_rta_reconnect(
+    auth_mgr: AuthenticationManager, rta_server: RTAServer
+) -> None:
+    async with RTAClient(auth_mgr, url=rta_server.url, min_reconnect_delay=0) as rta:
+        await rta.subscribe_presence(XUID)
+        events = rta.events()
+
+        rta_server.resources[PRESENCE] = ONLINE
+        await rta_server.drop()
+        assert isinstance(await anext(events), RTAResyncEvent)
+        event = await anext(events)
+        assert isinstance(event, RTAPresenceEvent)
+        assert event.presence.presence_state == "Online"
+        assert rta_server.connection_count == 2
+
+        await rta_server.push(PRESENCE, {**ONLINE, "presenceText": "Playing"})
+        event = await anext(events)
+        assert event.presence.presence_text == "Playing"
+
+
+@pytest.mark.asyncio
+async def test_rta_unauthorized(
+    auth_mgr: AuthenticationManager, rta_server: RTAServer
+) -> None:
+    rta_server.authorization = "XBL3.0 x=invalid"
+    rta = RTAClient(auth_mgr, url=rta_server.url)
+    with pytest.raises(RTAException):
+        await rta.connect()
+    assert not rta.connected
+
+
+@pytest.mark.asyncio
+async def test_rta_malformed_messages(
+    auth_mgr: AuthenticationManager, rta_server: RTAServer
+) -> None:
+    async with RTAClient(auth_mgr, url=rta_server.url) as rta:
+        await rta.subscribe_presence(XUID)
+        events = rta.events()
+
+        await rta_server.send_raw("not json")
+        await rta_server.send_raw("[]")
+        await rta_server.send_raw("[3, 1]")
+        await rta_server.push(PRESENCE, {**ONLINE, "titleid": "invalid"})
+        await rta_server.push(PRESENCE, ONLINE)
+        event = await anext(events)
+        assert isinstance(event, RTAPresenceEvent)
+        assert event.presence.presence_state == "Online"
+        assert rta_server.connection_count == 1
+
+
+@pytest.mark.asyncio
+async def test_rta_close_full_queue(
+    auth_mgr: AuthenticationManager, rta_server: RTAServer
+) -> None:
+    rta = RTAClient(auth_mgr, url=rta_server.url, max_queued_events=1)
+    await rta.connect()
+    await rta.subscribe_presence(XUID)
+    await rta_server.resync()
+    await rta_server.resync()
+    async with asyncio.timeout(1):
+        while not rta._events.full():
+            await asyncio.sleep(0)
+    await rta.close()
+    assert [event async for event in rta.events()] == []
+
+
+@pytest.mark.asyncio
+async def test_rta_unsubscribe_pending(auth_mgr: AuthenticationManager) -> None:
+    rta = RTAClient(auth_mgr)
+    subscribers = [asyncio.create_task(rta.subscribe(PRESENCE)) for _ in range(2)]
+    await asyncio.sleep(0)
+    await rta.unsubscribe(PRESENCE)
+    for subscriber in subscribers:
+        with pytest.raises(RTAException):
+            await subscriber
+
+
+@pytest.mark.asyncio
+async def test_rta_unsubscribe_cancelled(
+    auth_mgr: AuthenticationManager, rta_server: RTAServer
+) -> None:
+    async with RTAClient(auth_mgr, url=rta_server.url, min_reconnect_delay=0) as rta:
+        await rta.subscribe_presence(XUID)
+        await rta.subscribe_social(XUID)
+        events = rta.events()
+
+        unsubscribe = asyncio.create_task(rta.unsubscribe(SOCIAL))
+        await asyncio.sleep(0)
+        unsubscribe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await unsubscribe
+
+        await rta_server.drop()
+        async with asyncio.timeout(5):
+            assert isinstance(await anext(events), RTAResyncEvent)
+            assert isinstance(await anext(events), RTAPresenceEvent)
+        assert rta.resources == [PRESENCE]
+        assert rta_server.connection_count == 2
@@ -176,3 +176,22 @@ async def test_screenshots_saved_community(
     assert len(ret.screenshots) == 100
 
     assert route.called
+
+
+@pytest.mark.asyncio
+async def test_screenshots_iter_recent_xuid(
+    respx_mock: MockRouter, xbl_client: XboxLiveClient
+) -> None:
+    route = respx_mock.get("https://screenshotsmetadata.xboxlive.com").mock(
+        return_value=Response(200, json=get_response_json("screenshots_recent_xuid"))
+    )
+    ret = [
+        screenshot
+        async for screenshot in xbl_client.screenshots.iter_recent_screenshots_by_xuid(
+            "2669321029139235", page_size=1, prefetch=0
+        )
+    ]
+
+    # Missing continuation token ends iteration
+    assert len(ret) == 1
+    assert route.call_count == 1
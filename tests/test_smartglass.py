@@ -1,9 +1,21 @@
-from httpx import Response
+import asyncio
+from collections import defaultdict
+import json
+
+from httpx import Request, Response
 import pytest
 from respx import MockRouter
 
 from pythonxbox.api.client import XboxLiveClient
-from pythonxbox.api.provider.smartglass.models import InputKeyType, VolumeDirection
+from pythonxbox.api.provider.smartglass import waiter as waiter_module
+from pythonxbox.api.provider.smartglass.fleet import ConsoleFleet
+from pythonxbox.api.provider.smartglass.models import (
+    CommandResponse,
+    InputKeyType,
+    OpStatus,
+    VolumeDirection,
+)
+from pythonxbox.api.provider.smartglass.waiter import OperationWaiter
 from tests.common import get_response_json
 
 
@@ -112,3 +124,128 @@ async def test_commands(respx_mock: MockRouter, xbl_client: XboxLiveClient) -> N
         await getattr(xbl_client.smartglass, command["method"])(**command["args"])
 
     assert route.called
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    async def sleep(self, delay: float) -> None:
+        self.now += delay
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_operation_waiter(
+    respx_mock: MockRouter, xbl_client: XboxLiveClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    template = get_response_json("smartglass_op_status")["opStatusList"][0]
+    clock = FakeClock()
+    checks: dict[str, list[float]] = defaultdict(list)
+
+    def op_status(request: Request) -> Response:
+        op_id = request.headers["x-xbl-opId"]
+        checks[op_id].append(clock.now)
+        if op_id == "slow":
+            nodes = [{**template, "opId": "slow"}]
+        elif op_id == "wake":
+            status = "Pending" if len(checks[op_id]) == 1 else "Succeeded"
+            nodes = [{**template, "opId": "wake", "operationStatus": status}]
+        else:
+            # Response of one operation lists all operations of the console
+            nodes = [
+                {**template, "opId": "off-1", "operationStatus": "Succeeded"},
+                {**template, "opId": "off-2", "operationStatus": "Error"},
+            ]
+        return Response(
+            200,
+            json={**get_response_json("smartglass_op_status"), "opStatusList": nodes},
+        )
+
+    respx_mock.get("https://xccs.xboxlive.com/opStatus").mock(side_effect=op_status)
+    command = CommandResponse.model_validate(get_response_json("smartglass_command"))
+    waiter = OperationWaiter(xbl_client, min_interval=0.25, max_interval=0.5)
+    monkeypatch.setattr(waiter_module, "time", clock)
+    monkeypatch.setattr(waiter, "_sleep", clock.sleep)
+
+    results = await asyncio.gather(
+        waiter.wait(command.model_copy(update={"op_id": "wake"})),
+        waiter.wait_op("CONSOLE2", "off-1"),
+        waiter.wait_op("CONSOLE2", "off-2"),
+        waiter.wait_op("CONSOLE3", "slow", timeout=2),
+        return_exceptions=True,
+    )
+
+    assert [getattr(r, "operation_status", None) for r in results[:3]] == [
+        OpStatus.Succeeded,
+        OpStatus.Succeeded,
+        OpStatus.Error,
+    ]
+    assert isinstance(results[3], TimeoutError)
+    # Backoff from 0.25s, capped at 0.5s
+    assert checks["wake"] == [0.25, 0.5]
+    assert checks["slow"] == [0.25, 0.5, 1.0, 1.5]
+    assert len(checks["off-1"]) + len(checks["off-2"]) == 1
+    assert clock.now == 2
+    assert len(waiter) == 0
+
+
+@pytest.mark.asyncio
+async def test_console_fleet(
+    respx_mock: MockRouter, xbl_client: XboxLiveClient
+) -> None:
+    list_route = respx_mock.get("https://xccs.xboxlive.com/lists/devices").mock(
+        return_value=Response(200, json=get_response_json("smartglass_console_list"))
+    )
+
+    def command(request: Request) -> Response:
+        device_id = json.loads(request.content)["linkedXboxId"]
+        if device_id == "HIJKLMN":
+            return Response(500)
+        data = get_response_json("smartglass_command")
+        data["destination"]["id"] = device_id
+        data["opId"] = f"op-{device_id}"
+        return Response(200, json=data)
+
+    def op_status(request: Request) -> Response:
+        data = get_response_json("smartglass_op_status")
+        node = data["opStatusList"][0]
+        node.update(
+            opId=request.headers["x-xbl-opId"],
+            operationStatus="Succeeded",
+            succeeded=True,
+        )
+        return Response(200, json=data)
+
+    command_route = respx_mock.post("https://xccs.xboxlive.com/commands").mock(
+        side_effect=command
+    )
+    respx_mock.get("https://xccs.xboxlive.com/opStatus").mock(side_effect=op_status)
+    fleet = ConsoleFleet(
+        xbl_client, waiter=OperationWaiter(xbl_client, min_interval=0.01)
+    )
+
+    result = await fleet.turn_off(wait=True)
+    assert list(result.responses) == ["ABCDEFG"]
+    assert result.statuses["ABCDEFG"].operation_status == OpStatus.Succeeded
+    assert result.succeeded == ["ABCDEFG"]
+    assert list(result.failures) == ["HIJKLMN"]
+
+    # Every wait times out, nothing succeeded
+    result = await fleet.turn_off(wait=True, timeout=0)
+    assert list(result.responses) == ["ABCDEFG"]
+    assert result.succeeded == []
+    assert isinstance(result.failures["ABCDEFG"], TimeoutError)
+
+    result = await fleet.launch_app("9WZDNCRFJ3TJ")
+    assert result.succeeded == ["ABCDEFG"]
+    assert not result.statuses
+    body = json.loads(command_route.calls.last.request.content)
+    assert body["parameters"] == [{"oneStoreProductId": "9WZDNCRFJ3TJ"}]
+
+    result = await fleet.wake_up(["ABCDEFG", "ABCDEFG"])
+    assert list(result.responses) == ["ABCDEFG"]
+    assert list_route.call_count == 1
@@ -1,8 +1,13 @@
-from httpx import Response
+import json
+from pathlib import Path
+
+from httpx import Request, Response
 import pytest
 from respx import MockRouter
 
 from pythonxbox.api.client import XboxLiveClient
+from pythonxbox.api.provider.titlehub.cache import TitleCache
+from pythonxbox.api.provider.titlehub.models import TitleFields
 from tests.common import get_response_json
 
 
@@ -52,3 +57,112 @@ async def test_titlehub_batch(
     assert ret.titles[1].detail.genres == ["Action & adventure"]
 
     assert route.called
+
+
+@pytest.mark.asyncio
+async def test_titlehub_cache(
+    respx_mock: MockRouter, xbl_client: XboxLiveClient, tmp_path: Path
+) -> None:
+    batch = respx_mock.post("https://titlehub.xboxlive.com").mock(
+        return_value=Response(200, json=get_response_json("titlehub_batch"))
+    )
+    info = respx_mock.get("https://titlehub.xboxlive.com").mock(
+        return_value=Response(200, json=get_response_json("titlehub_titleinfo"))
+    )
+    path = tmp_path / "titles.json"
+    cache = xbl_client.titlehub.cache = TitleCache(path)
+
+    await xbl_client.titlehub.get_titles_batch(
+        ["Microsoft.SeaofThieves_8wekyb3d8bbwe", "Microsoft.XboxApp_8wekyb3d8bbwe"]
+    )
+    assert batch.call_count == 1
+    assert len(cache) == 2
+    scid = "00000000-0000-0000-0000-000066591171"
+    assert (
+        cache.get_service_config_id(pfn="Microsoft.SeaofThieves_8wekyb3d8bbwe") == scid
+    )
+    assert cache.get_by_scid(scid).title_id == "1717113201"
+    assert cache.get_title_id("Microsoft.XboxApp_8wekyb3d8bbwe") == "328178078"
+    assert cache.get("1717113201", locale="de-DE") is None
+
+    ret = await xbl_client.titlehub.get_title_info(
+        1717113201, fields=[TitleFields.DETAIL, TitleFields.IMAGE]
+    )
+    assert ret.titles[0].name == "Sea of Thieves"
+    ret = await xbl_client.titlehub.get_title_info_by_pfn(
+        "Microsoft.XboxApp_8wekyb3d8bbwe", fields=[TitleFields.SERVICE_CONFIG_ID]
+    )
+    assert ret.titles[0].title_id == "328178078"
+    assert not info.called
+
+    # Achievements are user specific and always requested
+    await xbl_client.titlehub.get_title_info(1717113201)
+    assert info.call_count == 1
+
+    cache.save()
+    loaded = TitleCache(path)
+    assert len(loaded) == 2
+    assert loaded.get("1717113201", fields=[TitleFields.DETAIL]) is not None
+    assert TitleCache(path, ttl=0).get("1717113201") is None
+
+
+@pytest.mark.asyncio
+async def test_titlehub_cache_user_sections(
+    respx_mock: MockRouter, xbl_client: XboxLiveClient
+) -> None:
+    respx_mock.get("https://titlehub.xboxlive.com").mock(
+        return_value=Response(200, json=get_response_json("titlehub_titlehistory"))
+    )
+    cache = xbl_client.titlehub.cache = TitleCache()
+
+    ret = await xbl_client.titlehub.get_title_history(987654321)
+    assert ret.titles[0].achievement is not None
+    assert ret.titles[0].title_history is not None
+
+    title = cache.get(ret.titles[0].title_id, fields=[TitleFields.IMAGE])
+    assert title is not None
+    assert title.achievement is None
+    assert title.title_history is None
+    assert title.stats is None
+    assert title.friends_who_played is None
+
+
+@pytest.mark.asyncio
+async def test_titlehub_batch_bulk(
+    respx_mock: MockRouter, xbl_client: XboxLiveClient
+) -> None:
+    titles = get_response_json("titlehub_batch")["titles"]
+
+    def batch(request: Request) -> Response:
+        pfns = json.loads(request.content)["pfns"]
+        return Response(200, json={"titles": [t for t in titles if t["pfn"] in pfns]})
+
+    route = respx_mock.post("https://titlehub.xboxlive.com").mock(side_effect=batch)
+    xbl_client.titlehub.MAX_BATCH_PFNS = 1
+    pfns = [
+        "Microsoft.SeaofThieves_8wekyb3d8bbwe",
+        "Microsoft.XboxApp_8wekyb3d8bbwe",
+        "Microsoft.SeaofThieves_8wekyb3d8bbwe",
+    ]
+
+    ret = await xbl_client.titlehub.get_titles_batch_bulk(pfns)
+    assert [t.title_id for t in ret.titles] == ["1717113201", "328178078"]
+    assert route.call_count == 2
+    assert route.calls.last.request.url.path.endswith("/decoration/detail,image,scid")
+
+    # Default fields are served from the cache
+    xbl_client.titlehub.cache = TitleCache()
+    await xbl_client.titlehub.get_titles_batch_bulk(pfns)
+    assert route.call_count == 4
+    await xbl_client.titlehub.get_titles_batch_bulk(pfns)
+    assert route.call_count == 4
+
+    xbl_client.titlehub.cache = TitleCache()
+    fields = [TitleFields.DETAIL, TitleFields.SERVICE_CONFIG_ID]
+    await xbl_client.titlehub.get_titles_batch(pfns[:1], fields)
+    assert route.call_count == 5
+
+    ret = await xbl_client.titlehub.get_titles_batch_bulk(pfns, fields)
+    assert [t.title_id for t in ret.titles] == ["1717113201", "328178078"]
+    assert route.call_count == 6
+    assert json.loads(route.calls.last.request.content)["pfns"] == [pfns[1]]
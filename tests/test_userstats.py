@@ -1,8 +1,15 @@
-from httpx import Response
+import json
+import math
+from pathlib import Path
+
+from httpx import Request, Response
 import pytest
 from respx import MockRouter
 
 from pythonxbox.api.client import XboxLiveClient
+from pythonxbox.api.provider.userstats.models import UserStatsResponse
+from pythonxbox.api.provider.userstats.table import StatsTable
+from pythonxbox.api.provider.userstats.timeseries import RingBuffer, StatsCollector
 from tests.common import get_response_json
 
 
@@ -72,3 +79,126 @@ async def test_userstats_batch_by_scid(
     assert len(ret.groups[0].statlistscollection) == 0
 
     assert route.called
+
+
+@pytest.mark.asyncio
+async def test_userstats_table(
+    respx_mock: MockRouter, xbl_client: XboxLiveClient
+) -> None:
+    distances = {"2584878536129841": "92173", "2669321029139235": "1000.5"}
+
+    def batch(request: Request) -> Response:
+        (xuid,) = json.loads(request.content)["xuids"]
+        data = json.loads(json.dumps(get_response_json("userstats_batch")))
+        collection = data["groups"][0]["statlistscollection"][0]
+        collection["arrangebyfieldid"] = xuid
+        for stat in collection["stats"]:
+            stat["xuid"] = xuid
+            if stat["name"] == "DistanceSailed":
+                stat["value"] = distances.get(xuid, "0")
+        if xuid == "1":
+            collection["stats"] = []
+        return Response(200, json=data)
+
+    route = respx_mock.post("https://userstats.xboxlive.com").mock(side_effect=batch)
+    xbl_client.userstats.MAX_BATCH_XUIDS = 1
+
+    table = await xbl_client.userstats.get_stats_table(
+        ["2584878536129841", "2669321029139235", "1", "2584878536129841"],
+        "1717113201",
+        ["DistanceSailed", "VoyagesCompleted"],
+    )
+
+    assert route.call_count == 3
+    assert len(table) == 3
+    assert table.xuids.tolist() == [2584878536129841, 2669321029139235, 1]
+    distance = table.column("DistanceSailed")
+    assert distance.typecode == "d"
+    assert distance[:2].tolist() == [92173.0, 1000.5]
+    assert math.isnan(distance[2])
+    assert table.present("DistanceSailed") == bytearray([1, 1, 0])
+    assert table.get("1", "DistanceSailed") is None
+    assert table.row("2669321029139235")["VoyagesCompleted"] == 16
+    assert [table.xuids[row] for row in table.ranked("DistanceSailed")] == [
+        2584878536129841,
+        2669321029139235,
+    ]
+    assert table.percentile("DistanceSailed", 50) == (92173 + 1000.5) / 2
+
+
+def test_userstats_table_types() -> None:
+    response = UserStatsResponse.model_validate(get_response_json("userstats_by_scid"))
+    table = StatsTable.from_responses([response], ["1"])
+    table.set_value("2", "Rank", "Gold", "String")
+
+    assert table.column("MinutesPlayed").typecode == "q"
+    assert table.column("MinutesPlayed").tolist() == [0, 1220, 0]
+    assert table.column("Rank") == ["", "", "Gold"]
+    with pytest.raises(TypeError):
+        table.percentile("Rank", 50)
+
+    np = pytest.importorskip("numpy")
+    columns = table.to_numpy(masked=True)
+    assert columns["xuid"].dtype == np.int64
+    assert columns["MinutesPlayed"].sum() == 1220
+    assert columns["MinutesPlayed"].count() == 1
+
+
+def test_ring_buffer() -> None:
+    buffer = RingBuffer(4)
+    for t in range(6):
+        buffer.append(t * 60, t)
+
+    assert len(buffer) == 4
+    assert buffer.last() == (300, 5)
+    assert buffer.range() == [(120, 2), (180, 3), (240, 4), (300, 5)]
+    assert buffer.range(150, 240) == [(180, 3), (240, 4)]
+    assert buffer.range(400) == []
+    assert buffer.downsample(120) == [(120, 3), (240, 5)]
+    assert buffer.downsample(120, aggregate="max") == [(120, 3), (240, 5)]
+    assert buffer.downsample(120, aggregate="mean") == [(120, 2.5), (240, 4.5)]
+    assert RingBuffer.from_dict(buffer.to_dict()).range() == buffer.range()
+    with pytest.raises(ValueError):
+        buffer.append(0, 0)
+
+
+@pytest.mark.asyncio
+async def test_stats_collector(
+    respx_mock: MockRouter, xbl_client: XboxLiveClient, tmp_path: Path
+) -> None:
+    scid = "00000000-0000-0000-0000-000066591171"
+    distance = ["92173"]
+
+    def batch(request: Request) -> Response:
+        data = json.loads(json.dumps(get_response_json("userstats_batch")))
+        for stat in data["groups"][0]["statlistscollection"][0]["stats"]:
+            if stat["name"] == "DistanceSailed":
+                stat["value"] = distance[0]
+        return Response(200, json=data)
+
+    route = respx_mock.post("https://userstats.xboxlive.com").mock(side_effect=batch)
+    state_path = tmp_path / "series.json"
+    collector = StatsCollector(xbl_client, capacity=2, state_path=state_path)
+    collector.track(["2584878536129841"], scid, ["DistanceSailed", "VoyagesCompleted"])
+
+    for timestamp, value in ((100, "92173"), (200, "93000"), (300, "94000.5")):
+        distance[0] = value
+        assert await collector.sample(timestamp) > 0
+    collector.save()
+
+    assert route.call_count == 3
+    series = collector.series("2584878536129841", scid, "DistanceSailed")
+    assert series.range() == [(200, 93000), (300, 94000.5)]
+    assert collector.series("2584878536129841", scid, "VoyagesCompleted").last() == (
+        300,
+        16,
+    )
+
+    restored = StatsCollector(xbl_client, capacity=2, state_path=state_path)
+    assert restored.series("2584878536129841", scid, "DistanceSailed").range(250) == [
+        (300, 94000.5)
+    ]
+
+    collector.untrack(["2584878536129841"], scid)
+    assert await collector.sample(400) == 0
+    assert route.call_count == 3